@@ -0,0 +1,78 @@
+"""
+Raw and deflated size of minified files with and without compression_aware,
+on the lua test suite and on generated prototype data written in mixed styles.
+Deflated sizes are what a zip archive of a mod stores. Prints a report for
+each file and the totals.
+
+Run with `python -m benchmarks.compression_aware [entries]`.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from tumfl.compression import FileSizes, format_report
+from tumfl.minifier import minify
+
+
+def mixed_style_source(entries: int, seed: int = 0) -> str:
+    """Generates factorio style prototypes, as written by different authors"""
+    rng = random.Random(seed)
+    lines: List[str] = ["data:extend({"]
+    for i in range(entries):
+        quote: str = rng.choice("'\"")
+        size: int = rng.choice((16, 32, 64, 128, 256))
+        lines.append(
+            f"  {{type = {quote}recipe{quote}, name = {quote}recipe-{i}{quote}, "
+            f"energy_required = {rng.choice(('0.5', '.5', '5e-1', '1', '1.0'))}, "
+            f"icon_size = {rng.choice((str(size), hex(size)))}, "
+            f"results = {{{{type = 'item', name = \"item-{i}\", "
+            f"amount = {rng.randint(1, 10)}}}}}}},"
+        )
+    lines.append("})")
+    return "\n".join(lines) + "\n"
+
+
+def run(
+    sources: Dict[str, str], compression_aware: bool, hoist_strings: bool
+) -> Tuple[List[FileSizes], float]:
+    start: float = time.perf_counter()
+    outputs: Dict[str, str] = {
+        name: minify(
+            text, hoist_strings=hoist_strings, compression_aware=compression_aware
+        )
+        for name, text in sources.items()
+    }
+    elapsed: float = time.perf_counter() - start
+    return [FileSizes(name, sources[name], outputs[name]) for name in sources], elapsed
+
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sources: Dict[str, str] = {
+        i.name: i.read_text(encoding="iso-8859-15")
+        for i in sorted(Path("lua-tests").glob("*.lua"))
+    }
+    sources["generated.lua"] = mixed_style_source(entries)
+    for hoist_strings in (False, True):
+        totals: List[int] = []
+        for compression_aware in (False, True):
+            report, elapsed = run(sources, compression_aware, hoist_strings)
+            print(
+                f"hoist_strings={hoist_strings}, "
+                f"compression_aware={compression_aware}: {elapsed:.2f}s"
+            )
+            print(format_report(report))
+            print()
+            totals.append(sum(i.minified_compressed for i in report))
+        print(
+            f"hoist_strings={hoist_strings}: compression_aware changes the "
+            f"deflated size by {totals[1] / totals[0] - 1:+.2%}"
+        )
+        print()
+
+
+if __name__ == "__main__":
+    main()
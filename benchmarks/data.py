@@ -0,0 +1,22 @@
+import random
+from typing import List
+
+
+def literal_heavy_source(entries: int, seed: int = 0) -> str:
+    """Generates a factorio style data file that mostly consists of table literals"""
+    rng = random.Random(seed)
+    lines: List[str] = ["data:extend({"]
+    for i in range(entries):
+        enabled: str = "true" if rng.random() < 0.5 else "false"
+        ingredients: str = (
+            f'{{"iron-plate", {rng.randint(1, 100)}}}, '
+            f'{{"copper-cable", {rng.randint(1, 100)}}}'
+        )
+        lines.append(
+            f'  {{type = "recipe", name = "item-{i}", enabled = {enabled}, '
+            f"energy_required = {rng.randint(1, 600) / 10}, "
+            f"ingredients = {{{ingredients}}}, "
+            f'result = "item-{i}", result_count = {rng.randint(1, 10)}}},'
+        )
+    lines.append("})")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+"""
+Memory of literal nodes and of whole parsed trees with and without
+hash-consing, and output size with and without string hoisting, on the lua
+test suite and a generated data file.
+
+Run with `python -m benchmarks.dedup_literals [entries]`.
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from tumfl.AST.ASTNode import ASTNode, TokenMode
+from tumfl.AST.Interner import Interner, LITERALS
+from tumfl.lexer import Lexer
+from tumfl.minifier import minify
+from tumfl.parser import parse_chunk
+from tumfl.Token import Token, TokenType
+
+from .data import literal_heavy_source
+
+
+def build_literals(texts: List[str], interner: Optional[Interner]) -> List[ASTNode]:
+    nodes: List[ASTNode] = []
+    for text in texts:
+        lexer: Lexer = Lexer(text)
+        while (token := lexer.get_next_token()).type != TokenType.EOF:
+            if token.type not in LITERALS:
+                continue
+            if interner is not None:
+                nodes.append(interner.from_token(token))
+            else:
+                nodes.append(LITERALS[token.type].from_token(token, TokenMode.NONE))
+    return nodes
+
+
+def parse_all(texts: List[str], interner: Optional[Interner]) -> List[ASTNode]:
+    # files starting with a "#" line can only be loaded by the lua executable
+    return [
+        parse_chunk(i, TokenMode.NONE, interner=interner)
+        for i in texts
+        if not i.startswith("#")
+    ]
+
+
+def measure(
+    build: Callable[[List[str], Optional[Interner]], Any],
+    texts: List[str],
+    interner: Optional[Interner],
+) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result: Any = build(texts, interner)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpora: Dict[str, List[str]] = {
+        "lua-tests": [
+            i.read_text(encoding="iso-8859-15")
+            for i in sorted(Path("lua-tests").glob("*.lua"))
+        ],
+        "data file": [literal_heavy_source(entries)],
+    }
+    for name, texts in corpora.items():
+        print(f"{name}: {sum(len(i) for i in texts)} bytes in {len(texts)} files")
+        plain: int = measure(build_literals, texts, None)
+        shared: int = measure(build_literals, texts, Interner())
+        print(f"  literal nodes: {plain / 2**20:7.2f} MiB")
+        print(f"   hash-consed: {shared / 2**20:7.2f} MiB ({shared / plain:.1%})")
+        plain = measure(parse_all, texts, None)
+        shared = measure(parse_all, texts, Interner())
+        print(f"   parsed trees: {plain / 2**20:7.2f} MiB")
+        print(f"   hash-consed: {shared / 2**20:7.2f} MiB ({shared / plain:.1%})")
+        minified: int = sum(len(minify(i)) for i in texts)
+        hoisted: int = sum(len(minify(i, hoist_strings=True)) for i in texts)
+        print(f"      minified: {minified} bytes")
+        print(f"       hoisted: {hoisted} bytes ({hoisted / minified:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Output size and minification time with and without constant folding, on the
+lua test suite and on generated data with constant expressions. The number of
+operators left in the output stands in for the work done when loading the
+script, as there is no lua interpreter to time here. Deeply nested parentheses
+around an expression that can't be folded check that failed parses are not
+repeated for every parenthesis.
+
+Run with `python -m benchmarks.fold_constants [entries]`.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from tumfl.lexer import Lexer
+from tumfl.minifier import minify
+from tumfl.parser import BINARY_OPERATORS, UNARY_OPERATORS
+from tumfl.Token import TokenType
+
+
+def constant_heavy_source(entries: int, seed: int = 0) -> str:
+    """Generates factorio style prototypes with times and sizes as expressions"""
+    rng = random.Random(seed)
+    lines: List[str] = ["data:extend({"]
+    for i in range(entries):
+        lines.append(
+            f'  {{type = "item", name = "item-" .. "{i}", '
+            f"spoil_ticks = {rng.randint(1, 48)} * 60 * 60, "
+            f"stack_size = 2 ^ {rng.randint(1, 8)}, "
+            f"weight = {rng.randint(1, 100)} * 1000 / 4, "
+            f"flags = 1 << {rng.randint(0, 31)} | 1, hidden = not true}},"
+        )
+    lines.append("})")
+    return "\n".join(lines) + "\n"
+
+
+def count_operators(text: str) -> int:
+    lexer: Lexer = Lexer(text)
+    count: int = 0
+    while (token := lexer.get_next_token()).type != TokenType.EOF:
+        count += token.type in BINARY_OPERATORS or token.type in UNARY_OPERATORS
+    return count
+
+
+def run(text: str, fold_constants: bool) -> Tuple[str, float]:
+    best: float = float("inf")
+    result: str = ""
+    for _ in range(3):
+        start: float = time.perf_counter()
+        result = minify(text, fold_constants=fold_constants)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tests: str = "\n".join(
+        i.read_text(encoding="iso-8859-15")
+        for i in sorted(Path("lua-tests").glob("*.lua"))
+    )
+    sources: List[Tuple[str, str]] = [
+        ("generated data", constant_heavy_source(entries)),
+        ("lua-tests", tests),
+        ("nested parentheses", f"x = {'(' * entries}a.b{')' * entries}\n"),
+    ]
+    for name, text in sources:
+        plain, plain_time = run(text, False)
+        folded, folded_time = run(text, True)
+        print(f"{name}: {len(text)} bytes of source")
+        print(
+            f"  plain:  {len(plain):8} bytes, {count_operators(plain):6} operators,"
+            f" {plain_time:.3f}s"
+        )
+        print(
+            f"  folded: {len(folded):8} bytes, {count_operators(folded):6} operators,"
+            f" {folded_time:.3f}s ({len(folded) / len(plain) - 1:+.1%} size)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Parsing a large generated control script eagerly and with deferred function
+bodies, followed by a pass that only looks at the top level (collecting the
+names of declared functions) and does not descend into function bodies.
+Reports the time and the memory retained by the tree.
+
+Run with `python -m benchmarks.lazy_parsing [functions]`.
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from tumfl.AST.ASTNode import ASTNode
+from tumfl.AST.Function import Function
+from tumfl.AST.FunctionDeclaration import FunctionDeclaration
+from tumfl.AST.LocalFunction import LocalFunction
+from tumfl.AST.Variable import Variable
+from tumfl.AST.Visitor import NodeVisitor
+from tumfl.parser import parse_chunk
+
+
+def control_script(functions: int, seed: int = 0) -> str:
+    """Generates a factorio style control.lua, with most code in event handlers"""
+    rng = random.Random(seed)
+    lines: List[str] = ["local util = require('util')", "local handlers = {}"]
+    for i in range(functions):
+        name: str = f"on_event_{i}"
+        lines.append(
+            f"local function {name}(event)\n"
+            f"  local player = game.get_player(event.player_index)\n"
+            f"  if not (player and player.valid) then return end\n"
+            f"  for index, entity in pairs(storage.entities[{i}] or {{}}) do\n"
+            f"    if entity.valid and entity.energy > {rng.randint(1, 9999)} then\n"
+            f"      entity.surface.create_entity{{name = 'spark-{i}', "
+            f"position = entity.position, force = player.force}}\n"
+            f"    elseif index % {rng.randint(2, 9)} == 0 then\n"
+            f"      storage.entities[{i}][index] = nil\n"
+            f"    else\n"
+            f"      player.print({{'message.count', index, #storage.entities}})\n"
+            f"    end\n"
+            f"  end\n"
+            f"  local total = 0\n"
+            f"  repeat total = total + math.random(1, 10) until total > "
+            f"{rng.randint(10, 100)}\n"
+            f"  return function() return total * {rng.randint(1, 9)} end\n"
+            f"end\n"
+            f"handlers[defines.events.{name}] = {name}"
+        )
+    lines.append("for event, handler in pairs(handlers) do")
+    lines.append("  script.on_event(event, handler)")
+    lines.append("end")
+    return "\n".join(lines) + "\n"
+
+
+class DeclaredFunctions(NodeVisitor):
+    """Names of declared functions, without looking into any function body"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.names: List[str] = []
+
+    def visit_LocalFunction(self, node: LocalFunction) -> None:
+        self.names.append(node.variable.id)
+        self.skip()
+
+    def visit_FunctionDeclaration(self, node: FunctionDeclaration) -> None:
+        if isinstance(node.target, Variable):
+            self.names.append(node.target.id)
+        self.skip()
+
+    def visit_Function(self, node: Function) -> None:
+        self.skip()
+
+
+def top_level_pass(text: str, lazy: bool) -> List[str]:
+    visitor: DeclaredFunctions = DeclaredFunctions()
+    visitor.visit(parse_chunk(text, lazy=lazy))
+    return visitor.names
+
+
+def retained_memory(text: str, lazy: bool) -> int:
+    """Memory allocated by the tree after the pass, while it is still alive"""
+    gc.collect()
+    tracemalloc.start()
+    tree: ASTNode = parse_chunk(text, lazy=lazy)
+    DeclaredFunctions().visit(tree)
+    retained: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained
+
+
+def main() -> None:
+    functions: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text: str = control_script(functions)
+    print(f"{len(text)} bytes of source, {functions} functions")
+    results: Dict[bool, Tuple[float, int]] = {}
+    for lazy in (False, True):
+        best: float = float("inf")
+        for _ in range(3):
+            start: float = time.perf_counter()
+            names: List[str] = top_level_pass(text, lazy)
+            best = min(best, time.perf_counter() - start)
+        # tracemalloc slows everything down, so memory is measured separately
+        results[lazy] = (best, retained_memory(text, lazy))
+        print(
+            f"{'lazy' if lazy else 'eager':>5}: {best:6.3f}s, "
+            f"{results[lazy][1] / 2**20:7.2f} MiB retained, "
+            f"{len(names)} functions found"
+        )
+    eager, deferred = results[False], results[True]
+    print(
+        f"lazy is {eager[0] / deferred[0]:.1f}x faster and retains "
+        f"{eager[1] / deferred[1]:.1f}x less memory"
+    )
+
+
+if __name__ == "__main__":
+    main()
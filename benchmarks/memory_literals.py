@@ -0,0 +1,65 @@
+"""
+Memory used by literal nodes on a large, literal heavy file, per TokenMode.
+
+Run with `python -m benchmarks.memory_literals [entries]`.
+"""
+
+import gc
+import sys
+import tracemalloc
+from typing import Callable, Dict, List
+
+from tumfl.AST.ASTNode import ASTNode, TokenMode
+from tumfl.AST.Boolean import Boolean
+from tumfl.AST.Number import Number
+from tumfl.AST.String import String
+from tumfl.AST.Variable import Variable
+from tumfl.lexer import Lexer
+from tumfl.Token import Token, TokenType
+
+from .data import literal_heavy_source
+
+CONSTRUCTORS: Dict[TokenType, Callable[[Token, TokenMode], ASTNode]] = {
+    TokenType.TRUE: Boolean.from_token,
+    TokenType.FALSE: Boolean.from_token,
+    TokenType.NUMBER: Number.from_token,
+    TokenType.STRING: String.from_token,
+    TokenType.NAME: Variable.from_token,
+}
+
+
+def build_nodes(text: str, mode: TokenMode) -> List[ASTNode]:
+    lexer: Lexer = Lexer(text)
+    nodes: List[ASTNode] = []
+    while (token := lexer.get_next_token()).type != TokenType.EOF:
+        if constructor := CONSTRUCTORS.get(token.type):
+            nodes.append(constructor(token, mode))
+    return nodes
+
+
+def measure(text: str, mode: TokenMode) -> int:
+    gc.collect()
+    tracemalloc.start()
+    nodes: List[ASTNode] = build_nodes(text, mode)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+    return current
+
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    text: str = literal_heavy_source(entries)
+    print(f"{len(text)} bytes of source")
+    baseline: int = measure(text, TokenMode.TOKEN)
+    for mode in TokenMode:
+        used: int = baseline if mode == TokenMode.TOKEN else measure(text, mode)
+        print(
+            f"{mode.name:>6}: {used / 2**20:8.2f} MiB "
+            f"({used / baseline:6.1%} of TokenMode.TOKEN)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Minification time with and without source map generation.
+
+Run with `python -m benchmarks.minify_sourcemap [entries]`.
+"""
+
+import os
+import sys
+import time
+from typing import Optional
+
+from tumfl.minifier import Minifier
+from tumfl.sourcemap import SourceMapWriter
+
+from .data import literal_heavy_source
+
+
+def run(text: str, with_map: bool) -> float:
+    with open(os.devnull, "w") as output, open(os.devnull, "w") as map_output:
+        writer: Optional[SourceMapWriter] = (
+            SourceMapWriter(map_output, ["data.lua"]) if with_map else None
+        )
+        start: float = time.perf_counter()
+        Minifier(text, source_map=writer).minify(output)
+        if writer:
+            writer.close()
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    text: str = literal_heavy_source(entries)
+    without_map: float = float("inf")
+    with_map: float = float("inf")
+    # interleave the runs, so that noise affects both the same way
+    for _ in range(5):
+        without_map = min(without_map, run(text, False))
+        with_map = min(with_map, run(text, True))
+    print(f"{len(text)} bytes of source")
+    print(f"without source map: {without_map:.3f}s")
+    print(f"   with source map: {with_map:.3f}s ({with_map / without_map - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Serial lexing compared to speculative parallel lexing of one large file.
+
+Run with `python -m benchmarks.parallel_lexing [entries]`. Speedups depend on
+the number of cores, all times include starting the worker processes. The
+time of stitching, which runs serially in the parent process, is measured on
+chunks lexed in this process, as is the time of building every Token of the
+stitched stream afterwards.
+"""
+
+import os
+import sys
+import time
+from typing import List
+
+from tumfl.lexer import Lexer
+from tumfl.parallel import (
+    ChunkResult,
+    _init_worker,
+    _lex_chunk,
+    lex_parallel,
+    split_text,
+    stitch,
+)
+from tumfl.Token import Token, TokenType
+
+from .data import literal_heavy_source
+
+
+def lex_serial(text: str) -> List[Token]:
+    lexer: Lexer = Lexer(text)
+    tokens: List[Token] = [lexer.get_next_token()]
+    while tokens[-1].type != TokenType.EOF:
+        tokens.append(lexer.get_next_token())
+    return tokens
+
+
+def main() -> None:
+    entries: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text: str = literal_heavy_source(entries)
+    cores: int = os.cpu_count() or 1
+    print(f"{len(text)} bytes, {cores} cores")
+    start: float = time.perf_counter()
+    count: int = len(lex_serial(text))
+    serial: float = time.perf_counter() - start
+    print(f"   serial: {serial:6.2f}s ({count} tokens)")
+    boundaries: List[int] = split_text(text, 8)
+    _init_worker(text)
+    chunks: List[ChunkResult] = list(map(_lex_chunk, boundaries, boundaries[1:]))
+    start = time.perf_counter()
+    stream = stitch(text, chunks)
+    stitched: float = time.perf_counter() - start
+    start = time.perf_counter()
+    assert len(list(stream)) == count
+    built: float = time.perf_counter() - start
+    print(f"   stitch: {stitched:6.2f}s (building all tokens: {built:.2f}s)")
+    for processes in sorted({2, 4, cores}):
+        start = time.perf_counter()
+        assert len(lex_parallel(text, processes)) == count
+        parallel: float = time.perf_counter() - start
+        print(
+            f"{processes:2} processes: {parallel:6.2f}s " f"({serial / parallel:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Expression parser throughput on generated code: long concatenation chains,
+deeply nested arithmetic and random mixed expressions, each at doubling sizes
+to show that parsing time grows linearly.
+
+Run with `python -m benchmarks.parse_throughput [size]`.
+"""
+
+import random
+import sys
+import time
+from typing import Callable, Dict
+
+from tumfl.lexer import Lexer
+from tumfl.parser import Parser, BINARY_OPERATORS
+from tumfl.Token import TokenType
+
+
+def concat_chain(size: int) -> str:
+    return " .. ".join(f'"part{i}"' for i in range(size))
+
+
+def nested_arithmetic(size: int) -> str:
+    return "(" * size + "x" + "".join(f" + {i}) * 2" for i in range(size))
+
+
+def mixed(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    operators = [i.value for i in BINARY_OPERATORS]
+    parts = [f"v{rng.randint(0, 9)}"]
+    for _ in range(size):
+        prefix: str = rng.choice(["", "", "", "-", "not ", "#"])
+        parts.append(f" {rng.choice(operators)} {prefix}{rng.randint(0, 99)}")
+    return "".join(parts)
+
+
+def count_tokens(text: str) -> int:
+    lexer: Lexer = Lexer(text)
+    count: int = 0
+    while lexer.get_next_token().type != TokenType.EOF:
+        count += 1
+    return count
+
+
+def main() -> None:
+    size: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    generators: Dict[str, Callable[[int], str]] = {
+        "concat chain": concat_chain,
+        "nested arithmetic": nested_arithmetic,
+        "mixed": mixed,
+    }
+    for name, generate in generators.items():
+        print(name)
+        for factor in (1, 2, 4):
+            text: str = generate(size * factor)
+            start: float = time.perf_counter()
+            tokens: int = count_tokens(text)
+            lexing: float = time.perf_counter() - start
+            start = time.perf_counter()
+            Parser(Lexer(text)).parse_expression()
+            parsing: float = time.perf_counter() - start
+            print(
+                f"  {tokens:8} tokens: lex {lexing:6.3f}s, lex + parse "
+                f"{parsing:6.3f}s, {tokens / parsing / 1000:7.1f}k tokens/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Lexing many files with lex_many at different thread counts. On free-threaded
+builds this should scale with the number of cores, with the GIL it should stay
+close to the single threaded time.
+
+Run with `python -m benchmarks.thread_lexing [files] [entries]`.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from tumfl.parallel import FREE_THREADED, lex_many
+
+from .data import literal_heavy_source
+
+
+def main() -> None:
+    files: int = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    entries: int = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    cores: int = os.cpu_count() or 1
+    build: str = "free-threaded" if FREE_THREADED else "GIL"
+    print(f"{sys.version.split()[0]} ({build}), {cores} cores")
+    with tempfile.TemporaryDirectory() as directory:
+        paths: List[Path] = []
+        for i in range(files):
+            path: Path = Path(directory) / f"data{i}.lua"
+            path.write_text(literal_heavy_source(entries, seed=i))
+            paths.append(path)
+        size: int = sum(i.stat().st_size for i in paths)
+        print(f"{files} files, {size} bytes")
+        single: float = 0
+        for threads in sorted({1, 2, 4, 8, cores}):
+            start: float = time.perf_counter()
+            lex_many(paths, threads)
+            duration: float = time.perf_counter() - start
+            single = single or duration
+            print(f"{threads:3} threads: {duration:6.2f}s ({single / duration:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from typing import List
+
+from tumfl.AST.ASTNode import ASTNode
+
+
+class Group(ASTNode):
+    def __init__(self, token, items: List[ASTNode], label: str = "") -> None:
+        super().__init__(token, "Group")
+        self.items: List[ASTNode] = items
+        self.label: str = label
+
+
+class Wrapper(ASTNode):
+    def __init__(self, token, inner: ASTNode) -> None:
+        super().__init__(token, "Wrapper")
+        self.inner: ASTNode = inner
+
+
+class Pair(ASTNode):
+    def __init__(self, token, left: ASTNode, right: ASTNode) -> None:
+        super().__init__(token, "Pair")
+        self.left: ASTNode = left
+        self.right: ASTNode = right
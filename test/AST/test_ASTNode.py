@@ -0,0 +1,118 @@
+import unittest
+
+from tumfl.AST.ASTNode import *
+from tumfl.AST.Boolean import Boolean
+from tumfl.AST.Number import Number
+from tumfl.AST.String import String
+from tumfl.AST.Variable import Variable
+from tumfl.AST.Visitor import NodeTransformer
+from tumfl.Token import Token, TokenType
+
+from .nodes import Group, Wrapper
+
+
+def make_tree(value: str = "b") -> Group:
+    tree = Group(
+        None,
+        [
+            Wrapper(None, String(None, "a")),
+            Group(None, [Boolean(None, True), String(None, value)]),
+            Wrapper(None, String(None, "a")),
+        ],
+    )
+    tree.parent(tree)
+    tree.parent_class = None
+    return tree
+
+
+class ToUpper(NodeTransformer):
+    def visit_String(self, node):
+        node.value = node.value.upper()
+        return node
+
+
+class TestStructuralHash(unittest.TestCase):
+    def test_equal_trees(self):
+        first = make_tree()
+        second = make_tree()
+        self.assertEqual(first.structural_hash(), second.structural_hash())
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, make_tree("c"))
+        self.assertNotEqual(first.structural_hash(), make_tree("c").structural_hash())
+
+    def test_unhashable(self):
+        # equality is structural and nodes are mutable
+        with self.assertRaises(TypeError):
+            hash(make_tree())
+        with self.assertRaises(TypeError):
+            {String(None, "a")}
+
+    def test_ignores_tokens(self):
+        token = Token(TokenType.STRING, "a", 3, 4, 10, 13)
+        self.assertEqual(
+            String.from_token(token).structural_hash(),
+            String(None, "a").structural_hash(),
+        )
+
+    def test_distinguishes_types(self):
+        self.assertNotEqual(
+            Variable(None, "a").structural_hash(), String(None, "a").structural_hash()
+        )
+        self.assertNotEqual(Variable(None, "a"), String(None, "a"))
+
+    def test_cached(self):
+        tree = make_tree()
+        tree.structural_hash()
+        for node in tree.items:
+            self.assertIsNotNone(node._hash)
+        tree.items[1].items[1].value = "x"
+        # direct changes are not noticed without invalidation
+        self.assertEqual(tree.structural_hash(), make_tree().structural_hash())
+        tree.items[1].items[1].invalidate_hash()
+        self.assertEqual(tree.structural_hash(), make_tree("x").structural_hash())
+        self.assertIsNotNone(tree.items[0]._hash)
+
+    def test_replace(self):
+        tree = make_tree()
+        tree.structural_hash()
+        group = tree.items[1]
+        group.replace(group.items[1], String(None, "c"))
+        self.assertIsNone(tree._hash)
+        self.assertEqual(tree, make_tree("c"))
+        self.assertEqual(tree.structural_hash(), make_tree("c").structural_hash())
+
+    def test_transformer(self):
+        tree = make_tree()
+        tree.structural_hash()
+        ToUpper().transform(tree.items[1])
+        expected = make_tree("B")
+        self.assertEqual(tree.structural_hash(), expected.structural_hash())
+        self.assertEqual(tree, expected)
+
+    def test_deep_tree(self):
+        first: ASTNode = Number(None, False, "1")
+        second: ASTNode = Number(None, False, "1")
+        for _ in range(10000):
+            first = Wrapper(None, first)
+            second = Wrapper(None, second)
+        self.assertEqual(first.structural_hash(), second.structural_hash())
+        self.assertEqual(first, second)
+
+
+class TestFindDuplicates(unittest.TestCase):
+    def test_duplicates(self):
+        tree = make_tree("a")
+        duplicates = find_duplicates(tree)
+        self.assertEqual(len(duplicates), 2)
+        wrappers, strings = duplicates
+        self.assertEqual(wrappers, [tree.items[0], tree.items[2]])
+        self.assertIs(wrappers[1], tree.items[2])
+        self.assertEqual(len(strings), 3)
+        self.assertTrue(all(i == String(None, "a") for i in strings))
+
+    def test_no_duplicates(self):
+        self.assertEqual(find_duplicates(Group(None, [String(None, "a")])), [])
+
+    def test_shared_nodes(self):
+        shared = String(None, "a")
+        self.assertEqual(find_duplicates(Group(None, [shared, shared])), [[shared] * 2])
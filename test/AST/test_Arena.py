@@ -0,0 +1,114 @@
+import unittest
+
+from tumfl.AST.Arena import *
+from tumfl.AST.Boolean import Boolean
+from tumfl.AST.Number import Number
+from tumfl.AST.String import String
+from tumfl.AST.Variable import Variable
+from tumfl.parser import parse_chunk
+from tumfl.Token import Token, TokenType
+
+from .nodes import Group, Pair
+
+
+def string(value: str) -> String:
+    return String.from_token(Token(TokenType.STRING, value, 1, 1))
+
+
+def number(value: str) -> Number:
+    return Number.from_token(
+        Token(TokenType.NUMBER, (False, value, None, None, None), 1, 1)
+    )
+
+
+class TestArena(unittest.TestCase):
+    def setUp(self):
+        self.tree = Group(
+            None,
+            [
+                Pair(None, string("a"), number("1")),
+                string("a"),
+                Group(None, [Boolean(None, True), number("1")], "inner"),
+                Group(None, [], "empty"),
+            ],
+            "root",
+        )
+
+    def test_round_trip(self):
+        arena = Arena.from_tree(self.tree)
+        self.assertEqual(len(arena), 9)
+        result = arena.to_tree()
+        self.assertEqual(result, self.tree)
+        self.assertIsNot(result, self.tree)
+        self.assertIs(result.items[0].left.parent_class, result.items[0])
+        self.assertIs(result.items[2].parent_class, result)
+        self.assertIsNone(result.parent_class)
+        self.assertIsNone(result.items[1].token)
+
+    def test_walk(self):
+        arena = Arena.from_tree(self.tree)
+        kinds = [arena.kind(i).__name__ for i in arena.walk()]
+        self.assertEqual(
+            kinds,
+            [
+                "Group",
+                "Pair",
+                "String",
+                "Number",
+                "String",
+                "Group",
+                "Boolean",
+                "Number",
+                "Group",
+            ],
+        )
+        self.assertEqual(list(arena.walk(1)), [1, 2, 3])
+        self.assertEqual(list(arena.walk(8)), [8])
+        self.assertEqual(list(arena.children(0)), [1, 4, 5, 8])
+        self.assertEqual(arena.parents[6], 5)
+
+    def test_shared_values(self):
+        arena = Arena.from_tree(self.tree)
+        strings = list(arena.find(String))
+        self.assertEqual(len(strings), 2)
+        self.assertEqual(
+            arena.value_indices[strings[0]], arena.value_indices[strings[1]]
+        )
+        self.assertEqual(arena.value(strings[0]), ("a",))
+        numbers = list(arena.find(Number))
+        self.assertEqual(
+            arena.value_indices[numbers[0]], arena.value_indices[numbers[1]]
+        )
+        self.assertEqual(list(arena.find(Variable)), [])
+
+    def test_bool_is_not_int(self):
+        arena = Arena()
+        first = arena.add(Boolean, (True,))
+        second = arena.add(Boolean, (1,))
+        self.assertNotEqual(arena.value_indices[first], arena.value_indices[second])
+        self.assertEqual(arena.roots, [first, second])
+
+    def test_value_lists(self):
+        chunk = parse_chunk("local a <const>, b = 1, 2\nprint(a)\nlocal c <close> = d")
+        arena = Arena.from_tree(chunk)
+        result = arena.to_tree()
+        self.assertEqual(result, chunk)
+        self.assertEqual(result.statements[0].attributes, ["const", None])
+        self.assertEqual(result.statements[2].attributes, ["close"])
+        self.assertIs(result.statements[0].values[0].parent_class, result.statements[0])
+
+    def test_node_view(self):
+        arena = Arena.from_tree(self.tree)
+        view = arena.node(5)
+        self.assertIs(view.kind, Group)
+        self.assertEqual(view.label, "inner")
+        self.assertEqual([i.kind for i in view.items], [Boolean, Number])
+        self.assertEqual(view.items[1].integer_part, "1")
+        self.assertEqual(view.parent, arena.node(0))
+        self.assertIsNone(view.parent.parent)
+        self.assertEqual(arena.node(1).right, arena.node(3))
+        with self.assertRaises(AttributeError):
+            view.missing
+        tree = view.to_tree()
+        self.assertEqual(tree, self.tree.items[2])
+        self.assertIsNone(tree.parent_class)
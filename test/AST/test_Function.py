@@ -0,0 +1,59 @@
+import unittest
+
+from tumfl.AST.Function import *
+from tumfl.AST.Block import Block
+from tumfl.AST.Break import Break
+from tumfl.AST.Visitor import NodeVisitor
+
+
+class TestFunction(unittest.TestCase):
+    def test_eager(self):
+        body = Block(None, [Break(None)])
+        function = Function(None, [Variable(None, "a")], True, body)
+        self.assertEqual(function.name, "Function")
+        self.assertTrue(function.loaded)
+        self.assertIs(function.body, body)
+        self.assertEqual(list(function.children()), [Variable(None, "a"), body])
+
+    def test_deferred(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return Block(None, [Break(None)])
+
+        function = Function.deferred(None, [], False, load)
+        self.assertFalse(function.loaded)
+        self.assertEqual(calls, [])
+        body = function.body
+        self.assertTrue(function.loaded)
+        self.assertIs(body.parent_class, function)
+        self.assertIs(function.body, body)
+        self.assertEqual(calls, [1])
+
+    def test_deferred_equality(self):
+        eager = Function(None, [], False, Block(None, [Break(None)]))
+        deferred = Function.deferred(
+            None, [], False, lambda: Block(None, [Break(None)])
+        )
+        self.assertEqual(eager.structural_hash(), deferred.structural_hash())
+        self.assertEqual(deferred, eager)
+        other = Function.deferred(None, [], False, lambda: Block(None, []))
+        self.assertNotEqual(other, eager)
+
+    def test_replace_body(self):
+        function = Function.deferred(None, [], False, lambda: Block(None, []))
+        body = Block(None, [Break(None)])
+        function.body = body
+        self.assertTrue(function.loaded)
+        self.assertIs(function.body, body)
+
+    def test_visitor_skip(self):
+        class Skip(NodeVisitor):
+            def visit_Function(self, node):
+                self.skip()
+
+        def load():
+            raise AssertionError("the body must not be loaded")
+
+        Skip().visit(Block(None, [Function.deferred(None, [], False, load)]))
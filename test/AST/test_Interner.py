@@ -0,0 +1,62 @@
+import unittest
+
+from tumfl.AST.Interner import *
+from tumfl.AST.TableField import TableField
+from tumfl.AST.Variable import Variable
+
+
+def number_token(value: str) -> Token:
+    return Token(TokenType.NUMBER, (False, value, None, None, None), 1, 1)
+
+
+class TestInterner(unittest.TestCase):
+    def test_from_token(self):
+        interner = Interner()
+        first = interner.from_token(Token(TokenType.STRING, "abc", 1, 1))
+        second = interner.from_token(Token(TokenType.STRING, "abc", 4, 2))
+        self.assertIs(first, second)
+        self.assertIsNone(first.token)
+        self.assertIsNot(
+            interner.from_token(number_token("1")),
+            interner.from_token(number_token("2")),
+        )
+        self.assertIs(
+            interner.from_token(number_token("1")),
+            interner.from_token(number_token("1")),
+        )
+        true = interner.from_token(Token(TokenType.TRUE, "true", 1, 1))
+        false = interner.from_token(Token(TokenType.FALSE, "false", 1, 1))
+        self.assertIsNot(true, false)
+        self.assertIs(true, interner.from_token(Token(TokenType.TRUE, "true", 2, 2)))
+        self.assertEqual(len(interner), 5)
+        self.assertEqual(interner.hits, 4)
+
+    def test_types_are_separate(self):
+        interner = Interner()
+        string = interner.from_token(Token(TokenType.STRING, "1", 1, 1))
+        number = interner.from_token(number_token("1"))
+        self.assertIsInstance(string, String)
+        self.assertIsInstance(number, Number)
+
+    def test_intern(self):
+        interner = Interner()
+        shared = interner.from_token(Token(TokenType.STRING, "abc", 1, 1))
+        self.assertIs(interner.intern(String(None, "abc")), shared)
+        node = Number(None, False, "3")
+        self.assertIs(interner.intern(node), node)
+        self.assertIs(interner.from_token(number_token("3")), node)
+        with self.assertRaises(AssertionError):
+            interner.intern(Variable(None, "a"))
+
+    def test_unshared(self):
+        interner = Interner()
+        shared = interner.from_token(Token(TokenType.STRING, "abc", 1, 1))
+        copy = shared.unshared()
+        self.assertIsNot(copy, shared)
+        self.assertEqual(copy, shared)
+        self.assertIs(copy.unshared(), copy)
+        # replace doesn't change the parents of shared nodes
+        field = TableField(None, None, copy)
+        field.replace(copy, shared)
+        self.assertIs(field.value, shared)
+        self.assertIsNone(shared.parent_class)
@@ -0,0 +1,12 @@
+import unittest
+
+from tumfl.AST.Nil import *
+
+
+class TestNil(unittest.TestCase):
+    def test_from_token(self):
+        tok = Token(TokenType.NIL, "nil", 1, 1)
+        nil = Nil.from_token(tok)
+        self.assertEqual(nil.name, "Nil")
+        self.assertIs(nil.token, tok)
+        self.assertEqual(nil, Nil(None))
@@ -14,3 +14,49 @@ class TestNumber(unittest.TestCase):
         self.assertIs(nmb.float_offset, None)
         self.assertEqual(nmb.name, "Number")
         self.assertIs(nmb.token, tok)
+
+    def test_to_value(self):
+        self.assertEqual(Number(None, False, "12").to_value(), 12)
+        self.assertEqual(Number(None, False, "1", "5").to_value(), 1.5)
+        self.assertEqual(Number(None, False, None, "5", "-1").to_value(), 0.05)
+        self.assertIs(type(Number(None, False, "1", "").to_value()), float)
+        self.assertIs(type(Number(None, False, "1", None, "2").to_value()), float)
+        self.assertEqual(Number(None, True, "ff").to_value(), 255)
+        self.assertEqual(Number(None, True, "1", None, None, "4").to_value(), 16.0)
+        self.assertEqual(Number(None, True, "f" * 16).to_value(), -1)
+        self.assertEqual(
+            Number(None, False, "9223372036854775808").to_value(),
+            9223372036854775808.0,
+        )
+        self.assertEqual(Number(None, False, str(MAX_INTEGER)).to_value(), MAX_INTEGER)
+
+    def test_wrap_integer(self):
+        self.assertEqual(wrap_integer(MAX_INTEGER + 1), MIN_INTEGER)
+        self.assertEqual(wrap_integer(MIN_INTEGER - 1), MAX_INTEGER)
+        self.assertEqual(wrap_integer(-5), -5)
+
+    def test_from_value(self):
+        cases = {
+            0: "0",
+            86400: "86400",
+            10**12: "0xe8d4a51000",
+            2**62: "0x4000000000000000",
+            0.5: ".5",
+            1.0: "1.",
+            1025.0: "1025.",
+            0.001: ".001",
+            1e15: "1e15",
+            1.5e16: "15e15",
+            1.25e-7: "125e-9",
+            2.5e100: "25e99",
+            123.456: "123.456",
+        }
+        for value, spelling in cases.items():
+            number = Number.from_value(value)
+            self.assertEqual(number.spelling(), spelling, msg=value)
+            self.assertEqual(number.to_value(), value)
+            self.assertIs(type(number.to_value()), type(value))
+
+    def test_spelling(self):
+        tok = Token(TokenType.NUMBER, (True, "1A", "8", None, "-3"), 1, 1)
+        self.assertEqual(Number.from_token(tok).spelling(), "0x1A.8p-3")
@@ -1,6 +1,7 @@
 import unittest
 
 from tumfl.AST.String import *
+from tumfl.Source import Source, unpack_span
 
 
 class TestString(unittest.TestCase):
@@ -10,3 +11,26 @@ class TestString(unittest.TestCase):
         self.assertEqual(string.value, "abc")
         self.assertIs(string.token, tok)
         self.assertEqual(string.name, "String")
+
+    def test_token_modes(self):
+        tok = Token(TokenType.STRING, "abc", 1, 1, 10, 15)
+        string = String.from_token(tok, TokenMode.SPAN)
+        self.assertIsNone(string.token)
+        self.assertEqual(unpack_span(string.span), (10, 15))
+        self.assertEqual(string, String.from_token(tok))
+        self.assertEqual(string.position(Source("\n" * 3 + "a" * 20)), (3, 8))
+        self.assertIsNone(string.position())
+        string = String.from_token(tok, TokenMode.NONE)
+        self.assertIsNone(string.token)
+        self.assertIsNone(string.span)
+        self.assertNotIn("span", vars(string))
+        self.assertEqual(String.from_token(tok).position(), (1, 1))
+
+    def test_spelling(self):
+        self.assertEqual(String(None, "abc").spelling(), '"abc"')
+        self.assertEqual(String(None, 'a"b').spelling(), "'a\"b'")
+        self.assertEqual(String(None, "a'b\"").spelling(), '"a\'b\\""')
+        self.assertEqual(String(None, "abc").spelling("'"), "'abc'")
+        self.assertEqual(String(None, "a\nb\\").spelling(), '"a\\nb\\\\"')
+        self.assertEqual(String(None, "\0x\0" + "1").spelling(), '"\\0x\\0001"')
+        self.assertEqual(String(None, "\x7f").spelling(), '"\\127"')
@@ -0,0 +1,13 @@
+import unittest
+
+from tumfl.AST.Vararg import *
+
+
+class TestVararg(unittest.TestCase):
+    def test_from_token(self):
+        tok = Token(TokenType.ELLIPSIS, "...", 1, 1)
+        vararg = Vararg.from_token(tok)
+        self.assertEqual(vararg.name, "Vararg")
+        self.assertIs(vararg.token, tok)
+        self.assertFalse(vararg.truncated)
+        self.assertNotEqual(vararg, Vararg(None, True))
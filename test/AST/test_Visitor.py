@@ -0,0 +1,197 @@
+import unittest
+from typing import List
+
+from tumfl.AST.Visitor import *
+from tumfl.AST.BinOp import BinOp
+from tumfl.AST.Boolean import Boolean
+from tumfl.AST.Interner import Interner
+from tumfl.AST.Number import Number
+from tumfl.AST.UnOp import UnOp, UnaryOperator
+from tumfl.AST.String import String
+from tumfl.AST.Variable import Variable
+from tumfl.parser import parse_chunk
+
+from .nodes import Group, Pair, Wrapper
+
+
+def make_tree() -> Group:
+    tree = Group(
+        None,
+        [
+            String(None, "a"),
+            Wrapper(None, Variable(None, "x")),
+            Group(None, [Boolean(None, True), String(None, "b")]),
+        ],
+    )
+    tree.parent(tree)
+    tree.parent_class = None
+    return tree
+
+
+class Collector(NodeVisitor):
+    def __init__(self):
+        super().__init__()
+        self.seen: List[str] = []
+
+    def visit_String(self, node):
+        self.seen.append(node.value)
+
+    def visit_Wrapper(self, node):
+        self.seen.append("wrapper")
+        self.skip()
+
+    def generic_visit(self, node):
+        self.seen.append(node.name)
+
+
+class Base(NodeVisitor):
+    def visit_ASTNode(self, node):
+        self.last = node.name
+
+
+class TestNodeVisitor(unittest.TestCase):
+    def test_order_and_skip(self):
+        collector = Collector()
+        collector.visit(make_tree())
+        self.assertEqual(
+            collector.seen, ["Group", "a", "wrapper", "Group", "Boolean", "b"]
+        )
+
+    def test_dispatch_cache(self):
+        collector = Collector()
+        collector.visit(make_tree())
+        self.assertIs(Collector._dispatch[String], Collector.visit_String)
+        self.assertIs(Collector._dispatch[Boolean], Collector.generic_visit)
+        self.assertNotIn(String, NodeVisitor._dispatch)
+        self.assertNotIn(String, Base._dispatch)
+
+    def test_mro_fallback(self):
+        base = Base()
+        base.visit(String(None, "a"))
+        self.assertEqual(base.last, "String")
+
+
+class Upper(NodeTransformer):
+    def visit_String(self, node):
+        return String(None, node.value.upper())
+
+    def visit_Boolean(self, node):
+        return None
+
+    def visit_Wrapper(self, node):
+        return node.inner
+
+
+class TestNodeTransformer(unittest.TestCase):
+    def test_replace(self):
+        tree = make_tree()
+        old_string = tree.items[0]
+        result = Upper().transform(tree)
+        self.assertIs(result, tree)
+        self.assertEqual(
+            tree,
+            Group(
+                None,
+                [
+                    String(None, "A"),
+                    Variable(None, "x"),
+                    Group(None, [String(None, "B")]),
+                ],
+            ),
+        )
+        self.assertIs(tree.items[0].parent_class, tree)
+        self.assertIs(tree.items[1].parent_class, tree)
+        self.assertIs(tree.items[2].items[0].parent_class, tree.items[2])
+        self.assertIsNone(old_string.parent_class)
+
+    def test_replace_root(self):
+        # the returned node itself is not visited again, only its children
+        result = Upper().transform(Wrapper(None, Group(None, [String(None, "a")])))
+        self.assertEqual(result, Group(None, [String(None, "A")]))
+        self.assertIsNone(result.parent_class)
+
+    def test_swap(self):
+        class Swap(NodeTransformer):
+            def visit_Pair(self, node):
+                self.skip()
+                return Pair(None, node.right, node.left)
+
+        tree = Group(
+            None, [Pair(None, String(None, "a"), Wrapper(None, String(None, "b")))]
+        )
+        tree.parent(tree)
+        old = tree.items[0]
+        Swap().transform(tree)
+        pair = tree.items[0]
+        self.assertIsNot(pair, old)
+        self.assertIs(pair.parent_class, tree)
+        self.assertIs(pair.left.parent_class, pair)
+        self.assertIs(pair.right.parent_class, pair)
+        self.assertIs(pair.left.inner.parent_class, pair.left)
+
+    def test_wrap(self):
+        class Negate(NodeTransformer):
+            def __init__(self):
+                super().__init__()
+                self.seen: List[str] = []
+
+            def visit_Number(self, node):
+                self.seen.append(node.integer_part)
+                return UnOp(None, UnaryOperator.NEGATE, node)
+
+        chunk = parse_chunk("x = 1 + 2")
+        negate = Negate()
+        negate.transform(chunk)
+        self.assertEqual(negate.seen, ["1", "2"])
+        expression = chunk.statements[0].values[0]
+        self.assertIsInstance(expression, BinOp)
+        for operand in (expression.left, expression.right):
+            self.assertIsInstance(operand, UnOp)
+            self.assertIs(operand.parent_class, expression)
+            self.assertIsInstance(operand.operand, Number)
+            self.assertIs(operand.operand.parent_class, operand)
+
+    def test_shared(self):
+        class RenameFirst(NodeTransformer):
+            def visit_String(self, node):
+                if node.value == "a" and not hasattr(self, "done"):
+                    self.done = True
+                    node.value = "c"
+                return node
+
+        chunk = parse_chunk("x = 'a' y = 'a' z = 'a'", interner=Interner())
+        shared = chunk.statements[1].values[0]
+        RenameFirst().transform(chunk)
+        # shared nodes are changed as a copy, the other places keep them
+        self.assertEqual(chunk, parse_chunk("x = 'c' y = 'a' z = 'a'"))
+        self.assertEqual(shared.value, "a")
+        self.assertIs(chunk.statements[1].values[0], shared)
+        self.assertIs(chunk.statements[2].values[0], shared)
+        copy = chunk.statements[0].values[0]
+        self.assertIsNot(copy, shared)
+        self.assertIs(copy.parent_class, chunk.statements[0])
+
+    def test_deep_tree(self):
+        tree = Group(None, [String(None, "a")])
+        for _ in range(10000):
+            tree = Group(None, [tree])
+        self.assertIs(Upper().transform(tree), tree)
+        while isinstance(tree, Group):
+            tree = tree.items[0]
+        self.assertEqual(tree.value, "A")
+        self.assertEqual(tree.parent_class.name, "Group")
+
+
+class TestReplace(unittest.TestCase):
+    def test_replace(self):
+        tree = make_tree()
+        old = tree.items[1].inner
+        new = String(None, "y")
+        tree.items[1].replace(old, new)
+        self.assertIs(tree.items[1].inner, new)
+        self.assertIs(new.parent_class, tree.items[1])
+        self.assertIsNone(old.parent_class)
+        tree.replace(tree.items[0], None)
+        self.assertEqual(len(tree.items), 2)
+        with self.assertRaises(ValueError):
+            tree.replace(old, new)
@@ -0,0 +1,37 @@
+import unittest
+
+from tumfl.Source import *
+from tumfl.lexer import Lexer
+from tumfl.Token import TokenType
+
+
+class TestSpan(unittest.TestCase):
+    def test_pack(self):
+        self.assertEqual(unpack_span(pack_span(0, 0)), (0, 0))
+        self.assertEqual(unpack_span(pack_span(12, 20)), (12, 20))
+        self.assertEqual(unpack_span(pack_span(2**40, 2**40 + 5)), (2**40, 2**40 + 5))
+
+
+class TestSource(unittest.TestCase):
+    def test_position(self):
+        source = Source("ab\ncd\n\nef")
+        self.assertEqual(source.position(0), (0, 0))
+        self.assertEqual(source.position(1), (0, 1))
+        self.assertEqual(source.position(3), (1, 1))
+        self.assertEqual(source.position(7), (3, 1))
+        self.assertEqual(source.line_start(0), 0)
+        self.assertEqual(source.line_start(1), 3)
+        self.assertEqual(source.line_start(3), 7)
+
+    def test_matches_lexer(self):
+        text = "local a = 'b'\n  --[[c\n]] x = {1, 2.5,\n\t[[d]]}\n"
+        source = Source(text)
+        lex = Lexer(text)
+        while (token := lex.get_next_token()).type != TokenType.EOF:
+            self.assertEqual(source.position(token.start), (token.line, token.column))
+            self.assertEqual(
+                Lexer(source.span_text(pack_span(token.start, token.end)))
+                .get_next_token()
+                .value,
+                token.value,
+            )
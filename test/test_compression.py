@@ -0,0 +1,33 @@
+import unittest
+import zlib
+
+from tumfl.compression import *
+
+
+class TestCompression(unittest.TestCase):
+    def test_compressed_size(self):
+        text = "local a = 1 " * 100
+        size = compressed_size(text)
+        self.assertLess(size, len(text) // 10)
+        self.assertEqual(size, compressed_size(text.encode()))
+        # a zlib stream adds a two byte header and a four byte checksum
+        self.assertEqual(size + 6, len(zlib.compress(text.encode(), 9)))
+        self.assertGreaterEqual(compressed_size(text, 1), size)
+
+    def test_file_sizes(self):
+        sizes = FileSizes("a.lua", "local a = 1 -- one\n" * 10, "local a=1 " * 10)
+        self.assertEqual(sizes.raw, 190)
+        self.assertEqual(sizes.minified_raw, 100)
+        self.assertEqual(sizes.compressed, compressed_size("local a = 1 -- one\n" * 10))
+        self.assertLess(sizes.minified_compressed, sizes.compressed)
+
+    def test_format_report(self):
+        files = [FileSizes("control.lua", "x = 1 -- x", "x=1"), FileSizes("a", "", "")]
+        lines = format_report(files).splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0].split()[:3], ["file", "raw", "deflated"])
+        self.assertEqual(lines[1].split()[:2], ["control.lua", "10"])
+        total = lines[3].split()
+        self.assertEqual(total[:2], ["total", "10"])
+        self.assertEqual(int(total[2]), files[0].compressed + compressed_size(""))
+        self.assertEqual(total[3], "3")
@@ -0,0 +1,56 @@
+import unittest
+
+from tumfl.emitter import *
+from tumfl.parser import parse_expression
+
+
+def emit(expression) -> str:
+    parts = []
+    for text, node in expression_tokens(expression):
+        if text is None:
+            parts.append(node.id if isinstance(node, Variable) else node.spelling())
+        else:
+            parts.append(f" {text} " if text.isalpha() else text)
+    return "".join(parts)
+
+
+class TestEmitter(unittest.TestCase):
+    def test_round_trip(self):
+        for text in [
+            "a+b*c",
+            "(a+b)*c",
+            "a-(b-c)",
+            "a-b-c",
+            "a..b..c",
+            "(a..b)..c",
+            "a^b^c",
+            "(a^b)^c",
+            "-a^b",
+            "(-a)^b",
+            "-(a+b)",
+            "#a+1",
+            "a<b == (c<d)",
+            "not a == b",
+            "not (a == b)",
+            "a or b and c",
+            "(a or b) and c",
+            "2^-a",
+        ]:
+            tree = parse_expression(text)
+            self.assertEqual(parse_expression(emit(tree)), tree, msg=text)
+            self.assertEqual(
+                emit(tree).replace(" ", ""), text.replace(" ", ""), msg=text
+            )
+
+    def test_needs_parentheses(self):
+        tree = parse_expression("(a + b) * (c + d)")
+        self.assertTrue(needs_parentheses(tree, tree.left, True))
+        self.assertTrue(needs_parentheses(tree, tree.right, False))
+        tree = parse_expression("a * b + c * d")
+        self.assertFalse(needs_parentheses(tree, tree.left, True))
+        self.assertFalse(needs_parentheses(tree, tree.right, False))
+
+    def test_expression_length(self):
+        self.assertEqual(expression_length(parse_expression("(a+1)*2")), 7)
+        self.assertEqual(expression_length(parse_expression("a and not b")), 11)
+        self.assertEqual(expression_length(parse_expression("(...) .. 'x'")), 10)
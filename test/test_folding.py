@@ -0,0 +1,143 @@
+import math
+import unittest
+
+from tumfl.folding import *
+from tumfl.AST.Interner import Interner
+from tumfl.AST.Variable import Variable
+from tumfl.parser import parse_expression
+
+
+class TestFoldValues(unittest.TestCase):
+    def test_arithmetic(self):
+        B = BinaryOperator
+        self.assertEqual(fold_binary(B.ADD, 1, 2), 3)
+        self.assertIs(type(fold_binary(B.ADD, 1, 2.0)), float)
+        self.assertEqual(fold_binary(B.ADD, MAX_INTEGER, 1), MIN_INTEGER)
+        self.assertEqual(fold_binary(B.MULT, MIN_INTEGER, -1), MIN_INTEGER)
+        self.assertEqual(fold_binary(B.DIVIDE, 3, 2), 1.5)
+        self.assertIs(type(fold_binary(B.DIVIDE, 4, 2)), float)
+        self.assertEqual(fold_binary(B.EXPONENT, 2, 10), 1024.0)
+        self.assertIs(type(fold_binary(B.EXPONENT, 2, 10)), float)
+        self.assertEqual(fold_binary(B.INTEGER_DIVISION, 7, -2), -4)
+        self.assertEqual(fold_binary(B.INTEGER_DIVISION, 7.0, 2), 3.0)
+        self.assertEqual(fold_binary(B.INTEGER_DIVISION, MIN_INTEGER, -1), MIN_INTEGER)
+        self.assertEqual(fold_binary(B.MODULO, -7, 3), 2)
+        self.assertEqual(fold_binary(B.MODULO, 7, -3), -2)
+        self.assertEqual(fold_binary(B.MODULO, -5.5, 2), 0.5)
+        self.assertEqual(fold_binary(B.MODULO, 5.5, -2), -0.5)
+        self.assertEqual(math.copysign(1, fold_binary(B.MODULO, -4.0, 2)), -1)
+
+    def test_not_folded(self):
+        B = BinaryOperator
+        # errors and values without literals are left to run time
+        self.assertIs(fold_binary(B.INTEGER_DIVISION, 1, 0), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.MODULO, 1, 0), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.DIVIDE, 1, 0), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.MODULO, 1.0, 0), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.MULT, 1e300, 1e300), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.ADD, "1", 2), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.LESS_THAN, "a", "b"), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.LESS_THAN, 1, "b"), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.BIT_AND, 1.5, 1), NOT_CONSTANT)
+        self.assertIs(fold_binary(B.CONCAT, "a", True), NOT_CONSTANT)
+        self.assertIs(fold_unary(UnaryOperator.NEGATE, "1"), NOT_CONSTANT)
+        self.assertIs(fold_unary(UnaryOperator.LENGTH, 1), NOT_CONSTANT)
+        self.assertIs(literal_value(String(None, "ä")), NOT_CONSTANT)
+        self.assertIs(literal_value(Variable(None, "x")), NOT_CONSTANT)
+
+    def test_bitwise(self):
+        B = BinaryOperator
+        self.assertEqual(fold_binary(B.BIT_AND, 6, 3.0), 2)
+        self.assertEqual(fold_binary(B.BIT_OR, 4, 1), 5)
+        self.assertEqual(fold_binary(B.BIT_XOR, 5, 1), 4)
+        self.assertEqual(fold_binary(B.BIT_SHIFT_LEFT, 1, 63), MIN_INTEGER)
+        self.assertEqual(fold_binary(B.BIT_SHIFT_LEFT, 1, 64), 0)
+        self.assertEqual(fold_binary(B.BIT_SHIFT_RIGHT, -1, 60), 15)
+        self.assertEqual(fold_binary(B.BIT_SHIFT_LEFT, 8, -2), 2)
+        self.assertEqual(fold_unary(UnaryOperator.BIT_NOT, 0), -1)
+
+    def test_logic_and_comparison(self):
+        B = BinaryOperator
+        self.assertEqual(fold_binary(B.AND, None, 1), None)
+        self.assertEqual(fold_binary(B.AND, 0, 1), 1)
+        self.assertEqual(fold_binary(B.OR, False, "a"), "a")
+        self.assertIs(fold_binary(B.EQUALS, 1, 1.0), True)
+        self.assertIs(fold_binary(B.EQUALS, 1, "1"), False)
+        self.assertIs(fold_binary(B.EQUALS, 1, True), False)
+        self.assertIs(fold_binary(B.NOT_EQUALS, None, False), True)
+        self.assertIs(fold_binary(B.LESS_EQUALS, 2**53 + 1, float(2**53)), False)
+        self.assertIs(fold_unary(UnaryOperator.NOT, 0), False)
+        self.assertIs(fold_unary(UnaryOperator.NOT, None), True)
+        self.assertEqual(fold_unary(UnaryOperator.LENGTH, "abc"), 3)
+
+    def test_concat(self):
+        B = BinaryOperator
+        self.assertEqual(fold_binary(B.CONCAT, "a", 1), "a1")
+        self.assertEqual(fold_binary(B.CONCAT, 1.0, ""), "1.0")
+        self.assertEqual(fold_binary(B.CONCAT, 1e15, ""), "1e+15")
+        self.assertEqual(fold_binary(B.CONCAT, -0.0, ""), "-0.0")
+        self.assertEqual(fold_binary(B.CONCAT, 0.1, ""), "0.1")
+        self.assertEqual(fold_binary(B.CONCAT, 2**63 - 1, ""), str(MAX_INTEGER))
+
+
+class TestFold(unittest.TestCase):
+    def assertFolds(self, text, expected, replaced=1):
+        tree, count = fold(parse_expression(text))
+        self.assertEqual(tree, parse_expression(expected), msg=text)
+        self.assertEqual(count, replaced, msg=text)
+
+    def test_fold(self):
+        self.assertFolds("60 * 60 * 24", "86400")
+        self.assertFolds("'a' .. 'b' .. 1", '"ab1"')
+        self.assertFolds("1 == 1.0 and not nil", "true")
+        self.assertFolds("2^10 + 1", "1025.")
+        self.assertFolds("1 - 3", "-2")
+        self.assertFolds("-(2 - 5)", "3")
+        self.assertFolds("x * (1 + 2)", "x * 3")
+        self.assertFolds("(1 - 3) ^ x", "(-2) ^ x")
+        self.assertFolds("#'abc' + x + 1", "3 + x + 1")
+        self.assertFolds("1 // 0 + (2 + 2)", "1 // 0 + 4")
+        self.assertFolds("-0.0 .. ''", '"-0.0"')
+
+    def test_not_longer(self):
+        # 1024. is longer than 2^10
+        self.assertFolds("2^10", "2^10", 0)
+        self.assertFolds("1/3", "1/3", 0)
+        # literals are only written differently if that is shorter
+        self.assertFolds("0x10", "16")
+        self.assertFolds("1e1", "1e1", 0)
+        self.assertFolds("1000000000000", "0xe8d4a51000")
+        self.assertFolds("x", "x", 0)
+        self.assertFolds("-1", "-1", 0)
+
+    def test_parents(self):
+        tree, _ = fold(parse_expression("x + (1 + 2) * y"))
+        self.assertEqual(tree, parse_expression("x + 3 * y"))
+        self.assertIs(tree.right.left.parent_class, tree.right)
+        self.assertEqual(
+            tree.structural_hash(), parse_expression("x+3*y").structural_hash()
+        )
+
+    def test_shared(self):
+        # the parent of a shared literal could be any of its places
+        tree, count = fold(parse_expression("0x10 + x + 0x10", interner=Interner()))
+        self.assertEqual(tree, parse_expression("16 + x + 16"))
+        self.assertEqual(count, 2)
+
+    def test_literal_node(self):
+        self.assertEqual(literal_node(None), Nil(None))
+        self.assertEqual(literal_node(False), Boolean(None, False))
+        self.assertEqual(literal_node("a"), String(None, "a"))
+        self.assertEqual(literal_node(5), Number(None, False, "5"))
+        self.assertEqual(
+            literal_node(-5), UnOp(None, UnaryOperator.NEGATE, Number(None, False, "5"))
+        )
+        self.assertEqual(literal_node(MIN_INTEGER), Number(None, True, "8" + "0" * 15))
+        self.assertEqual(literal_node(-(2**62)).spelling(), "0xc000000000000000")
+        self.assertEqual(literal_node(-1.5).operand, Number(None, False, "1", "5"))
+
+    def test_deep(self):
+        depth = 10000
+        tree, count = fold(parse_expression(" + ".join(["1"] * depth)))
+        self.assertEqual(tree, Number(None, False, str(depth)))
+        self.assertEqual(count, 1)
@@ -259,6 +259,45 @@ class TestNextToken(unittest.TestCase):
         self.assertEqual(lex.get_next_token(), Token(TokenType.EOF, "eof", 1, 18))
         self.assertEqual(lex.get_next_token(), Token(TokenType.EOF, "eof", 1, 18))
 
+    def test_multi_character_symbols(self):
+        lex = Lexer("a==b...c..d~=e//f::g")
+        types = []
+        while (token := lex.get_next_token()).type != TokenType.EOF:
+            types.append(token.type)
+        self.assertEqual(
+            types,
+            [
+                TokenType.NAME,
+                TokenType.EQUALS,
+                TokenType.NAME,
+                TokenType.ELLIPSIS,
+                TokenType.NAME,
+                TokenType.CONCAT,
+                TokenType.NAME,
+                TokenType.NOT_EQUALS,
+                TokenType.NAME,
+                TokenType.INTEGER_DIVISION,
+                TokenType.NAME,
+                TokenType.COLON,
+                TokenType.COLON,
+                TokenType.NAME,
+            ],
+        )
+
+    def test_offsets(self):
+        lex = Lexer("ab == 'c'")
+        for start, end in [(0, 2), (3, 5), (6, 9), (9, 9)]:
+            token = lex.get_next_token()
+            self.assertEqual((token.start, token.end), (start, end))
+
+    def test_leading_dot_number(self):
+        lex = Lexer("a=.5..b")
+        self.assertEqual(lex.get_next_token(), Token(TokenType.NAME, "a", 0, 0))
+        self.assertEqual(lex.get_next_token(), Token(TokenType.ASSIGN, "=", 0, 1))
+        nmb: NumberTuple = (False, None, "5", None, None)
+        self.assertEqual(lex.get_next_token(), Token(TokenType.NUMBER, nmb, 0, 2))
+        self.assertEqual(lex.get_next_token(), Token(TokenType.CONCAT, "..", 0, 4))
+
     def test_comment_string(self):
         lex = Lexer("'abc\\\ndef'--abc\n\"abab'\"--[==[\n\\\n]===]]==]'abc'")
         self.assertEqual(
@@ -283,3 +322,39 @@ class TestNextToken(unittest.TestCase):
                 lex = Lexer(content)
                 while lex.get_next_token().type != TokenType.EOF:
                     ...
+
+
+class TestTriviaLexer(unittest.TestCase):
+    def test_trivia(self):
+        text = "#!/bin/lua\n-- header\n--[[x]] local a --c\n-- d\n"
+        lex = TriviaLexer(text)
+        token = lex.get_next_token()
+        self.assertEqual(token.type, TokenType.LOCAL)
+        self.assertEqual(token.trivia_start, 0)
+        self.assertEqual(
+            [text[i:j] for i, j in token.comments], ["-- header", "--[[x]]"]
+        )
+        token = lex.get_next_token()
+        self.assertEqual(text[token.trivia_start : token.start], " ")
+        self.assertEqual(token.comments, ())
+        token = lex.get_next_token()
+        self.assertEqual(token.type, TokenType.EOF)
+        self.assertEqual([text[i:j] for i, j in token.comments], ["--c", "-- d"])
+
+    def test_plain_lexer_unaffected(self):
+        lex = Lexer("-- a\nb")
+        token = lex.get_next_token()
+        self.assertEqual(token.comments, ())
+        self.assertEqual(token.trivia_start, -1)
+        self.assertNotIn("comments", vars(token))
+
+    def test_same_tokens(self):
+        for file in Path("lua-tests").iterdir():
+            if file.is_file() and file.suffix == ".lua":
+                content = file.read_text(encoding="iso-8859-15")
+                lex = Lexer(content)
+                trivia = TriviaLexer(content)
+                while (token := lex.get_next_token()).type != TokenType.EOF:
+                    other = trivia.get_next_token()
+                    self.assertEqual(token, other)
+                    self.assertEqual(token.start, other.start)
@@ -0,0 +1,328 @@
+import json
+import sys
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from tumfl.minifier import *
+from tumfl.sourcemap import SourceMapWriter, decode_vlq
+
+
+def token_values(text: str):
+    lex = Lexer(text)
+    result = []
+    while (token := lex.get_next_token()).type != TokenType.EOF:
+        result.append((token.type, token.value))
+    return result
+
+
+def literal_values(text: str):
+    """Token types and values, with numbers as their (typed) lua values"""
+    lex = Lexer(text)
+    result = []
+    while (token := lex.get_next_token()).type != TokenType.EOF:
+        value = token.value
+        if token.type == TokenType.NUMBER:
+            number = Number.from_token(token)
+            if number.fractional_part is None and "." in text[token.start : token.end]:
+                number.fractional_part = ""
+            value = number.to_value()
+            value = (type(value), value)
+        result.append((token.type, value))
+    return result
+
+
+class TestNeedsSpace(unittest.TestCase):
+    def test_needs_space(self):
+        self.assertTrue(needs_space("local", "a"))
+        self.assertTrue(needs_space("1", ".."))
+        self.assertTrue(needs_space("..", ".5"))
+        self.assertTrue(needs_space("1.", "5"))
+        self.assertTrue(needs_space("1.", "x"))
+        self.assertTrue(needs_space("0xa", ".."))
+        self.assertTrue(needs_space(".5", ".."))
+        self.assertFalse(needs_space("a1", ".."))
+        self.assertFalse(needs_space("..", "x"))
+        self.assertFalse(needs_space("..", "5"))
+        self.assertTrue(needs_space("-", "-3"))
+        self.assertTrue(needs_space("[", "[[a]]"))
+        self.assertTrue(needs_space("=", "="))
+        self.assertTrue(needs_space("/", "/"))
+        self.assertFalse(needs_space("a", "="))
+        self.assertFalse(needs_space(")", "a"))
+        self.assertFalse(needs_space("'a'", "b"))
+        self.assertFalse(needs_space("", "b"))
+
+
+class TestNames(unittest.TestCase):
+    def test_generate_names(self):
+        names = generate_names({"B"})
+        self.assertEqual([next(names) for _ in range(3)], ["A", "C", "D"])
+        names = generate_names({"x"}, "xy", "0x")
+        self.assertEqual([next(names) for _ in range(4)], ["y", "x0", "xx", "y0"])
+
+    def test_number_spelling(self):
+        def spelling(text, style):
+            token = Lexer(text).get_next_token()
+            return number_spelling(token, text, style)
+
+        self.assertEqual(spelling("0x10", "decimal"), "16")
+        self.assertEqual(spelling("0xfffffff", "decimal"), "268435455")
+        self.assertEqual(spelling("17592186044415", "shortest"), "0xfffffffffff")
+        self.assertEqual(spelling("100.", "shortest"), "1e2")
+        self.assertEqual(spelling("1e2", "decimal"), "1e2")
+        self.assertEqual(spelling("0x1p4", "decimal"), "16.")
+        # wrapped around, or too large for a float
+        self.assertIsNone(spelling("0xffffffffffffffff", "decimal"))
+        self.assertIsNone(spelling("1e999", "shortest"))
+
+
+class TestMinify(unittest.TestCase):
+    def test_simple(self):
+        self.assertEqual(
+            minify("local a = 1 -- comment\nreturn a .. 2 - -3\n"),
+            "local a=1 return a..2- -3",
+        )
+
+    def test_hex_concatenation(self):
+        self.assertEqual(minify("x = 0xa .. b\n"), "x=0xa ..b")
+        self.assertEqual(minify("x = 0x1F .. b\n"), "x=0x1F ..b")
+
+    def test_keeps_spelling(self):
+        self.assertEqual(
+            minify("x = 0x1P4 .. [==[\na]==] .. 1. .. a.b"),
+            "x=0x1P4 ..[==[\na]==]..1. ..a.b",
+        )
+
+    def test_rename(self):
+        self.assertEqual(
+            minify(
+                "local a = {a = a, [a] = a; f(a), a = 1, function() a = 1 end}"
+                " a.a = a:a()",
+                {"a": "b"},
+            ),
+            "local b={a=b,[b]=b;f(b),a=1,function()b=1 end}b.a=b:a()",
+        )
+
+    def test_hoist_strings(self):
+        self.assertEqual(
+            minify(
+                'require"abcdefghij" require "abcdefghij" local A'
+                ' x = {"abcdefghij", abcdefghij = "abcdefghij", "ab", "ab"}',
+                hoist_strings=True,
+            ),
+            'local B="abcdefghij"require(B)require(B)local A'
+            ' x={B,abcdefghij=B,"ab","ab"}',
+        )
+        # not worth it
+        self.assertEqual(
+            minify("x = 'abc' y = 'abc'", hoist_strings=True), "x='abc'y='abc'"
+        )
+
+    def test_hoist_limit(self):
+        # lua allows only 200 locals in the main chunk
+        text = "".join(f"local a{i}\n" for i in range(190))
+        text += "".join(f"x('string {i}', 'string {i}')\n" for i in range(20))
+        result = minify(text, hoist_strings=True)
+        self.assertTrue(result.startswith("local A,B,C,D,E,F,G,H="))
+
+    def test_keep_comments(self):
+        text = (
+            "#!/bin/lua\n-- License: MIT\n--[[ copyright me ]] local a --c\n"
+            "---@class X\nlocal b = {} -- see [1]\n---@type number\n"
+        )
+        self.assertEqual(
+            minify(text, keep_comments=LICENSE_AND_ANNOTATIONS),
+            "-- License: MIT\n--[[ copyright me ]]local a---@class X\n"
+            "local b={}---@type number\n",
+        )
+        self.assertEqual(
+            minify(text, keep_comments="see"), "local a local b={}-- see [1]\n"
+        )
+        self.assertEqual(
+            minify("a = 1 - --[[license]] 1", keep_comments="license"),
+            "a=1- --[[license]]1",
+        )
+
+    def test_keep_comments_hoisted(self):
+        self.assertEqual(
+            minify(
+                '-- License: MIT\nx = "abcdefghijk" .. "abcdefghijk" .. "abcdefghijk"',
+                keep_comments=LICENSE_AND_ANNOTATIONS,
+                hoist_strings=True,
+            ),
+            '-- License: MIT\nlocal A="abcdefghijk"x=A..A..A',
+        )
+
+    def test_fold_constants(self):
+        self.assertEqual(
+            minify("local x = 60 * 60 * 24 return x", fold_constants=True),
+            "local x=86400 return x",
+        )
+        self.assertEqual(
+            minify(
+                "f('a' .. 'b', 2 ^ 10 + 1) t = {[1 + 1] = -(1 - 3) < x}",
+                fold_constants=True,
+            ),
+            'f("ab",1025.)t={[2]=2<x}',
+        )
+        # a.b, f(), f"" and a:b() are not parsed, so their operands stay
+        self.assertEqual(
+            minify(
+                "x = a.b + 1 * 2 y = 1 + 2 .. f'' z = 1 * 2 + a", fold_constants=True
+            ),
+            "x=a.b+1*2 y=1+2 ..f''z=2+a",
+        )
+        self.assertEqual(minify("x = 1 // 0 + 2 * 2", fold_constants=True), "x=1//0+4")
+        self.assertEqual(
+            minify("return a and 1 - 1 .. '' or 2", {"a": "b"}, fold_constants=True),
+            'return b and"0"or 2',
+        )
+        self.assertEqual(
+            minify("x = 1 + --[[keep]] 2", keep_comments="keep", fold_constants=True),
+            "x=1+--[[keep]]2",
+        )
+        # lexer errors in a folded expression are raised, as without folding
+        with self.assertRaises(ValueError):
+            minify("x = 1 + 'abc\ny = 2\n", fold_constants=True)
+
+    def test_fold_nested_parentheses(self):
+        # parses inside a failed one that would fail the same way are skipped
+        text = "x = " + "(" * 100 + "a.b" + ")" * 100 + " y = ((1) + (c.d)) * (1 + 2)"
+        with mock.patch.object(
+            Parser,
+            "parse_expression",
+            autospec=True,
+            side_effect=Parser.parse_expression,
+        ) as parse:
+            self.assertEqual(
+                minify(text, fold_constants=True),
+                minify(text).replace("(1+2)", "(3)"),
+            )
+        self.assertLess(parse.call_count, 10)
+        lexer = Lexer("((1) + (-(a.")
+        tokens = []
+        while (token := lexer.get_next_token()).type != TokenType.EOF:
+            tokens.append(token)
+        # the parse fails at the dot, the ones at 1 and at the minus would too
+        self.assertEqual(doomed_starts(tokens), [8, 1])
+
+    def test_respelling(self):
+        text = (
+            "local a = {'x', \"y\", 0x10, 16, \"it's\", 'a\\'b'} "
+            "return a[0x10], a[16], 100."
+        )
+        minifier = Minifier(text)
+        minifier.quote = '"'
+        minifier.number_style = "decimal"
+        output = StringIO()
+        minifier.minify(output)
+        # strings with escapes keep their spelling
+        self.assertEqual(
+            output.getvalue(),
+            'local a={"x","y",16,16,"it\'s",\'a\\\'b\'}return a[16],a[16],1e2',
+        )
+
+    def test_compression_aware(self):
+        text = (
+            "data:extend({"
+            + "".join(
+                f"{{name = 'item-{i}', order = \"a-{i}\", size = {hex(i)}}},"
+                for i in range(200)
+            )
+            + "})"
+        )
+        minifier = Minifier(text, compression_aware=True)
+        output = StringIO()
+        minifier.minify(output)
+        self.assertIsNotNone(minifier.quote)
+        self.assertEqual(minifier.letters[0], "e")
+        self.assertLess(
+            compressed_size(output.getvalue()), compressed_size(minify(text))
+        )
+        # the original spellings are kept if nothing compresses better
+        minifier = Minifier("return 'x', 1", compression_aware=True)
+        minifier.minify(StringIO())
+        self.assertIsNone(minifier.quote)
+        self.assertIsNone(minifier.number_style)
+
+    def test_compression_aware_hoisting(self):
+        text = 'x = {"abcdefghijk", "abcdefghijk", "abcdefghijk", "abcdefghijk"}'
+        self.assertEqual(
+            minify(text, hoist_strings=True),
+            'local A="abcdefghijk"x={A,A,A,A}',
+        )
+        # deflate shortens the repetitions, the declaration would only cost bytes
+        self.assertEqual(
+            minify(text, hoist_strings=True, compression_aware=True),
+            'x={"abcdefghijk","abcdefghijk","abcdefghijk","abcdefghijk"}',
+        )
+
+    def test_lua_tests(self):
+        for file in Path("lua-tests").iterdir():
+            if file.is_file() and file.suffix == ".lua":
+                print(f"Minifying {file}", file=sys.stderr)
+                content = file.read_text(encoding="iso-8859-15")
+                result = minify(content)
+                self.assertLess(len(result), len(content))
+                self.assertEqual(token_values(result), token_values(content))
+                hoisted = minify(content, hoist_strings=True)
+                self.assertLessEqual(len(hoisted), len(result))
+                commented = minify(content, keep_comments=".")
+                self.assertEqual(token_values(commented), token_values(content))
+                folded = minify(content, fold_constants=True)
+                self.assertLessEqual(len(folded), len(result))
+                token_values(folded)
+                compressed = minify(content, compression_aware=True)
+                self.assertLessEqual(
+                    compressed_size(compressed), compressed_size(result)
+                )
+                self.assertEqual(literal_values(compressed), literal_values(result))
+                # every respelling keeps the values, even if it isn't chosen
+                for quote, number_style in zip(QUOTES, NUMBER_STYLES[1:]):
+                    minifier = Minifier(content)
+                    minifier.quote = quote
+                    minifier.number_style = number_style
+                    output = StringIO()
+                    minifier.minify(output)
+                    self.assertEqual(
+                        literal_values(output.getvalue()), literal_values(result)
+                    )
+
+
+class TestSourceMap(unittest.TestCase):
+    def test_source_map(self):
+        text = "local abc = 1\n  return abc .. 'x'\n"
+        output = StringIO()
+        map_output = StringIO()
+        writer = SourceMapWriter(map_output, ["input.lua"], "output.lua")
+        Minifier(text, {"abc": "a"}, writer).minify(output)
+        writer.close()
+        self.assertEqual(output.getvalue(), "local a=1 return a..'x'")
+        source_map = json.loads(map_output.getvalue())
+        self.assertEqual(source_map["version"], 3)
+        self.assertEqual(source_map["file"], "output.lua")
+        self.assertEqual(source_map["sources"], ["input.lua"])
+        self.assertEqual(source_map["names"], ["abc"])
+        segments = [decode_vlq(i) for i in source_map["mappings"].split(",")]
+        # resolve the relative fields
+        state = [0, 0, 0, 0, 0]
+        resolved = []
+        for segment in segments:
+            for i, value in enumerate(segment):
+                state[i] += value
+            resolved.append(tuple(state[: len(segment)]))
+        self.assertEqual(
+            resolved,
+            [
+                (0, 0, 0, 0),
+                (6, 0, 0, 6, 0),
+                (7, 0, 0, 10),
+                (8, 0, 0, 12),
+                (10, 0, 1, 2),
+                (17, 0, 1, 9, 0),
+                (18, 0, 1, 13),
+                (20, 0, 1, 16),
+            ],
+        )
@@ -0,0 +1,151 @@
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tumfl.parallel import *
+from tumfl.parallel import _init_worker, _lex_chunk
+from tumfl.lexer import (
+    TriviaLexer,
+    ALPHANUMERIC,
+    ESCAPE_CODES,
+    HEX_NUMBER,
+    LETTER,
+    NUMBER,
+    RESERVED_KEYWORDS,
+    SYMBOLS,
+)
+
+
+def serial(text: str):
+    lex = Lexer(text)
+    tokens = [lex.get_next_token()]
+    while tokens[-1].type != TokenType.EOF:
+        tokens.append(lex.get_next_token())
+    return tokens
+
+
+def details(tokens):
+    return [(i.type, i.value, i.line, i.column, i.start, i.end) for i in tokens]
+
+
+TRICKY = (
+    "local a = [==[\nx = 1\ny = 'abc\n]]\n]==]\n"
+    "--[[\nz = {\n'\n]]\n"
+    "b = 'line\\\ncontinued' c = \"\\z\n   d\"\n"
+    "e = {1, 2, 3}\n" * 3 + "f = [[\n--[[\n]] g = 0x1p4 -- ]]\n"
+)
+
+
+class TestSplitText(unittest.TestCase):
+    def test_split(self):
+        text = "a\nbb\nccc\ndddd\n"
+        self.assertEqual(split_text(text, 1), [0, len(text)])
+        boundaries = split_text(text, 3)
+        self.assertEqual(boundaries[0], 0)
+        self.assertEqual(boundaries[-1], len(text))
+        for i in boundaries[1:-1]:
+            self.assertEqual(text[i - 1], "\n")
+        self.assertEqual(split_text("abc", 4), [0, 3])
+
+
+class TestLexParallel(unittest.TestCase):
+    def test_tricky(self):
+        expected = details(serial(TRICKY))
+        for chunks in range(2, 40):
+            self.assertEqual(
+                details(lex_parallel(TRICKY, processes=0, chunks=chunks)), expected
+            )
+
+    def test_chunk_states(self):
+        text = "a = [[\nb = 1\nc = 2\n]] d = 1\ne = 2\n"
+        boundaries = [0, 7, 13, 19, 27, len(text)]
+        _init_worker(text)
+        chunks = [_lex_chunk(i, j) for i, j in zip(boundaries, boundaries[1:])]
+        self.assertEqual(details(stitch(text, chunks)), details(serial(text)))
+        self.assertEqual(
+            [i.valid_start for i in chunks], [True, False, False, False, True]
+        )
+
+    def test_token_stream(self):
+        expected = details(serial(TRICKY))
+        tokens = lex_parallel(TRICKY, processes=0, chunks=7)
+        self.assertIsInstance(tokens, TokenStream)
+        self.assertEqual(len(tokens), len(expected))
+        self.assertEqual(details(tokens[i] for i in range(len(tokens))), expected)
+        self.assertEqual(details([tokens[-1]]), expected[-1:])
+        self.assertEqual(details(tokens[3:-3:2]), expected[3:-3:2])
+        with self.assertRaises(IndexError):
+            tokens[len(tokens)]
+
+    def test_lua_tests(self):
+        for file in Path("lua-tests").iterdir():
+            if file.is_file() and file.suffix == ".lua":
+                print(f"Lexing {file}", file=sys.stderr)
+                content = file.read_text(encoding="iso-8859-15")
+                self.assertEqual(
+                    details(lex_parallel(content, processes=0, chunks=16)),
+                    details(serial(content)),
+                )
+
+    def test_processes(self):
+        text = TRICKY * 20
+        self.assertEqual(
+            details(lex_parallel(text, processes=2, chunks=8)),
+            details(serial(text)),
+        )
+
+    def test_serial(self):
+        self.assertEqual(details(lex_parallel("a = 1")), details(serial("a = 1")))
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            lex_parallel("a = 1\n" * 10 + "b = 'abc\n", processes=0, chunks=4)
+
+
+class TestLexMany(unittest.TestCase):
+    def setUp(self):
+        self.paths = sorted(Path("lua-tests").glob("*.lua"))
+
+    def test_lex_many(self):
+        expected = [
+            details(serial(i.read_text(encoding="iso-8859-15"))) for i in self.paths
+        ]
+        for threads in [1, 2, 8]:
+            result = lex_many(self.paths, threads, encoding="iso-8859-15")
+            self.assertEqual([details(i) for i in result], expected)
+
+    def test_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "broken.lua"
+            path.write_text("a = 'abc\n")
+            with self.assertRaises(ValueError):
+                lex_many([path, path], threads=2)
+
+    def test_stress(self):
+        # many lexers over the same texts at once, including trivia lexers
+        texts = [TRICKY, *(i.read_text(encoding="iso-8859-15") for i in self.paths)]
+        expected = [details(serial(i)) for i in texts]
+
+        def run(index: int):
+            text = texts[index % len(texts)]
+            lexer = TriviaLexer(text) if index % 2 else Lexer(text)
+            tokens = [lexer.get_next_token()]
+            while tokens[-1].type != TokenType.EOF:
+                tokens.append(lexer.get_next_token())
+            return details(tokens)
+
+        with ThreadPoolExecutor(16) as pool:
+            for index, result in enumerate(pool.map(run, range(4 * len(texts)))):
+                self.assertEqual(result, expected[index % len(texts)])
+
+    def test_immutable_tables(self):
+        with self.assertRaises(TypeError):
+            RESERVED_KEYWORDS["foo"] = TokenType.NAME
+        with self.assertRaises(TypeError):
+            SYMBOLS["$"] = TokenType.NAME
+        with self.assertRaises(TypeError):
+            ESCAPE_CODES["q"] = "q"
+        for table in [NUMBER, HEX_NUMBER, LETTER, ALPHANUMERIC, TOKEN_TYPES]:
+            self.assertIsInstance(table, tuple)
@@ -0,0 +1,402 @@
+import sys
+import unittest
+from pathlib import Path
+
+from tumfl.parser import *
+from tumfl.Source import pack_span
+
+
+def num(value: str) -> Number:
+    return Number(None, False, value)
+
+
+def var(name: str) -> Variable:
+    return Variable(None, name)
+
+
+def binop(left, op: str, right) -> BinOp:
+    return BinOp(None, left, BinaryOperator(op), right)
+
+
+def unop(op: str, operand) -> UnOp:
+    return UnOp(None, UnaryOperator(op), operand)
+
+
+class TestParser(unittest.TestCase):
+    def test_primary(self):
+        self.assertEqual(parse_expression("1"), num("1"))
+        self.assertEqual(parse_expression("'a'"), String(None, "a"))
+        self.assertEqual(parse_expression("true"), Boolean(None, True))
+        self.assertEqual(parse_expression("nil"), Nil(None))
+        self.assertEqual(parse_expression("..."), Vararg(None))
+        self.assertEqual(parse_expression("a"), var("a"))
+
+    def test_numbers(self):
+        self.assertEqual(parse_expression("1."), Number(None, False, "1", ""))
+        self.assertEqual(parse_expression(".5"), Number(None, False, None, "5"))
+        self.assertEqual(parse_expression("1e5"), Number(None, False, "1", None, "5"))
+
+    def test_long_strings(self):
+        self.assertEqual(parse_expression("[[\nab]]"), String(None, "ab"))
+        self.assertEqual(parse_expression("[==[\r\na\rb]==]"), String(None, "a\nb"))
+        self.assertEqual(parse_expression("[[\n\n]]"), String(None, "\n"))
+        self.assertEqual(parse_expression("'\\na'"), String(None, "\na"))
+
+    def test_precedence(self):
+        self.assertEqual(
+            parse_expression("a + b * c"),
+            binop(var("a"), "+", binop(var("b"), "*", var("c"))),
+        )
+        self.assertEqual(
+            parse_expression("a * b + c"),
+            binop(binop(var("a"), "*", var("b")), "+", var("c")),
+        )
+        self.assertEqual(
+            parse_expression("a or b and c == d"),
+            binop(
+                var("a"),
+                "or",
+                binop(var("b"), "and", binop(var("c"), "==", var("d"))),
+            ),
+        )
+        self.assertEqual(
+            parse_expression("a | b ~ c & d << e .. f"),
+            binop(
+                var("a"),
+                "|",
+                binop(
+                    var("b"),
+                    "~",
+                    binop(
+                        var("c"),
+                        "&",
+                        binop(var("d"), "<<", binop(var("e"), "..", var("f"))),
+                    ),
+                ),
+            ),
+        )
+        self.assertEqual(
+            parse_expression("a .. b + c"),
+            binop(var("a"), "..", binop(var("b"), "+", var("c"))),
+        )
+
+    def test_associativity(self):
+        self.assertEqual(
+            parse_expression("a - b - c"),
+            binop(binop(var("a"), "-", var("b")), "-", var("c")),
+        )
+        self.assertEqual(
+            parse_expression("a // b % c"),
+            binop(binop(var("a"), "//", var("b")), "%", var("c")),
+        )
+        self.assertEqual(
+            parse_expression("a .. b .. c"),
+            binop(var("a"), "..", binop(var("b"), "..", var("c"))),
+        )
+        self.assertEqual(
+            parse_expression("a ^ b ^ c"),
+            binop(var("a"), "^", binop(var("b"), "^", var("c"))),
+        )
+
+    def test_unary(self):
+        self.assertEqual(
+            parse_expression("-a ^ b"), unop("-", binop(var("a"), "^", var("b")))
+        )
+        self.assertEqual(
+            parse_expression("a ^ -b"), binop(var("a"), "^", unop("-", var("b")))
+        )
+        self.assertEqual(
+            parse_expression("not a == b"),
+            binop(unop("not", var("a")), "==", var("b")),
+        )
+        self.assertEqual(
+            parse_expression("~ # - a * b"),
+            binop(unop("~", unop("#", unop("-", var("a")))), "*", var("b")),
+        )
+        self.assertEqual(
+            parse_expression("a ~ ~b"), binop(var("a"), "~", unop("~", var("b")))
+        )
+
+    def test_parentheses(self):
+        self.assertEqual(
+            parse_expression("(a + b) * c"),
+            binop(binop(var("a"), "+", var("b")), "*", var("c")),
+        )
+        self.assertEqual(
+            parse_expression("-(a)^((b))"), unop("-", binop(var("a"), "^", var("b")))
+        )
+        self.assertEqual(parse_expression("(...)"), Vararg(None, True))
+        self.assertEqual(
+            parse_expression("... .. (...)"),
+            binop(Vararg(None), "..", Vararg(None, True)),
+        )
+
+    def test_parents(self):
+        tree = parse_expression("a + -b")
+        self.assertIs(tree.left.parent_class, tree)
+        self.assertIs(tree.right.parent_class, tree)
+        self.assertIs(tree.right.operand.parent_class, tree.right)
+
+    def test_stops_at_end_of_expression(self):
+        parser = Parser(Lexer("a + b) c"))
+        self.assertEqual(parser.parse_expression(), binop(var("a"), "+", var("b")))
+        self.assertEqual(parser.current.type, TokenType.R_PAREN)
+        # indexing and calls are only parsed by the ChunkParser
+        parser = Parser(Lexer("a.b"))
+        self.assertEqual(parser.parse_expression(), var("a"))
+        self.assertEqual(parser.current.type, TokenType.DOT)
+        parser = Parser(Lexer("1 * 2 x = 3"))
+        self.assertEqual(parser.parse_expression(), binop(num("1"), "*", num("2")))
+        self.assertEqual(parser.current, Token(TokenType.NAME, "x", 0, 0))
+
+    def test_token_modes(self):
+        tree = parse_expression("a + 1", TokenMode.NONE)
+        self.assertIsNone(tree.token)
+        self.assertIsNone(tree.left.token)
+        tree = parse_expression("a + 1", TokenMode.SPAN)
+        self.assertEqual(tree.span, pack_span(2, 3))
+
+    def test_errors(self):
+        for text in ["a +", "(a", "a)", "* a", "a + end"]:
+            with self.assertRaises(ValueError, msg=text):
+                parse_expression(text)
+
+    def test_deep_nesting(self):
+        depth = 5 * sys.getrecursionlimit()
+        tree = parse_expression(" .. ".join(["a"] * depth))
+        for _ in range(depth - 1):
+            self.assertEqual(tree.left, var("a"))
+            tree = tree.right
+        self.assertEqual(tree, var("a"))
+        tree = parse_expression("(" * depth + "1" + " + 1)" * depth)
+        for _ in range(depth):
+            self.assertEqual(tree.right, num("1"))
+            tree = tree.left
+        self.assertEqual(tree, num("1"))
+        tree = parse_expression("- not " * depth + "x")
+        self.assertEqual(tree.structural_hash(), tree.structural_hash())
+
+
+class TestTokenBuffer(unittest.TestCase):
+    def test_rewind(self):
+        buffer = TokenBuffer(Lexer("a = 1 + 2 b"))
+        first = buffer.get_next_token()
+        equals = buffer.get_next_token()
+        buffer.mark(equals)
+        self.assertIs(buffer.get_next_token(), equals)
+        one = buffer.get_next_token()
+        buffer.get_next_token()
+        buffer.rewind()
+        self.assertIs(buffer.get_next_token(), one)
+        self.assertEqual(buffer.get_next_token().type, TokenType.PLUS)
+        self.assertEqual(buffer.get_next_token().value[1], "2")
+        self.assertEqual(buffer.get_next_token().value, "b")
+        self.assertEqual(first.value, "a")
+
+    def test_release(self):
+        buffer = TokenBuffer(Lexer("x 1 * 2 ) y"))
+        buffer.get_next_token()
+        buffer.mark()
+        parser = Parser(buffer)
+        self.assertEqual(parser.parse_expression(), binop(num("1"), "*", num("2")))
+        self.assertEqual(parser.current.type, TokenType.R_PAREN)
+        buffer.release()
+        self.assertEqual(buffer.get_next_token().value, "y")
+
+    def test_silent_errors(self):
+        buffer = TokenBuffer(Lexer("1 +"))
+        buffer.mark()
+        with self.assertRaises(ParseError):
+            Parser(buffer).parse_expression()
+        buffer.rewind()
+        self.assertEqual(buffer.get_next_token().type, TokenType.NUMBER)
+
+    def test_lexer_errors(self):
+        # errors of the lexer are not parse errors, and are not silenced
+        buffer = TokenBuffer(Lexer("1 + 'abc\n"))
+        buffer.mark()
+        with self.assertRaises(ValueError) as context:
+            Parser(buffer).parse_expression()
+        self.assertNotIsInstance(context.exception, ParseError)
+
+
+def string(value: str) -> String:
+    return String(None, value)
+
+
+def call(function, *arguments) -> Call:
+    return Call(None, function, list(arguments))
+
+
+class TestChunkParser(unittest.TestCase):
+    def test_prefix_expressions(self):
+        parser = ChunkParser(Lexer("a.b[1]:c(2)'x'{} + 1"))
+        method = MethodCall(None, Index(None, var("a"), string("b")), "c", [num("1")])
+        method.arguments = [num("2")]
+        method.receiver = Index(None, Index(None, var("a"), string("b")), num("1"))
+        self.assertEqual(
+            parser.parse_expression(),
+            binop(call(call(method, string("x")), Table(None, [])), "+", num("1")),
+        )
+        parser = ChunkParser(Lexer("-(f)(...).x ^ 2"))
+        self.assertEqual(
+            parser.parse_expression(),
+            unop(
+                "-",
+                binop(
+                    Index(None, call(var("f"), Vararg(None)), string("x")),
+                    "^",
+                    num("2"),
+                ),
+            ),
+        )
+
+    def test_truncated(self):
+        parser = ChunkParser(Lexer("(f()), (a:b()), f()"))
+        expressions = parser.parse_expression_list()
+        self.assertTrue(expressions[0].truncated)
+        self.assertTrue(expressions[1].truncated)
+        self.assertFalse(expressions[2].truncated)
+
+    def test_tables(self):
+        parser = ChunkParser(Lexer("{1, a = 2; [b] = 3, c, d.e, f == 4,}"))
+        self.assertEqual(
+            parser.parse_expression(),
+            Table(
+                None,
+                [
+                    TableField(None, None, num("1")),
+                    TableField(None, string("a"), num("2")),
+                    TableField(None, var("b"), num("3")),
+                    TableField(None, None, var("c")),
+                    TableField(None, None, Index(None, var("d"), string("e"))),
+                    TableField(None, None, binop(var("f"), "==", num("4"))),
+                ],
+            ),
+        )
+
+    def test_statements(self):
+        chunk = parse_chunk(
+            "local a <const>, b = 1 a, b.c = b, a f() ; ::top:: goto top "
+            "do break end while a do end repeat local x until x "
+            "for i = 1, 2, 3 do end for k, v in pairs(a) do end "
+            "function a.b:c(d, ...) end local function e() end return 1;"
+        )
+        self.assertEqual(
+            [type(i).__name__ for i in chunk.statements],
+            [
+                "Local",
+                "Assign",
+                "Call",
+                "Label",
+                "Goto",
+                "Block",
+                "While",
+                "Repeat",
+                "NumericFor",
+                "GenericFor",
+                "FunctionDeclaration",
+                "LocalFunction",
+                "Return",
+            ],
+        )
+        local_function = chunk.statements[11]
+        self.assertEqual(local_function.name, "LocalFunction")
+        self.assertEqual(local_function.variable, var("e"))
+        local = chunk.statements[0]
+        self.assertEqual(local.attributes, ["const", None])
+        self.assertEqual(local.values, [num("1")])
+        declaration = chunk.statements[10]
+        self.assertEqual(declaration.target, Index(None, var("a"), string("b")))
+        self.assertEqual(declaration.method, "c")
+        self.assertEqual(declaration.function.parameters, [var("d")])
+        self.assertTrue(declaration.function.variadic)
+        self.assertIs(declaration.function.parent_class, declaration)
+
+    def test_if(self):
+        statement = parse_chunk(
+            "if a then x() elseif b then y() else z() end"
+        ).statements[0]
+        self.assertEqual(statement.test, var("a"))
+        self.assertEqual(statement.body, Block(None, [call(var("x"))]))
+        self.assertEqual(statement.orelse.test, var("b"))
+        self.assertIs(statement.orelse.parent_class, statement)
+        self.assertEqual(statement.orelse.orelse, Block(None, [call(var("z"))]))
+        chunk = parse_chunk("if a then " + "elseif a then " * 5000 + "end")
+        self.assertIsInstance(chunk.statements[0].orelse, If)
+
+    def test_errors(self):
+        for text in [
+            "a",
+            "a + 1",
+            "(f())",
+            "f() = 1",
+            "local function a.b() end",
+            "return 1 x = 1",
+            "if a then",
+            "function f() until x",
+            "for i = 1 do end",
+            "x = {a = }",
+            "f(a,)",
+        ]:
+            with self.assertRaises(ValueError, msg=text):
+                parse_chunk(text)
+
+    def test_lazy(self):
+        text = (
+            "local function f(a)\n  if a then return 'end' --[[ end ]] end\n"
+            "  local g = function() repeat until true end\n"
+            "  for i = 1, 2 do --[==[ do ]==] end\nend\nx = [[end]] y = 1"
+        )
+        chunk = parse_chunk(text, lazy=True)
+        function = chunk.statements[0].function
+        self.assertFalse(function.loaded)
+        self.assertEqual(len(chunk.statements), 3)
+        # the lexer continues behind the skipped body where it would have been
+        eager = parse_chunk(text)
+        for lazy_statement, eager_statement in zip(
+            chunk.statements[1:], eager.statements[1:]
+        ):
+            self.assertEqual(lazy_statement.token, eager_statement.token)
+            self.assertEqual(lazy_statement.token.line, eager_statement.token.line)
+            self.assertEqual(lazy_statement.token.column, eager_statement.token.column)
+        nested = function.body.statements[1].values[0]
+        self.assertFalse(nested.loaded)
+        self.assertEqual(
+            nested.body,
+            Block(None, [Repeat(None, Block(None, []), Boolean(None, True))]),
+        )
+        self.assertEqual(chunk, eager)
+
+    def test_lazy_errors(self):
+        # errors in skipped bodies are raised when they are loaded
+        chunk = parse_chunk("local function f() x = end", lazy=True)
+        with self.assertRaises(ValueError):
+            chunk.statements[0].function.body
+        for text in ["f = function() if x then end", "f = function() until x"]:
+            with self.assertRaises(ValueError, msg=text):
+                parse_chunk(text, lazy=True)
+
+    def test_interner(self):
+        text = "local f = function() return 'a', b.a end x = {a = 'a', 1.5, 1.5}"
+        interner = Interner()
+        chunk = parse_chunk(text, lazy=True, interner=interner)
+        self.assertEqual(chunk, parse_chunk(text))
+        table = chunk.statements[1].values[0]
+        self.assertIs(table.entries[0].key, table.entries[0].value)
+        self.assertIs(table.entries[1].value, table.entries[2].value)
+        self.assertIsNone(table.entries[1].value.token)
+        # function bodies are loaded with the same interner
+        values = chunk.statements[0].values[0].body.statements[0].values
+        self.assertIs(values[0], table.entries[0].key)
+        self.assertIs(values[1].key, table.entries[0].key)
+        self.assertEqual(len(interner), 2)
+
+    def test_lua_tests(self):
+        for file in Path("lua-tests").iterdir():
+            # main.lua starts with a "#" comment line that only lua files may have
+            if file.suffix != ".lua" or file.name == "main.lua":
+                continue
+            content = file.read_text(encoding="iso-8859-15")
+            eager = parse_chunk(content, TokenMode.NONE)
+            self.assertEqual(parse_chunk(content, lazy=True), eager, msg=file.name)
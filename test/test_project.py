@@ -0,0 +1,179 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tumfl.project import *
+
+
+class TestFindRequires(unittest.TestCase):
+    def test_find_requires(self):
+        self.assertEqual(
+            find_requires(
+                'require("a.b") local x = require "c" require(d) f("e") '
+                "require [[f]] x.require('g')"
+            ),
+            ["a.b", "c", "f", "g"],
+        )
+
+
+class TestProject(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name) / "mod"
+        self.output = Path(self.directory.name) / "out"
+        self.write("control.lua", 'require("scripts.util")\nlocal a = 1\n')
+        self.write("scripts/util.lua", 'require "helper"\nreturn 1 -- one\n')
+        self.write("scripts/helper.lua", "return 2\n")
+        self.write("data.lua", "data = {}\n")
+        self.write("info.json", '{"name": "mod"}')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, content: str):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        # make sure the modification time changes
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_full_build(self):
+        result = Project(self.root, self.output).build()
+        self.assertEqual(
+            result.built,
+            [
+                "control.lua",
+                "data.lua",
+                "info.json",
+                "scripts/helper.lua",
+                "scripts/util.lua",
+            ],
+        )
+        self.assertEqual(
+            (self.output / "scripts/util.lua").read_text(), 'require"helper"return 1'
+        )
+        self.assertEqual((self.output / "info.json").read_text(), '{"name": "mod"}')
+        self.assertTrue((self.output / MANIFEST_NAME).is_file())
+
+    def test_incremental(self):
+        Project(self.root, self.output).build()
+        result = Project(self.root, self.output).build()
+        self.assertEqual(result.built, [])
+        self.assertEqual(result.unchanged, 5)
+        self.write("scripts/helper.lua", "return 3\n")
+        result = Project(self.root, self.output).build()
+        self.assertEqual(result.built, ["scripts/helper.lua"])
+        self.assertEqual((self.output / "scripts/helper.lua").read_text(), "return 3")
+        # touching without changing the content doesn't rebuild
+        self.write("scripts/helper.lua", "return 3\n")
+        self.assertEqual(Project(self.root, self.output).build().built, [])
+
+    def test_cross_file(self):
+        Project(self.root, self.output, cross_file=True).build()
+        self.write("scripts/helper.lua", "return 3\n")
+        result = Project(self.root, self.output, cross_file=True).build()
+        self.assertEqual(
+            result.built, ["control.lua", "scripts/helper.lua", "scripts/util.lua"]
+        )
+
+    def test_deleted(self):
+        Project(self.root, self.output, cross_file=True).build()
+        (self.root / "scripts/helper.lua").unlink()
+        result = Project(self.root, self.output, cross_file=True).build()
+        self.assertEqual(result.removed, ["scripts/helper.lua"])
+        self.assertFalse((self.output / "scripts/helper.lua").exists())
+        self.assertEqual(result.built, ["control.lua", "scripts/util.lua"])
+
+    def test_missing_output_and_options(self):
+        Project(self.root, self.output).build()
+        (self.output / "data.lua").unlink()
+        self.assertEqual(Project(self.root, self.output).build().built, ["data.lua"])
+        result = Project(self.root, self.output, hoist_strings=True).build()
+        self.assertEqual(len(result.built), 5)
+
+    def test_invalidated_manifest(self):
+        Project(self.root, self.output).build()
+        (self.root / "scripts/helper.lua").unlink()
+        # the discarded manifest doesn't tell which outputs were deleted
+        result = Project(self.root, self.output, hoist_strings=True).build()
+        self.assertEqual(result.removed, ["scripts/helper.lua"])
+        self.assertFalse((self.output / "scripts/helper.lua").exists())
+        self.assertEqual(len(result.built), 4)
+        (self.output / MANIFEST_NAME).write_text("{")
+        self.write("data.lua", "data = {1}\n")
+        (self.root / "data.lua").rename(self.root / "data2.lua")
+        result = Project(self.root, self.output).build()
+        self.assertEqual(result.removed, ["data.lua"])
+        self.assertEqual(len(result.built), 4)
+
+    def test_lex_errors(self):
+        self.write("broken.lua", "x = 'abc\n")
+        project = Project(self.root, self.output)
+        result = project.build()
+        self.assertEqual(list(result.errors), ["broken.lua"])
+        self.assertEqual(len(result.built), 5)
+        self.assertFalse((self.output / "broken.lua").exists())
+        self.assertNotIn("broken.lua", project.manifest)
+        self.assertTrue((self.output / MANIFEST_NAME).is_file())
+        # failed files are tried again, and outputs of files that broke removed
+        self.write("broken.lua", "x = 'abc'\n")
+        self.write("data.lua", "data = 'x\n")
+        result = Project(self.root, self.output).build()
+        self.assertEqual(result.built, ["broken.lua"])
+        self.assertEqual(list(result.errors), ["data.lua"])
+        self.assertEqual(result.unchanged, 4)
+        self.assertFalse((self.output / "data.lua").exists())
+
+    def test_compression_aware(self):
+        Project(self.root, self.output).build()
+        result = Project(self.root, self.output, compression_aware=True).build()
+        self.assertEqual(len(result.built), 5)
+        self.assertEqual(
+            (self.output / "scripts/util.lua").read_text(), 'require"helper"return 1'
+        )
+
+    def test_report(self):
+        project = Project(self.root, self.output)
+        project.build()
+        report = project.report()
+        self.assertEqual(
+            [i.name for i in report],
+            ["control.lua", "data.lua", "scripts/helper.lua", "scripts/util.lua"],
+        )
+        self.assertEqual(report[3].raw, len('require "helper"\nreturn 1 -- one\n'))
+        self.assertEqual(report[3].minified_raw, len('require"helper"return 1'))
+
+    def test_read_once(self):
+        read = []
+        original = Path.read_bytes
+
+        def read_bytes(path):
+            read.append(path.relative_to(self.root).as_posix())
+            return original(path)
+
+        with mock.patch.object(Path, "read_bytes", read_bytes):
+            Project(self.root, self.output).build()
+        self.assertEqual(sorted(read), sorted(set(read)))
+        self.assertEqual(len(read), 5)
+
+    def test_decode_source(self):
+        self.assertEqual(decode_source(b"a\r\nb\rc\n"), "a\nb\nc\n")
+
+    def test_output_inside_root(self):
+        output = self.root / "build"
+        Project(self.root, output).build()
+        result = Project(self.root, output).build()
+        self.assertEqual(result.built, [])
+        self.assertFalse((output / "build").exists())
+
+    def test_resolve(self):
+        project = Project(self.root, self.output)
+        files = {"a/b.lua", "a/c/d.lua", "e.lua"}
+        self.assertEqual(project.resolve("a.b", "e.lua", files), "a/b.lua")
+        self.assertEqual(project.resolve("c.d", "a/b.lua", files), "a/c/d.lua")
+        self.assertEqual(project.resolve("__mod__/a/b", "e.lua", files), "a/b.lua")
+        self.assertEqual(project.resolve("e", "a/b.lua", files), "e.lua")
+        self.assertIsNone(project.resolve("util", "e.lua", files))
@@ -0,0 +1,40 @@
+import json
+import unittest
+from io import StringIO
+
+from tumfl.sourcemap import *
+
+
+class TestVLQ(unittest.TestCase):
+    def test_encode(self):
+        self.assertEqual(encode_vlq(0), "A")
+        self.assertEqual(encode_vlq(1), "C")
+        self.assertEqual(encode_vlq(-1), "D")
+        self.assertEqual(encode_vlq(15), "e")
+        self.assertEqual(encode_vlq(16), "gB")
+        self.assertEqual(encode_vlq(-1000), "x+B")
+
+    def test_round_trip(self):
+        values = [0, 1, -1, 31, -32, 1000, -123456, 2**31]
+        self.assertEqual(decode_vlq("".join(encode_vlq(i) for i in values)), values)
+
+
+class TestSourceMapWriter(unittest.TestCase):
+    def test_lines(self):
+        output = StringIO()
+        writer = SourceMapWriter(output, ["a.lua", "b.lua"])
+        writer.add(0, 0, 0, 0, 0)
+        writer.add(0, 5, 1, 2, 3, "x")
+        writer.add(2, 1, 1, 2, 4, "x")
+        writer.close()
+        result = json.loads(output.getvalue())
+        self.assertNotIn("file", result)
+        self.assertEqual(result["sources"], ["a.lua", "b.lua"])
+        self.assertEqual(result["names"], ["x"])
+        self.assertEqual(result["mappings"], "AAAA,KCEGA;;CAACA")
+
+    def test_order(self):
+        writer = SourceMapWriter(StringIO(), ["a.lua"])
+        writer.add(1, 0, 0, 0, 0)
+        with self.assertRaises(AssertionError):
+            writer.add(0, 0, 0, 0, 0)
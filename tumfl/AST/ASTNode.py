@@ -1,24 +1,89 @@
 from __future__ import annotations
 
-from abc import abstractmethod, ABC
-from typing import Optional, Any, Generator
+from abc import ABC
+from copy import copy
+from enum import Enum
+from inspect import signature
+from typing import (
+    Optional,
+    Any,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Tuple,
+    ClassVar,
+    TypeVar,
+)
 
+from tumfl.Source import Source, pack_span, unpack_span
 from tumfl.Token import Token
 from tumfl.utils import generic_str
 
+T = TypeVar("T", bound="ASTNode")
+
+
+class TokenMode(Enum):
+    """What a node created by from_token keeps of its token"""
+
+    # keep the whole token
+    TOKEN = "token"
+    # keep only the packed source range of the token
+    SPAN = "span"
+    # keep nothing
+    NONE = "none"
+
 
 class ASTNode(ABC):
-    def __init__(self, token: Token, name: str) -> None:
+    # constructor arguments that are stored as attributes, computed once per class
+    _fields: ClassVar[Optional[Tuple[str, ...]]] = None
+    # packed source range (see tumfl.Source), only set as attribute in TokenMode.SPAN
+    span: Optional[int] = None
+    # cached structural hash, see structural_hash
+    _hash: Optional[int] = None
+    # whether the node is used in many places at once, see tumfl.AST.Interner
+    _shared: bool = False
+
+    def __init__(self, token: Optional[Token], name: str) -> None:
         self.name: str = name
-        self.token: Token = token
+        self.token: Optional[Token] = token
         self.parent_class: Optional[ASTNode] = None
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, self.__class__):
             return False
-        return all(
-            self.__getattribute__(i) == other.__getattribute__(i) for i in self.__dir()
-        )
+        # iterative, to handle deep trees, failing fast on differing hashes
+        stack: List[Tuple[ASTNode, ASTNode]] = [(self, other)]
+        while stack:
+            first, second = stack.pop()
+            if first is second:
+                continue
+            if (
+                type(first) is not type(second)
+                or first.structural_hash() != second.structural_hash()
+            ):
+                return False
+            for i in first.__dir():
+                value: Any = first.__getattribute__(i)
+                other_value: Any = getattr(second, i, None)
+                if isinstance(value, ASTNode) and isinstance(other_value, ASTNode):
+                    stack.append((value, other_value))
+                elif isinstance(value, list) and isinstance(other_value, list):
+                    if len(value) != len(other_value):
+                        return False
+                    for j, k in zip(value, other_value):
+                        if isinstance(j, ASTNode) and isinstance(k, ASTNode):
+                            stack.append((j, k))
+                        elif j != k:
+                            return False
+                elif value != other_value:
+                    return False
+        return True
+
+    # nodes are mutable and compared by structure, so they can't be hashed. Use
+    # structural_hash (or find_duplicates) to group equal subtrees, and ids to
+    # keep track of nodes.
+    __hash__ = None  # type: ignore[assignment]
 
     def __repr__(self) -> str:
         return generic_str(self, ["replace", "parent", "parent_class"])
@@ -26,20 +91,180 @@ class ASTNode(ABC):
     def __dir(self) -> Generator[str, None, None]:
         return (
             i
-            for i in self.__dir__()
-            if not i.startswith("__")
+            for i in vars(self)
+            if not i.startswith("_")
             # ignore "token" for comparison (and parent check)
-            and i not in ["replace", "parent", "parent_class", "var", "token"]
+            and i not in ["replace", "parent", "parent_class", "var", "token", "span"]
         )
 
+    def _compute_hash(self) -> int:
+        """Hash of this node, expects all child hashes to be cached"""
+        parts: List[Any] = [type(self).__name__]
+        for i in self.__dir():
+            value: Any = self.__getattribute__(i)
+            if isinstance(value, ASTNode):
+                assert value._hash is not None
+                parts.append(value._hash)
+            elif isinstance(value, list):
+                parts.append(
+                    tuple(j._hash if isinstance(j, ASTNode) else j for j in value)
+                )
+            else:
+                parts.append(value)
+        return hash(tuple(parts))
+
+    def structural_hash(self) -> int:
+        """
+        Merkle style hash of the subtree, ignoring tokens and parents like __eq__.
+        It is computed bottom up once and cached in every node of the subtree.
+        """
+        if self._hash is not None:
+            return self._hash
+        # post-order: nodes are hashed on their second visit
+        stack: List[Tuple[ASTNode, bool]] = [(self, False)]
+        while stack:
+            node, ready = stack.pop()
+            if ready:
+                node._hash = node._compute_hash()
+                continue
+            if node._hash is not None:
+                continue
+            stack.append((node, True))
+            stack.extend((i, False) for i in node.children() if i._hash is None)
+        assert self._hash is not None
+        return self._hash
+
+    def invalidate_hash(self) -> None:
+        """
+        Drop the cached hash of this node and its parents. Has to be called after
+        changing a field directly, replace and NodeTransformer do it themselves.
+        """
+        node: Optional[ASTNode] = self
+        # hashes of parents can only be cached if the hash of the child is
+        while node is not None and node._hash is not None:
+            node._hash = None
+            node = node.parent_class
+
+    def _with_mode(self: T, token: Token, mode: TokenMode) -> T:
+        """Drop the token as requested by the mode"""
+        if mode != TokenMode.TOKEN:
+            self.token = None
+            if mode == TokenMode.SPAN and token.start >= 0:
+                self.span = pack_span(token.start, token.end)
+        return self
+
+    def position(self, source: Optional[Source] = None) -> Optional[Tuple[int, int]]:
+        """
+        Returns (line, column) of the node, either from its token or by resolving
+        its span in the source. Returns None if neither is available.
+        """
+        if self.token is not None:
+            return self.token.line, self.token.column
+        if self.span is not None and source is not None:
+            return source.position(unpack_span(self.span)[0])
+        return None
+
+    @classmethod
+    def fields(cls) -> Tuple[str, ...]:
+        """Names of all constructor arguments (besides the token), in order"""
+        fields: Optional[Tuple[str, ...]] = cls.__dict__.get("_fields")
+        if fields is None:
+            fields = tuple(
+                i
+                for i in signature(cls.__init__).parameters
+                if i not in ["self", "token"]
+            )
+            cls._fields = fields
+        return fields
+
+    def children(self) -> Iterator[ASTNode]:
+        """Iterate over all direct child nodes, in field order"""
+        for i in self.fields():
+            value: Any = self.__getattribute__(i)
+            if isinstance(value, ASTNode):
+                yield value
+            elif isinstance(value, list):
+                yield from (j for j in value if isinstance(j, ASTNode))
+
+    def unshared(self: T) -> T:
+        """
+        The node itself, or a copy that may be changed if it is shared by an
+        Interner. The copy is not attached to any tree.
+        """
+        if not self._shared:
+            return self
+        node: T = copy(self)
+        node._shared = False
+        node._hash = None
+        return node
+
+    def replace(self, old: ASTNode, new: Optional[ASTNode]) -> None:
+        """
+        Replace a direct child, or remove it from a list field if new is None.
+        The parents of shared nodes are left alone.
+        """
+        for i in self.fields():
+            value: Any = self.__getattribute__(i)
+            if value is old:
+                self.__setattr__(i, new)
+                break
+            if isinstance(value, list):
+                index: int = next((j for j, k in enumerate(value) if k is old), -1)
+                if index < 0:
+                    continue
+                if new is None:
+                    del value[index]
+                else:
+                    value[index] = new
+                break
+        else:
+            raise ValueError(f"{old.name} is not a child of {self.name}")
+        if not old._shared:
+            old.parent_class = None
+        if new is not None and not new._shared:
+            new.parent_class = self
+        self.invalidate_hash()
+
     def parent(self, parent: ASTNode) -> None:
+        """Set the parent of this node, and the parents of all nodes below it"""
         self.parent_class = parent
-        for i in self.__dir():
-            node: Any = self.__getattribute__(i)
-            if isinstance(node, ASTNode):
-                node.parent(self)
+        stack: List[ASTNode] = [self]
+        while stack:
+            node: ASTNode = stack.pop()
+            for child in node.children():
+                child.parent_class = node
+                stack.append(child)
 
     @staticmethod
-    @abstractmethod
-    def from_token(token: Token) -> ASTNode:
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> ASTNode:
+        """
+        Create a leaf node from its token. Nodes made of several tokens are only
+        created by the parser, and don't override this.
+        """
         raise NotImplementedError()
+
+
+def find_duplicates(root: ASTNode) -> List[List[ASTNode]]:
+    """
+    Groups of structurally equal subtrees, in order of their first occurrence.
+    Nodes that occur more than once in the tree (like shared literals) are
+    reported for every occurrence.
+    """
+    root.structural_hash()
+    # every hash maps to groups of equal subtrees, to handle collisions
+    groups: Dict[int, List[List[ASTNode]]] = {}
+    order: List[List[ASTNode]] = []
+    stack: List[ASTNode] = [root]
+    while stack:
+        node: ASTNode = stack.pop()
+        stack.extend(reversed(list(node.children())))
+        assert node._hash is not None
+        candidates: List[List[ASTNode]] = groups.setdefault(node._hash, [])
+        for group in candidates:
+            if group[0] == node:
+                group.append(node)
+                break
+        else:
+            candidates.append([node])
+            order.append(candidates[-1])
+    return [i for i in order if len(i) > 1]
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from .ASTNode import ASTNode
+
+# index used for missing parents, children and siblings
+NO_NODE: int = -1
+
+
+class _Slot:
+    """Placeholder for child nodes inside of a stored value tuple"""
+
+    __slots__ = ("count",)
+
+    def __init__(self, count: int) -> None:
+        # -1 for a single child node, otherwise the length of a list of child nodes
+        self.count: int = count
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _Slot) and self.count == other.count
+
+    def __hash__(self) -> int:
+        return hash(("_Slot", self.count))
+
+    def __repr__(self) -> str:
+        return f"_Slot({self.count!r})"
+
+
+_SINGLE: _Slot = _Slot(-1)
+
+
+class _Values(tuple):
+    """A list of values that aren't nodes, stored as a (hashable) tuple"""
+
+
+def _types(values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Types of stored values, including the items of value lists"""
+    return tuple(
+        (_Values, _types(i)) if isinstance(i, _Values) else type(i) for i in values
+    )
+
+
+class NodeView:
+    """
+    A light accessor for a single node of an arena. Fields are read from the
+    arrays when accessed, child nodes are returned as views as well.
+    """
+
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena: Arena, index: int) -> None:
+        self.arena: Arena = arena
+        self.index: int = index
+
+    @property
+    def kind(self) -> Type[ASTNode]:
+        return self.arena.kind(self.index)
+
+    @property
+    def parent(self) -> Optional[NodeView]:
+        parent: int = self.arena.parents[self.index]
+        return None if parent == NO_NODE else NodeView(self.arena, parent)
+
+    def children(self) -> Iterator[NodeView]:
+        for i in self.arena.children(self.index):
+            yield NodeView(self.arena, i)
+
+    def __getattr__(self, name: str) -> Any:
+        fields: Tuple[str, ...] = self.kind.fields()
+        if name not in fields:
+            raise AttributeError(f"{self.kind.__name__} has no field {name}")
+        values: Tuple[Any, ...] = self.arena.value(self.index)
+        position: int = fields.index(name)
+        value: Any = values[position]
+        if isinstance(value, _Values):
+            return list(value)
+        if not isinstance(value, _Slot):
+            return value
+        # skip the children of the fields in front
+        offset: int = sum(
+            1 if i.count == -1 else i.count
+            for i in values[:position]
+            if isinstance(i, _Slot)
+        )
+        children: Iterator[NodeView] = self.children()
+        for _ in range(offset):
+            next(children)
+        if value.count == -1:
+            return next(children)
+        return [next(children) for _ in range(value.count)]
+
+    def to_tree(self) -> ASTNode:
+        """Create the node object and its subtree"""
+        return self.arena.to_tree(self.index)
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, NodeView)
+            and self.arena is other.arena
+            and self.index == other.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.arena), self.index))
+
+    def __repr__(self) -> str:
+        return f"NodeView({self.kind.__name__}, {self.index!r})"
+
+
+class Arena:
+    """
+    A struct-of-arrays representation of an AST.
+
+    Every node is an index into a set of parallel typed arrays (kind, parent,
+    first child, next sibling and value). Non-node fields are stored as
+    deduplicated tuples in `values`, so identical literals share one entry.
+    `node` gives a light view of a single node, node objects are only created
+    on demand through `to_tree`.
+    """
+
+    def __init__(self) -> None:
+        self.kinds: array[int] = array("H")
+        self.parents: array[int] = array("i")
+        self.first_children: array[int] = array("i")
+        self.next_siblings: array[int] = array("i")
+        self.value_indices: array[int] = array("i")
+        self.kind_classes: List[Type[ASTNode]] = []
+        self.values: List[Tuple[Any, ...]] = []
+        self.roots: List[int] = []
+        # last child of each node, to append children in constant time
+        self._last_children: array[int] = array("i")
+        self._kind_lookup: Dict[Type[ASTNode], int] = {}
+        self._value_lookup: Dict[Tuple[int, Tuple[Any, ...], Tuple[Any, ...]], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _kind_index(self, kind: Type[ASTNode]) -> int:
+        index: Optional[int] = self._kind_lookup.get(kind)
+        if index is None:
+            index = len(self.kind_classes)
+            self.kind_classes.append(kind)
+            self._kind_lookup[kind] = index
+        return index
+
+    def _value_index(self, kind: int, values: Tuple[Any, ...]) -> int:
+        # include the types, as True == 1 and 1 == 1.0
+        key = (kind, values, _types(values))
+        index: Optional[int] = self._value_lookup.get(key)
+        if index is None:
+            index = len(self.values)
+            self.values.append(values)
+            self._value_lookup[key] = index
+        return index
+
+    def add(
+        self, kind: Type[ASTNode], values: Tuple[Any, ...], parent: int = NO_NODE
+    ) -> int:
+        """
+        Append a node and return its index.
+        Child nodes have to be added after their parent, in field order.
+        """
+        kind_index: int = self._kind_index(kind)
+        index: int = len(self.kinds)
+        self.kinds.append(kind_index)
+        self.parents.append(parent)
+        self.first_children.append(NO_NODE)
+        self.next_siblings.append(NO_NODE)
+        self._last_children.append(NO_NODE)
+        self.value_indices.append(self._value_index(kind_index, values))
+        if parent == NO_NODE:
+            self.roots.append(index)
+        elif (last := self._last_children[parent]) == NO_NODE:
+            self.first_children[parent] = index
+            self._last_children[parent] = index
+        else:
+            self.next_siblings[last] = index
+            self._last_children[parent] = index
+        return index
+
+    def kind(self, index: int) -> Type[ASTNode]:
+        return self.kind_classes[self.kinds[index]]
+
+    def value(self, index: int) -> Tuple[Any, ...]:
+        """The stored fields of a node, with child nodes replaced by placeholders"""
+        return self.values[self.value_indices[index]]
+
+    def children(self, index: int) -> Iterator[int]:
+        child: int = self.first_children[index]
+        while child != NO_NODE:
+            yield child
+            child = self.next_siblings[child]
+
+    def walk(self, index: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over a subtree in pre-order, without building any objects.
+        Iterates over all trees in the arena if no index is given.
+        """
+        if index is None:
+            for root in self.roots:
+                yield from self.walk(root)
+            return
+        first_children = self.first_children
+        next_siblings = self.next_siblings
+        parents = self.parents
+        current: int = index
+        while True:
+            yield current
+            if (child := first_children[current]) != NO_NODE:
+                current = child
+                continue
+            # go up until there is a sibling, but don't leave the subtree
+            while current != index and next_siblings[current] == NO_NODE:
+                current = parents[current]
+            if current == index:
+                return
+            current = next_siblings[current]
+
+    def find(self, kind: Type[ASTNode]) -> Iterator[int]:
+        """Iterate over the indices of all nodes of exactly this kind"""
+        kind_index: Optional[int] = self._kind_lookup.get(kind)
+        if kind_index is None:
+            return
+        for index, current in enumerate(self.kinds):
+            if current == kind_index:
+                yield index
+
+    def node(self, index: int) -> NodeView:
+        """A view of a single node, without creating any node objects"""
+        return NodeView(self, index)
+
+    def add_tree(self, root: ASTNode, parent: int = NO_NODE) -> int:
+        """Add a node and its whole subtree, returning the index of the root"""
+        root_index: int = NO_NODE
+        stack: List[Tuple[ASTNode, int]] = [(root, parent)]
+        while stack:
+            node, parent_index = stack.pop()
+            values: List[Any] = []
+            for field in node.fields():
+                value: Any = node.__getattribute__(field)
+                if isinstance(value, ASTNode):
+                    values.append(_SINGLE)
+                elif isinstance(value, list):
+                    if all(isinstance(i, ASTNode) for i in value):
+                        values.append(_Slot(len(value)))
+                    else:
+                        # like the attributes of local declarations
+                        values.append(_Values(value))
+                else:
+                    values.append(value)
+            index: int = self.add(type(node), tuple(values), parent_index)
+            if root_index == NO_NODE:
+                root_index = index
+            stack.extend((i, index) for i in reversed(list(node.children())))
+        return root_index
+
+    @staticmethod
+    def from_tree(root: ASTNode) -> Arena:
+        arena: Arena = Arena()
+        arena.add_tree(root)
+        return arena
+
+    def to_tree(self, index: Optional[int] = None) -> ASTNode:
+        """Build the object tree for a subtree (the first root if no index is given)"""
+        if index is None:
+            index = self.roots[0]
+        order: List[int] = list(self.walk(index))
+        built: Dict[int, ASTNode] = {}
+        # build children before their parents
+        for current in reversed(order):
+            children: Iterator[ASTNode] = (built.pop(i) for i in self.children(current))
+            arguments: List[Any] = []
+            for value in self.value(current):
+                if isinstance(value, _Slot):
+                    if value.count == -1:
+                        arguments.append(next(children))
+                    else:
+                        arguments.append([next(children) for _ in range(value.count)])
+                elif isinstance(value, _Values):
+                    arguments.append(list(value))
+                else:
+                    arguments.append(value)
+            kind: Type[ASTNode] = self.kind(current)
+            node: ASTNode = kind(None, *arguments)
+            for child in node.children():
+                child.parent_class = node
+            built[current] = node
+        return built[index]
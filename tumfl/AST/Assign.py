@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class Assign(ASTNode):
+    def __init__(
+        self,
+        token: Optional[Token],
+        targets: List[Expression],
+        values: List[Expression],
+    ) -> None:
+        super().__init__(token, "Assign")
+        self.targets: List[Expression] = targets
+        self.values: List[Expression] = values
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class BinaryOperator(Enum):
+    OR = "or"
+    AND = "and"
+    LESS_THAN = "<"
+    GREATER_THAN = ">"
+    LESS_EQUALS = "<="
+    GREATER_EQUALS = ">="
+    NOT_EQUALS = "~="
+    EQUALS = "=="
+    BIT_OR = "|"
+    BIT_XOR = "~"
+    BIT_AND = "&"
+    BIT_SHIFT_LEFT = "<<"
+    BIT_SHIFT_RIGHT = ">>"
+    CONCAT = ".."
+    ADD = "+"
+    SUBTRACT = "-"
+    MULT = "*"
+    DIVIDE = "/"
+    INTEGER_DIVISION = "//"
+    MODULO = "%"
+    EXPONENT = "^"
+
+
+class BinOp(ASTNode):
+    def __init__(
+        self,
+        token: Optional[Token],
+        left: Expression,
+        op: BinaryOperator,
+        right: Expression,
+    ) -> None:
+        super().__init__(token, "BinOp")
+        self.left: Expression = left
+        self.op: BinaryOperator = op
+        self.right: Expression = right
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Statement
+
+
+class Block(ASTNode):
+    """A list of statements: a chunk, the body of a function or loop, or do ... end"""
+
+    def __init__(self, token: Optional[Token], statements: List[Statement]) -> None:
+        super().__init__(token, "Block")
+        self.statements: List[Statement] = statements
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from .ASTNode import ASTNode
+from typing import Optional
+
+from .ASTNode import ASTNode, TokenMode
 
 from tumfl.Token import TokenType, Token
 
 
 class Boolean(ASTNode):
-    def __init__(self, token: Token, value: bool) -> None:
+    def __init__(self, token: Optional[Token], value: bool) -> None:
         super().__init__(token, "Boolean")
         self.value: bool = value
 
     @staticmethod
-    def from_token(token: Token) -> Boolean:
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> Boolean:
         assert token.type in [TokenType.TRUE, TokenType.FALSE]
-        return Boolean(token, token.type == TokenType.TRUE)
+        return Boolean(token, token.type == TokenType.TRUE)._with_mode(token, mode)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .ASTNode import ASTNode, TokenMode
+from tumfl.Token import Token, TokenType
+
+
+class Break(ASTNode):
+    def __init__(self, token: Optional[Token]) -> None:
+        super().__init__(token, "Break")
+
+    @staticmethod
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> Break:
+        assert token.type == TokenType.BREAK
+        return Break(token)._with_mode(token, mode)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class Call(ASTNode):
+    def __init__(
+        self,
+        token: Optional[Token],
+        function: Expression,
+        arguments: List[Expression],
+        truncated: bool = False,
+    ) -> None:
+        super().__init__(token, "Call")
+        self.function: Expression = function
+        self.arguments: List[Expression] = arguments
+        # in parentheses, "(f())" only yields the first value
+        self.truncated: bool = truncated
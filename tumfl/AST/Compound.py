@@ -3,11 +3,64 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Union
 
 if TYPE_CHECKING:
+    from .Assign import Assign
+    from .BinOp import BinOp
+    from .Block import Block
     from .Boolean import Boolean
+    from .Break import Break
+    from .Call import Call
+    from .Function import Function
+    from .FunctionDeclaration import FunctionDeclaration
+    from .GenericFor import GenericFor
+    from .Goto import Goto
+    from .If import If
+    from .Index import Index
+    from .Label import Label
+    from .Local import Local
+    from .LocalFunction import LocalFunction
+    from .MethodCall import MethodCall
+    from .Nil import Nil
     from .Number import Number
+    from .NumericFor import NumericFor
+    from .Repeat import Repeat
+    from .Return import Return
     from .String import String
+    from .Table import Table
+    from .UnOp import UnOp
+    from .Vararg import Vararg
     from .Variable import Variable
+    from .While import While
 
-PrefixExpression = Union[Variable]
+PrefixExpression = Union[Variable, Index, Call, MethodCall]
 
-Expression = Union[Boolean, Number, String, PrefixExpression]
+Expression = Union[
+    BinOp,
+    Boolean,
+    Function,
+    Nil,
+    Number,
+    String,
+    Table,
+    UnOp,
+    Vararg,
+    PrefixExpression,
+]
+
+Statement = Union[
+    Assign,
+    Block,
+    Break,
+    Call,
+    FunctionDeclaration,
+    GenericFor,
+    Goto,
+    If,
+    Label,
+    Local,
+    LocalFunction,
+    MethodCall,
+    NumericFor,
+    Repeat,
+    Return,
+    While,
+]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Callable, List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Variable import Variable
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Block import Block
+
+
+class Function(ASTNode):
+    """
+    A function body with its parameters, as in function (a, ...) ... end.
+
+    The body of a deferred function is parsed by its loader on first access,
+    see `deferred`. Anything that looks at all children (like comparisons,
+    hashing and visitors that don't skip functions) loads it.
+    """
+
+    # parses the body of a deferred function that was not accessed yet
+    _load: Optional[Callable[[], Block]] = None
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        parameters: List[Variable],
+        variadic: bool,
+        body: Block,
+    ) -> None:
+        super().__init__(token, "Function")
+        self.parameters: List[Variable] = parameters
+        self.variadic: bool = variadic
+        # set last, like deferred functions set it when the body is loaded
+        self.body = body
+
+    @staticmethod
+    def deferred(
+        token: Optional[Token],
+        parameters: List[Variable],
+        variadic: bool,
+        load: Callable[[], Block],
+    ) -> Function:
+        """A function whose body is only created by `load` once it is accessed"""
+        function: Function = Function.__new__(Function)
+        ASTNode.__init__(function, token, "Function")
+        function.parameters = parameters
+        function.variadic = variadic
+        function._load = load
+        return function
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the body exists, which is always the case if not deferred"""
+        return "body" in vars(self)
+
+    # the body is kept in the instance dictionary, so that it is compared and
+    # hashed like any other field once it exists
+    @property
+    def body(self) -> Block:
+        body: Optional[Block] = vars(self).get("body")
+        if body is None:
+            assert self._load is not None
+            body = self._load()
+            body.parent_class = self
+            self.body = body
+        return body
+
+    @body.setter
+    def body(self, body: Block) -> None:
+        vars(self)["body"] = body
+        self._load = None
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Function import Function
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class FunctionDeclaration(ASTNode):
+    """
+    function a.b.c:m() ... end, with a Variable or Index as target and the name
+    of the method (which gets an implicit self parameter) if there is one.
+    """
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        target: Expression,
+        method: Optional[str],
+        function: Function,
+    ) -> None:
+        super().__init__(token, "FunctionDeclaration")
+        self.target: Expression = target
+        self.method: Optional[str] = method
+        self.function: Function = function
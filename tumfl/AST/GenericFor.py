@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Block import Block
+from .Variable import Variable
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class GenericFor(ASTNode):
+    """for names in iterators do ... end"""
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        names: List[Variable],
+        iterators: List[Expression],
+        body: Block,
+    ) -> None:
+        super().__init__(token, "GenericFor")
+        self.names: List[Variable] = names
+        self.iterators: List[Expression] = iterators
+        self.body: Block = body
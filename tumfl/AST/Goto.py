@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+
+class Goto(ASTNode):
+    def __init__(self, token: Optional[Token], label: str) -> None:
+        super().__init__(token, "Goto")
+        self.label: str = label
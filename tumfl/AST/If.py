@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Optional, Union, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Block import Block
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class If(ASTNode):
+    """An if statement, elseif branches are nested If nodes in orelse"""
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        test: Expression,
+        body: Block,
+        orelse: Optional[Union[If, Block]],
+    ) -> None:
+        super().__init__(token, "If")
+        self.test: Expression = test
+        self.body: Block = body
+        self.orelse: Optional[Union[If, Block]] = orelse
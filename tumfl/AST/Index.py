@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class Index(ASTNode):
+    """Indexing as in table[key], the key of table.name is the String of the name"""
+
+    def __init__(
+        self, token: Optional[Token], table: Expression, key: Expression
+    ) -> None:
+        super().__init__(token, "Index")
+        self.table: Expression = table
+        self.key: Expression = key
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+from .ASTNode import ASTNode, TokenMode
+from .Boolean import Boolean
+from .Number import Number
+from .String import String
+from tumfl.Token import Token, TokenType
+
+T = TypeVar("T", bound=ASTNode)
+
+LITERALS: Dict[TokenType, Type[ASTNode]] = {
+    TokenType.TRUE: Boolean,
+    TokenType.FALSE: Boolean,
+    TokenType.NUMBER: Number,
+    TokenType.STRING: String,
+}
+
+
+class Interner:
+    """
+    Hash-consing of literal nodes (String, Number and Boolean).
+
+    All equal literals created through one Interner are the same instance, which
+    keeps no token. Shared nodes have to be treated as immutable (see
+    ASTNode.unshared), and their parent_class is meaningless, as they may be used
+    in many places at once. An Interner can be shared between files to
+    deduplicate across a whole run, and parsers use one if given.
+    """
+
+    def __init__(self) -> None:
+        # keyed by the class followed by all fields
+        self._nodes: Dict[Tuple[Any, ...], ASTNode] = {}
+        self.hits: int = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def from_token(self, token: Token) -> ASTNode:
+        """Returns the shared node for a literal token"""
+        kind: Type[ASTNode] = LITERALS[token.type]
+        key: Tuple[Any, ...]
+        if kind is Boolean:
+            key = (Boolean, token.type == TokenType.TRUE)
+        elif kind is Number:
+            assert isinstance(token.value, tuple)
+            key = (Number, *token.value)
+        else:
+            key = (String, token.value)
+        node: Optional[ASTNode] = self._nodes.get(key)
+        if node is None:
+            node = kind.from_token(token, TokenMode.NONE)
+            node._shared = True
+            self._nodes[key] = node
+        else:
+            self.hits += 1
+        return node
+
+    def intern(self, node: T) -> T:
+        """Returns the shared instance for an existing literal node"""
+        assert isinstance(node, (String, Number, Boolean))
+        key: Tuple[Any, ...] = (
+            type(node),
+            *(node.__getattribute__(i) for i in node.fields()),
+        )
+        shared: Optional[ASTNode] = self._nodes.get(key)
+        if shared is None:
+            node.token = None
+            # back to the class default, like in TokenMode.NONE
+            vars(node).pop("span", None)
+            node.parent_class = None
+            node._shared = True
+            self._nodes[key] = node
+            return node
+        self.hits += 1
+        assert isinstance(shared, type(node))
+        return shared
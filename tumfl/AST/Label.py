@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+
+class Label(ASTNode):
+    """A label as in ::name::"""
+
+    def __init__(self, token: Optional[Token], label: str) -> None:
+        super().__init__(token, "Label")
+        self.label: str = label
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Variable import Variable
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class Local(ASTNode):
+    """Declaration of local variables, attributes are "const", "close" or None"""
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        names: List[Variable],
+        attributes: List[Optional[str]],
+        values: List[Expression],
+    ) -> None:
+        super().__init__(token, "Local")
+        self.names: List[Variable] = names
+        self.attributes: List[Optional[str]] = attributes
+        self.values: List[Expression] = values
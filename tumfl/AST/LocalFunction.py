@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .ASTNode import ASTNode
+from .Function import Function
+from .Variable import Variable
+from tumfl.Token import Token
+
+
+class LocalFunction(ASTNode):
+    def __init__(
+        self, token: Optional[Token], variable: Variable, function: Function
+    ) -> None:
+        super().__init__(token, "LocalFunction")
+        # not "name", which is the kind of every node
+        self.variable: Variable = variable
+        self.function: Function = function
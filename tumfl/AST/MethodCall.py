@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class MethodCall(ASTNode):
+    """A call as in receiver:method(arguments)"""
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        receiver: Expression,
+        method: str,
+        arguments: List[Expression],
+        truncated: bool = False,
+    ) -> None:
+        super().__init__(token, "MethodCall")
+        self.receiver: Expression = receiver
+        self.method: str = method
+        self.arguments: List[Expression] = arguments
+        # in parentheses, "(a:f())" only yields the first value
+        self.truncated: bool = truncated
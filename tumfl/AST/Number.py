@@ -1,15 +1,51 @@
 from __future__ import annotations
 
-from typing import Optional, Any
+from typing import Optional, Any, List, Tuple, Union
 
-from .ASTNode import ASTNode
+from .ASTNode import ASTNode, TokenMode
 from tumfl.Token import Token, TokenType
 
+# lua integers are 64 bit and wrap around
+INTEGER_BITS: int = 64
+MAX_INTEGER: int = 2 ** (INTEGER_BITS - 1) - 1
+MIN_INTEGER: int = -(2 ** (INTEGER_BITS - 1))
+
+
+def wrap_integer(value: int) -> int:
+    """Wrap an integer around to the range of lua integers"""
+    return (value - MIN_INTEGER) % 2**INTEGER_BITS + MIN_INTEGER
+
+
+def _float_candidates(value: float) -> List[Tuple[Optional[str], ...]]:
+    """(integer, fractional, exponent) parts of short spellings of a float"""
+    mantissa, _, exponent_text = repr(value).partition("e")
+    integer, _, fraction = mantissa.partition(".")
+    digits: str = (integer + fraction).lstrip("0")
+    exponent: int = int(exponent_text or "0") - len(fraction)
+    stripped: str = digits.rstrip("0")
+    exponent += len(digits) - len(stripped)
+    digits = stripped or "0"
+    candidates: List[Tuple[Optional[str], ...]] = []
+    # plain, like 100. or 1.5 or .05
+    if exponent >= 0:
+        candidates.append((digits + "0" * exponent, "", None))
+    elif len(digits) + exponent > 0:
+        point: int = len(digits) + exponent
+        candidates.append((digits[:point], digits[point:], None))
+    else:
+        candidates.append((None, "0" * -(len(digits) + exponent) + digits, None))
+    # exponent with an integral mantissa, like 15e15
+    candidates.append((digits, None, str(exponent)))
+    # scientific, like 1.5e16
+    if len(digits) > 1:
+        candidates.append((digits[0], digits[1:], str(exponent + len(digits) - 1)))
+    return candidates
+
 
 class Number(ASTNode):
     def __init__(
         self,
-        token: Token,
+        token: Optional[Token],
         is_hex: bool = False,
         integer_part: Optional[str] = None,
         fractional_part: Optional[str] = None,
@@ -24,7 +60,7 @@ class Number(ASTNode):
         self.float_offset: Optional[str] = float_offset
 
     @staticmethod
-    def from_token(token: Token) -> Number:
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> Number:
         assert token.type == TokenType.NUMBER
         value = token.value
         assert isinstance(value, tuple)
@@ -35,8 +71,55 @@ class Number(ASTNode):
             fractional_part=value[2],
             exponent=value[3],
             float_offset=value[4],
+        )._with_mode(token, mode)
+
+    def spelling(self) -> str:
+        """The lua source of the number"""
+        return "".join(
+            (
+                "0x" if self.is_hex else "",
+                self.integer_part or "",
+                "" if self.fractional_part is None else "." + self.fractional_part,
+                "" if self.exponent is None else "e" + self.exponent,
+                "" if self.float_offset is None else "p" + self.float_offset,
+            )
+        )
+
+    def to_value(self) -> Union[int, float]:
+        """The value as lua reads it: integers without fraction or exponent"""
+        if self.is_hex:
+            if self.fractional_part is None and self.float_offset is None:
+                # hexadecimal integers wrap around
+                return wrap_integer(int(self.integer_part or "0", 16))
+            return float.fromhex(
+                f"0x{self.integer_part or 0}.{self.fractional_part or ''}"
+                f"p{self.float_offset or 0}"
+            )
+        if self.fractional_part is None and self.exponent is None:
+            value: int = int(self.integer_part or "0")
+            # decimal integers that don't fit are read as floats
+            return value if value <= MAX_INTEGER else float(value)
+        return float(
+            f"{self.integer_part or 0}.{self.fractional_part or ''}"
+            f"e{self.exponent or 0}"
         )
 
+    @staticmethod
+    def from_value(value: Union[int, float]) -> Number:
+        """The shortest number literal for a non-negative integer or finite float"""
+        assert type(value) in (int, float) and value >= 0
+        if type(value) is int:
+            assert value <= MAX_INTEGER
+            decimal: Number = Number(None, False, str(value))
+            hexadecimal: Number = Number(None, True, format(value, "x"))
+            if len(hexadecimal.spelling()) < len(decimal.spelling()):
+                return hexadecimal
+            return decimal
+        candidates: List[Number] = [
+            Number(None, False, *i) for i in _float_candidates(float(value))
+        ]
+        return min(candidates, key=lambda i: len(i.spelling()))
+
     def __repr__(self) -> str:
         return (
             f"Number("
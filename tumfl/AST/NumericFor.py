@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Block import Block
+from .Variable import Variable
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class NumericFor(ASTNode):
+    """for variable = start, stop, step do ... end, the step is optional"""
+
+    def __init__(
+        self,
+        token: Optional[Token],
+        variable: Variable,
+        start: Expression,
+        stop: Expression,
+        step: Optional[Expression],
+        body: Block,
+    ) -> None:
+        super().__init__(token, "NumericFor")
+        self.variable: Variable = variable
+        self.start: Expression = start
+        self.stop: Expression = stop
+        self.step: Optional[Expression] = step
+        self.body: Block = body
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from .Block import Block
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class Repeat(ASTNode):
+    def __init__(self, token: Optional[Token], body: Block, test: Expression) -> None:
+        super().__init__(token, "Repeat")
+        self.body: Block = body
+        self.test: Expression = test
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import List, Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class Return(ASTNode):
+    def __init__(self, token: Optional[Token], values: List[Expression]) -> None:
+        super().__init__(token, "Return")
+        self.values: List[Expression] = values
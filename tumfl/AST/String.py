@@ -1,17 +1,56 @@
 from __future__ import annotations
 
-from .ASTNode import ASTNode
+from typing import Dict, List, Optional
+
+from .ASTNode import ASTNode, TokenMode
 from tumfl.Token import Token, TokenType
 
+SHORT_ESCAPES: Dict[str, str] = {
+    "\a": "\\a",
+    "\b": "\\b",
+    "\f": "\\f",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+    "\v": "\\v",
+    "\\": "\\\\",
+}
+
 
 class String(ASTNode):
-    def __init__(self, token: Token, value: str) -> None:
+    def __init__(self, token: Optional[Token], value: str) -> None:
         super().__init__(token, "String")
         self.value: str = value
 
     @staticmethod
-    def from_token(token: Token) -> String:
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> String:
         assert token.type == TokenType.STRING
         value = token.value
         assert isinstance(value, str)
-        return String(token, value)
+        return String(token, value)._with_mode(token, mode)
+
+    def spelling(self, quote: Optional[str] = None) -> str:
+        """
+        A short quoted lua literal for the value. Without a given quote, the
+        one that needs fewer escapes is used, preferring double quotes.
+        """
+        value: str = self.value
+        if quote is None:
+            quote = "'" if value.count('"') > value.count("'") else '"'
+        parts: List[str] = [quote]
+        for index, char in enumerate(value):
+            if char == quote:
+                parts.append("\\" + char)
+            elif char in SHORT_ESCAPES:
+                parts.append(SHORT_ESCAPES[char])
+            elif char < " " or char == "\x7f":
+                # decimal escapes take up to three digits
+                following: str = value[index + 1 : index + 2]
+                if following.isascii() and following.isdigit():
+                    parts.append(f"\\{ord(char):03d}")
+                else:
+                    parts.append(f"\\{ord(char)}")
+            else:
+                parts.append(char)
+        parts.append(quote)
+        return "".join(parts)
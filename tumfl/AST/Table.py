@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from .ASTNode import ASTNode
+from .TableField import TableField
+from tumfl.Token import Token
+
+
+class Table(ASTNode):
+    def __init__(self, token: Optional[Token], entries: List[TableField]) -> None:
+        super().__init__(token, "Table")
+        self.entries: List[TableField] = entries
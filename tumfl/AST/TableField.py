@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class TableField(ASTNode):
+    """
+    A field of a table constructor. Positional fields have no key, the key of
+    name = value is the String of the name.
+    """
+
+    def __init__(
+        self, token: Optional[Token], key: Optional[Expression], value: Expression
+    ) -> None:
+        super().__init__(token, "TableField")
+        self.key: Optional[Expression] = key
+        self.value: Expression = value
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Optional, TYPE_CHECKING
+
+from .ASTNode import ASTNode
+from tumfl.Token import Token
+
+if TYPE_CHECKING:
+    from .Compound import Expression
+
+
+class UnaryOperator(Enum):
+    NEGATE = "-"
+    NOT = "not"
+    LENGTH = "#"
+    BIT_NOT = "~"
+
+
+class UnOp(ASTNode):
+    def __init__(
+        self, token: Optional[Token], op: UnaryOperator, operand: Expression
+    ) -> None:
+        super().__init__(token, "UnOp")
+        self.op: UnaryOperator = op
+        self.operand: Expression = operand
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .ASTNode import ASTNode, TokenMode
+from tumfl.Token import Token, TokenType
+
+
+class Vararg(ASTNode):
+    def __init__(self, token: Optional[Token], truncated: bool = False) -> None:
+        super().__init__(token, "Vararg")
+        # in parentheses, "(...)" only yields the first value
+        self.truncated: bool = truncated
+
+    @staticmethod
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> Vararg:
+        assert token.type == TokenType.ELLIPSIS
+        return Vararg(token)._with_mode(token, mode)
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from tumfl.Token import Token, TokenType
-from .ASTNode import ASTNode
+from .ASTNode import ASTNode, TokenMode
 
 
 class Variable(ASTNode):
-    def __init__(self, token: Token, id: str) -> None:
+    def __init__(self, token: Optional[Token], id: str) -> None:
         super().__init__(token, "Variable")
         self.id: str = id
 
     @staticmethod
-    def from_token(token: Token) -> Variable:
+    def from_token(token: Token, mode: TokenMode = TokenMode.TOKEN) -> Variable:
         assert token.type == TokenType.NAME
         value = token.value
         assert isinstance(value, str)
-        return Variable(token, value)
+        return Variable(token, value)._with_mode(token, mode)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type
+
+from .ASTNode import ASTNode
+
+VisitMethod = Callable[[Any, ASTNode], Any]
+
+
+class NodeVisitor:
+    """
+    Iterative pre-order traversal over an AST.
+
+    Subclasses define `visit_<ClassName>` methods, which are looked up once per
+    node type and visitor class, falling back along the node's MRO and finally
+    to `generic_visit`. Calling `skip` inside a visit method prevents the
+    traversal from descending into the children of the current node.
+    """
+
+    # dispatch table of each visitor class, keyed by node type
+    _dispatch: ClassVar[Dict[Type[ASTNode], VisitMethod]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    def __init__(self) -> None:
+        self._skip: bool = False
+
+    @classmethod
+    def _lookup(cls, node_type: Type[ASTNode]) -> VisitMethod:
+        method: Optional[VisitMethod] = cls._dispatch.get(node_type)
+        if method is None:
+            for base in node_type.__mro__:
+                method = getattr(cls, f"visit_{base.__name__}", None)
+                if method is not None:
+                    break
+            else:
+                method = cls.generic_visit
+            cls._dispatch[node_type] = method
+        return method
+
+    def skip(self) -> None:
+        """Don't visit the children of the node that is currently visited"""
+        self._skip = True
+
+    def generic_visit(self, node: ASTNode) -> Any:
+        return None
+
+    def visit(self, root: ASTNode) -> None:
+        lookup = self._lookup
+        stack: List[ASTNode] = [root]
+        while stack:
+            node: ASTNode = stack.pop()
+            self._skip = False
+            lookup(type(node))(self, node)
+            if not self._skip:
+                stack.extend(reversed(list(node.children())))
+
+
+class NodeTransformer(NodeVisitor):
+    """
+    A NodeVisitor that replaces every visited node with the return value of
+    its visit method. Returning the node itself keeps it, returning None removes
+    it from a list field (or clears a single field). The children of the
+    returned node are visited afterwards, unless `skip` was called, and are
+    parented to it in any case. A replaced node that is a descendant of its
+    replacement is not visited again, only its children are.
+
+    Visit methods may change the visited node in place, so cached structural
+    hashes of all visited nodes and the parents of the root are dropped. Nodes
+    shared by an Interner are visited as a copy, which replaces them if it
+    was changed.
+    """
+
+    def generic_visit(self, node: ASTNode) -> Optional[ASTNode]:
+        return node
+
+    def visit(self, root: ASTNode) -> None:
+        self.transform(root)
+
+    def transform(self, root: ASTNode) -> Optional[ASTNode]:
+        """Transform a tree in place, returning the (possibly replaced) root"""
+        lookup = self._lookup
+        new_root: Optional[ASTNode] = root
+        if root.parent_class is not None:
+            root.parent_class.invalidate_hash()
+        # lists that had nodes removed, and need to be compacted at the end
+        removed: List[List[Any]] = []
+        # replaced nodes by id, kept alive so their ids are not reused
+        replaced: Dict[int, ASTNode] = {}
+        # node, parent, field name and index into the field (or -1)
+        stack: List[Tuple[ASTNode, Optional[ASTNode], str, int]] = [
+            (root, None, "", -1)
+        ]
+        while stack:
+            node, parent, field, index = stack.pop()
+            self._skip = False
+            result: Optional[ASTNode]
+            # the node given to the visit method
+            visited: ASTNode = node
+            if id(node) in replaced:
+                # wrapped by its replacement, only its children are left to visit
+                result = node
+            else:
+                # shared nodes may be changed in place, so visit a private copy
+                visited = node.unshared()
+                result = lookup(type(visited))(self, visited)
+                if result is visited and visited is not node and visited == node:
+                    # unchanged, keep sharing the node
+                    result = visited = node
+            node.invalidate_hash()
+            if result is not node:
+                replaced[id(visited)] = visited
+                if parent is None:
+                    new_root = result
+                elif index < 0:
+                    parent.__setattr__(field, result)
+                else:
+                    values: List[Any] = parent.__getattribute__(field)
+                    values[index] = result
+                    if result is None:
+                        removed.append(values)
+                if not node._shared:
+                    node.parent_class = None
+                if result is not None:
+                    result.parent_class = parent
+            if result is None:
+                continue
+            result.invalidate_hash()
+            # replacements (or changed nodes) may have children of other nodes
+            for child in result.children():
+                child.parent_class = result
+            if self._skip:
+                continue
+            children: List[Tuple[ASTNode, Optional[ASTNode], str, int]] = []
+            for name in result.fields():
+                value: Any = result.__getattribute__(name)
+                if isinstance(value, ASTNode):
+                    children.append((value, result, name, -1))
+                elif isinstance(value, list):
+                    children.extend(
+                        (j, result, name, i)
+                        for i, j in enumerate(value)
+                        if isinstance(j, ASTNode)
+                    )
+            stack.extend(reversed(children))
+        for values in removed:
+            values[:] = [i for i in values if i is not None]
+        return new_root
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import Tuple
+
+# bits of a packed span that are used for the length
+SPAN_BITS: int = 32
+SPAN_MASK: int = (1 << SPAN_BITS) - 1
+
+
+def pack_span(start: int, end: int) -> int:
+    """Pack a source range into a single int"""
+    return start << SPAN_BITS | (end - start)
+
+
+def unpack_span(span: int) -> Tuple[int, int]:
+    start: int = span >> SPAN_BITS
+    return start, start + (span & SPAN_MASK)
+
+
+class Source:
+    """Resolves source offsets to positions, using the same convention as the Lexer"""
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        newlines: array[int] = array("q")
+        index: int = text.find("\n")
+        while index >= 0:
+            newlines.append(index)
+            index = text.find("\n", index + 1)
+        self.newlines: array[int] = newlines
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Returns (line, column) of an offset"""
+        line: int = bisect_right(self.newlines, offset)
+        if line == 0:
+            return 0, offset
+        return line, offset - self.newlines[line - 1]
+
+    def line_start(self, line: int) -> int:
+        """Offset of the first character after the newline that starts a line"""
+        return 0 if line == 0 else self.newlines[line - 1] + 1
+
+    def span_text(self, span: int) -> str:
+        start, end = unpack_span(span)
+        return self.text[start:end]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Union, Any, TYPE_CHECKING
+from typing import Union, Any, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .lexer import NumberTuple
@@ -70,17 +70,28 @@ class TokenType(Enum):
 
 
 class Token:
+    # start of the whitespace and comments in front of the token, only set by
+    # the TriviaLexer (the trivia ends at `start`)
+    trivia_start: int = -1
+    # source ranges of the comments in front of the token, set by the TriviaLexer
+    comments: Tuple[Tuple[int, int], ...] = ()
+
     def __init__(
         self,
         type: TokenType,
         value: Union[str, bool, NumberTuple],
         line: int,
         column: int,
+        start: int = -1,
+        end: int = -1,
     ) -> None:
         self.type: TokenType = type
         self.value: Union[str, bool, NumberTuple] = value
         self.line: int = line
         self.column: int = column
+        # offsets into the source text, -1 if unknown
+        self.start: int = start
+        self.end: int = end
 
     def __hash__(self) -> int:
         return hash((self.type, self.value))
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import zlib
+from typing import List, Union
+
+# zip archives store deflate streams, compressed at the highest level by default
+COMPRESSION_LEVEL: int = 9
+
+
+def compressed_size(data: Union[str, bytes], level: int = COMPRESSION_LEVEL) -> int:
+    """Size of the raw deflate stream of data, as a zip archive would store it"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    # negative window bits write no zlib header and checksum, like zip
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return len(compressor.compress(data)) + len(compressor.flush())
+
+
+class FileSizes:
+    """Raw and compressed size of a file, before and after minification"""
+
+    def __init__(
+        self,
+        name: str,
+        source: Union[str, bytes],
+        output: Union[str, bytes],
+        level: int = COMPRESSION_LEVEL,
+    ) -> None:
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        if isinstance(output, str):
+            output = output.encode("utf-8")
+        self.name: str = name
+        self.raw: int = len(source)
+        self.compressed: int = compressed_size(source, level)
+        self.minified_raw: int = len(output)
+        self.minified_compressed: int = compressed_size(output, level)
+
+    def __repr__(self) -> str:
+        return (
+            f"FileSizes(name={self.name!r}, raw={self.raw!r}, "
+            f"compressed={self.compressed!r}, minified_raw={self.minified_raw!r}, "
+            f"minified_compressed={self.minified_compressed!r})"
+        )
+
+
+def format_report(files: List[FileSizes]) -> str:
+    """A table of the sizes of each file, and the total"""
+    total: FileSizes = FileSizes("total", b"", b"")
+    # even an empty deflate stream has a size
+    total.compressed = total.minified_compressed = 0
+    for i in files:
+        total.raw += i.raw
+        total.compressed += i.compressed
+        total.minified_raw += i.minified_raw
+        total.minified_compressed += i.minified_compressed
+    width: int = max([len(i.name) for i in files] + [len(total.name)])
+    lines: List[str] = [
+        f"{'file':<{width}} {'raw':>10} {'deflated':>10} "
+        f"{'min raw':>10} {'min deflated':>12} {'saved':>7}"
+    ]
+    for i in [*files, total]:
+        saved: float = 1 - i.minified_compressed / i.compressed if i.compressed else 0.0
+        lines.append(
+            f"{i.name:<{width}} {i.raw:>10} {i.compressed:>10} "
+            f"{i.minified_raw:>10} {i.minified_compressed:>12} {saved:>7.1%}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .AST.ASTNode import ASTNode
+from .AST.BinOp import BinOp
+from .AST.Boolean import Boolean
+from .AST.Number import Number
+from .AST.String import String
+from .AST.UnOp import UnOp
+from .AST.Vararg import Vararg
+from .AST.Variable import Variable
+from .parser import PRIORITIES, UNARY_PRIORITY
+
+if TYPE_CHECKING:
+    from .AST.Compound import Expression
+
+
+def needs_parentheses(parent: ASTNode, child: ASTNode, left: bool = True) -> bool:
+    """Whether a child expression has to be parenthesized in its parent"""
+    if isinstance(parent, UnOp):
+        # -a^b is -(a^b), but -(a+b) needs them
+        return isinstance(child, BinOp) and PRIORITIES[child.op][0] <= UNARY_PRIORITY
+    assert isinstance(parent, BinOp)
+    parent_left, parent_right = PRIORITIES[parent.op]
+    if left:
+        # the child is reduced before the parent operator if it binds tighter
+        if isinstance(child, BinOp):
+            return PRIORITIES[child.op][1] < parent_left
+        return isinstance(child, UnOp) and UNARY_PRIORITY < parent_left
+    # the child operator takes its left operand from the parent otherwise
+    return isinstance(child, BinOp) and PRIORITIES[child.op][0] <= parent_right
+
+
+def expression_tokens(
+    expression: Expression,
+) -> Iterator[Tuple[Optional[str], ASTNode]]:
+    """
+    The tokens of an expression with as few parentheses as possible, in order.
+    Operators and parentheses are yielded as text with their node, leaves
+    (literals, variables and varargs) as None with the node.
+    """
+    # pending nodes and texts, in reverse order
+    stack: List[Union[ASTNode, Tuple[str, ASTNode]]] = [expression]
+    while stack:
+        item: Union[ASTNode, Tuple[str, ASTNode]] = stack.pop()
+        if isinstance(item, tuple):
+            yield item
+        elif isinstance(item, BinOp):
+            right: List[Union[ASTNode, Tuple[str, ASTNode]]] = [item.right]
+            if needs_parentheses(item, item.right, False):
+                right = [(")", item), item.right, ("(", item)]
+            left: List[Union[ASTNode, Tuple[str, ASTNode]]] = [item.left]
+            if needs_parentheses(item, item.left, True):
+                left = [(")", item), item.left, ("(", item)]
+            stack.extend(right)
+            stack.append((item.op.value, item))
+            stack.extend(left)
+        elif isinstance(item, UnOp):
+            yield item.op.value, item
+            if needs_parentheses(item, item.operand):
+                stack.extend(((")", item), item.operand, ("(", item)))
+            else:
+                stack.append(item.operand)
+        else:
+            yield None, item
+
+
+def expression_length(expression: Expression) -> int:
+    """Length of the minified expression, assuming spaces only around words"""
+    length: int = 0
+    for text, node in expression_tokens(expression):
+        if text is not None:
+            length += len(text)
+            if text.isalpha():
+                # "not" only needs a space after it
+                length += 1 if isinstance(node, UnOp) else 2
+        else:
+            length += leaf_length(node)
+    return length
+
+
+def leaf_length(node: ASTNode) -> int:
+    """Length of the shortest spelling of a literal, variable or vararg"""
+    if isinstance(node, (Number, String)):
+        return len(node.spelling())
+    if isinstance(node, Variable):
+        return len(node.id)
+    if isinstance(node, Vararg):
+        return 5 if node.truncated else 3
+    if isinstance(node, Boolean):
+        return 4 if node.value else 5
+    # nil
+    return 3
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .AST.ASTNode import ASTNode
+from .AST.BinOp import BinOp, BinaryOperator
+from .AST.Boolean import Boolean
+from .AST.Nil import Nil
+from .AST.Number import Number, wrap_integer, MAX_INTEGER, MIN_INTEGER
+from .AST.String import String
+from .AST.UnOp import UnOp, UnaryOperator
+from .emitter import expression_length, leaf_length, needs_parentheses
+
+if TYPE_CHECKING:
+    from .AST.Compound import Expression
+
+# lua values are represented as None (nil), bool, int, float and str
+LuaValue = Union[None, bool, int, float, str]
+# marks values that are not known, or can't be folded
+NOT_CONSTANT: Any = object()
+
+INTEGER_MASK: int = 2**64 - 1
+ARITHMETIC: Dict[BinaryOperator, Callable[[Any, Any], Any]] = {
+    BinaryOperator.ADD: lambda a, b: a + b,
+    BinaryOperator.SUBTRACT: lambda a, b: a - b,
+    BinaryOperator.MULT: lambda a, b: a * b,
+}
+BITWISE: Dict[BinaryOperator, Callable[[int, int], int]] = {
+    BinaryOperator.BIT_AND: lambda a, b: a & b,
+    BinaryOperator.BIT_OR: lambda a, b: a | b,
+    BinaryOperator.BIT_XOR: lambda a, b: a ^ b,
+    BinaryOperator.BIT_SHIFT_LEFT: lambda a, b: shift_left(a, b),
+    BinaryOperator.BIT_SHIFT_RIGHT: lambda a, b: shift_left(a, -b),
+}
+ORDER: Dict[BinaryOperator, Callable[[Any, Any], bool]] = {
+    BinaryOperator.LESS_THAN: lambda a, b: a < b,
+    BinaryOperator.GREATER_THAN: lambda a, b: a > b,
+    BinaryOperator.LESS_EQUALS: lambda a, b: a <= b,
+    BinaryOperator.GREATER_EQUALS: lambda a, b: a >= b,
+}
+
+
+def is_number(value: Any) -> bool:
+    # bool is a subclass of int, but not a lua number
+    return type(value) is int or type(value) is float
+
+
+def is_truthy(value: LuaValue) -> bool:
+    return value is not None and value is not False
+
+
+def to_integer(value: Any) -> Optional[int]:
+    """The integer for bitwise operators: integers and floats with exact values"""
+    if type(value) is int:
+        return value
+    if type(value) is float and value.is_integer():
+        if MIN_INTEGER <= value <= MAX_INTEGER:
+            return int(value)
+    return None
+
+
+def shift_left(value: int, shift: int) -> int:
+    """Logical shift as in lua, negative shifts shift to the right"""
+    if shift <= -64 or shift >= 64:
+        return 0
+    if shift >= 0:
+        return wrap_integer((value << shift) & INTEGER_MASK)
+    return wrap_integer((value & INTEGER_MASK) >> -shift)
+
+
+def number_to_string(value: Union[int, float]) -> str:
+    """Conversion of numbers to strings, as done by the concatenation"""
+    if type(value) is int:
+        return str(value)
+    text: str = "%.14g" % value
+    # floats that look like integers get a ".0"
+    if all(i in "-0123456789" for i in text):
+        text += ".0"
+    return text
+
+
+def literal_value(node: ASTNode) -> Any:
+    """The value of a literal node, or NOT_CONSTANT"""
+    if isinstance(node, Number):
+        value: Union[int, float] = node.to_value()
+        return value if type(value) is int or math.isfinite(value) else NOT_CONSTANT
+    if isinstance(node, String):
+        # lua strings are bytes: only ascii strings have a known length and can
+        # be written back unchanged. The lexer doesn't decode \u{...} escapes.
+        if node.value.isascii() and "u{" not in node.value:
+            return node.value
+        return NOT_CONSTANT
+    if isinstance(node, Boolean):
+        return node.value
+    if isinstance(node, Nil):
+        return None
+    return NOT_CONSTANT
+
+
+def fold_unary(op: UnaryOperator, value: Any) -> Any:
+    """Apply a unary operator like lua does, or return NOT_CONSTANT"""
+    if op == UnaryOperator.NOT:
+        return not is_truthy(value)
+    if op == UnaryOperator.NEGATE:
+        if type(value) is int:
+            return wrap_integer(-value)
+        if type(value) is float:
+            return -value
+    elif op == UnaryOperator.BIT_NOT:
+        integer: Optional[int] = to_integer(value)
+        if integer is not None:
+            return wrap_integer(~integer)
+    elif op == UnaryOperator.LENGTH:
+        if type(value) is str:
+            return len(value)
+    # strings in arithmetic would need coercion, errors are kept as they are
+    return NOT_CONSTANT
+
+
+def _fold_arithmetic(op: BinaryOperator, left: Any, right: Any) -> Any:
+    if op in (BinaryOperator.DIVIDE, BinaryOperator.EXPONENT):
+        # always done on floats
+        left, right = float(left), float(right)
+        if op == BinaryOperator.DIVIDE:
+            return left / right if right else NOT_CONSTANT
+        try:
+            return math.pow(left, right)
+        except (ValueError, OverflowError):
+            return NOT_CONSTANT
+    if type(left) is int and type(right) is int:
+        if op in ARITHMETIC:
+            return wrap_integer(ARITHMETIC[op](left, right))
+        if not right:
+            # division by zero is an error
+            return NOT_CONSTANT
+        if op == BinaryOperator.INTEGER_DIVISION:
+            return wrap_integer(left // right)
+        # python and lua both take the sign of the divisor
+        return left % right
+    left, right = float(left), float(right)
+    if op in ARITHMETIC:
+        return ARITHMETIC[op](left, right)
+    if not right:
+        return NOT_CONSTANT
+    if op == BinaryOperator.INTEGER_DIVISION:
+        quotient: float = left / right
+        return float(math.floor(quotient)) if math.isfinite(quotient) else quotient
+    remainder: float = math.fmod(left, right)
+    if remainder and (remainder < 0) != (right < 0):
+        remainder += right
+    return remainder
+
+
+def fold_binary(op: BinaryOperator, left: Any, right: Any) -> Any:
+    """Apply a binary operator like lua does, or return NOT_CONSTANT"""
+    if op == BinaryOperator.AND:
+        return right if is_truthy(left) else left
+    if op == BinaryOperator.OR:
+        return left if is_truthy(left) else right
+    if op in (BinaryOperator.EQUALS, BinaryOperator.NOT_EQUALS):
+        if is_number(left) and is_number(right):
+            equal: bool = left == right
+        else:
+            equal = type(left) is type(right) and left == right
+        return equal == (op == BinaryOperator.EQUALS)
+    if op in ORDER:
+        # string order depends on the locale
+        if is_number(left) and is_number(right):
+            return ORDER[op](left, right)
+        return NOT_CONSTANT
+    if op == BinaryOperator.CONCAT:
+        if all(type(i) is str or is_number(i) for i in (left, right)):
+            return "".join(
+                i if type(i) is str else number_to_string(i) for i in (left, right)
+            )
+        return NOT_CONSTANT
+    if op in BITWISE:
+        first: Optional[int] = to_integer(left)
+        second: Optional[int] = to_integer(right)
+        if first is None or second is None:
+            return NOT_CONSTANT
+        return wrap_integer(BITWISE[op](first, second))
+    if not is_number(left) or not is_number(right):
+        return NOT_CONSTANT
+    result: Any = _fold_arithmetic(op, left, right)
+    if type(result) is float and not math.isfinite(result):
+        # inf and nan have no literals
+        return NOT_CONSTANT
+    return result
+
+
+def literal_node(value: LuaValue) -> Expression:
+    """The shortest expression for a constant value"""
+    if value is None:
+        return Nil(None)
+    if type(value) is bool:
+        return Boolean(None, value)
+    if type(value) is str:
+        return String(None, value)
+    assert type(value) is int or type(value) is float
+    if value > 0 or value == 0 and math.copysign(1, value) > 0:
+        return Number.from_value(value)
+    if not isinstance(value, int):
+        return _negated(value)
+    # negative integers also wrap around from hexadecimal literals
+    wrapped: Number = Number(None, True, format(value & INTEGER_MASK, "x"))
+    if value == MIN_INTEGER:
+        return wrapped
+    negated: UnOp = _negated(value)
+    if len(wrapped.spelling()) < expression_length(negated):
+        return wrapped
+    return negated
+
+
+def _negated(value: Union[int, float]) -> UnOp:
+    number: Number = Number.from_value(-value)
+    negated: UnOp = UnOp(None, UnaryOperator.NEGATE, number)
+    number.parent_class = negated
+    return negated
+
+
+def fold(expression: Expression) -> Tuple[Expression, int]:
+    """
+    Evaluate constant subexpressions with lua semantics, and replace them with
+    their shortest literal if that is not longer. Returns the new root and the number of
+    replaced subexpressions.
+
+    Values and lengths are computed bottom up, replacements are done top down,
+    so the tree is walked once in each direction.
+    """
+    values: Dict[int, Any] = {}
+    lengths: Dict[int, int] = {}
+    # post-order, nodes are evaluated on their second visit
+    stack: List[Tuple[ASTNode, bool]] = [(expression, False)]
+    while stack:
+        node, ready = stack.pop()
+        if isinstance(node, BinOp):
+            if not ready:
+                stack.extend(((node, True), (node.right, False), (node.left, False)))
+                continue
+            left: Any = values[id(node.left)]
+            right: Any = values[id(node.right)]
+            values[id(node)] = (
+                NOT_CONSTANT
+                if left is NOT_CONSTANT or right is NOT_CONSTANT
+                else fold_binary(node.op, left, right)
+            )
+            lengths[id(node)] = (
+                lengths[id(node.left)]
+                + lengths[id(node.right)]
+                + len(node.op.value)
+                + (2 if node.op.value.isalpha() else 0)
+                + 2 * needs_parentheses(node, node.left, True)
+                + 2 * needs_parentheses(node, node.right, False)
+            )
+        elif isinstance(node, UnOp):
+            if not ready:
+                stack.extend(((node, True), (node.operand, False)))
+                continue
+            operand: Any = values[id(node.operand)]
+            values[id(node)] = (
+                NOT_CONSTANT
+                if operand is NOT_CONSTANT
+                else fold_unary(node.op, operand)
+            )
+            lengths[id(node)] = (
+                lengths[id(node.operand)]
+                + len(node.op.value)
+                + (node.op == UnaryOperator.NOT)
+                + 2 * needs_parentheses(node, node.operand)
+            )
+        else:
+            values[id(node)] = literal_value(node)
+            lengths[id(node)] = leaf_length(node)
+    replaced: int = 0
+    root: Expression = expression
+    # with their parents, as those of shared literals (see Interner) are unknown
+    nodes: List[Tuple[ASTNode, Optional[ASTNode]]] = [(expression, None)]
+    while nodes:
+        node, parent = nodes.pop()
+        value: Any = values[id(node)]
+        if value is not NOT_CONSTANT:
+            new: Expression = literal_node(value)
+            length: int = expression_length(new)
+            # operations are folded unless that is longer, literals are only
+            # written differently if that is shorter
+            if (
+                length < lengths[id(node)]
+                or length == lengths[id(node)]
+                and isinstance(node, (BinOp, UnOp))
+            ) and new != node:
+                replaced += 1
+                if parent is None:
+                    root = new
+                else:
+                    parent.replace(node, new)
+                continue
+        nodes.extend((i, node) for i in node.children())
+    return root, replaced
@@ -1,42 +1,48 @@
 import sys
-from typing import Optional, Dict, List, Tuple
+from types import MappingProxyType
+from typing import Optional, Mapping, List, Tuple
 
 from .Token import TokenType, Token
 
-RESERVED_KEYWORDS: Dict[str, TokenType] = {
-    t.value: t
-    for t in list(TokenType)
-    if t.value.isalpha() and t.value not in ["name", "number", "eof", "string"]
-}
-SYMBOLS: Dict[str, TokenType] = {
-    t.value: t for t in list(TokenType) if not t.value.isalpha()
-}
+# all tables are immutable, as they are shared by lexers running in parallel threads
+RESERVED_KEYWORDS: Mapping[str, TokenType] = MappingProxyType(
+    {
+        t.value: t
+        for t in list(TokenType)
+        if t.value.isalpha() and t.value not in ["name", "number", "eof", "string"]
+    }
+)
+SYMBOLS: Mapping[str, TokenType] = MappingProxyType(
+    {t.value: t for t in list(TokenType) if not t.value.isalpha()}
+)
 # string.isnumeric works on unicode numbers, too. lua only works on Arabic-Indic digits
-NUMBER: List[str] = [str(i) for i in range(10)]
-HEX_NUMBER: List[str] = [
+NUMBER: Tuple[str, ...] = tuple(str(i) for i in range(10))
+HEX_NUMBER: Tuple[str, ...] = (
     *(chr(i + 65) for i in range(6)),
     *(chr(i + 97) for i in range(6)),
     *NUMBER,
-]
-LETTER: List[str] = [
+)
+LETTER: Tuple[str, ...] = (
     *(chr(i + 65) for i in range(26)),
     *(chr(i + 97) for i in range(26)),
     "_",
-]
-ALPHANUMERIC: List[str] = [*NUMBER, *LETTER]
-ESCAPE_CODES: Dict[str, str] = {
-    "a": "\a",
-    "b": "\b",
-    "f": "\f",
-    "n": "\n",
-    "\n": "\n",
-    "r": "\r",
-    "t": "\t",
-    "v": "\v",
-    "\\": "\\",
-    '"': '"',
-    "'": "'",
-}
+)
+ALPHANUMERIC: Tuple[str, ...] = (*NUMBER, *LETTER)
+ESCAPE_CODES: Mapping[str, str] = MappingProxyType(
+    {
+        "a": "\a",
+        "b": "\b",
+        "f": "\f",
+        "n": "\n",
+        "\n": "\n",
+        "r": "\r",
+        "t": "\t",
+        "v": "\v",
+        "\\": "\\",
+        '"': '"',
+        "'": "'",
+    }
+)
 
 NumberTuple = Tuple[bool, Optional[str], Optional[str], Optional[str], Optional[str]]
 
@@ -44,24 +50,34 @@ NumberTuple = Tuple[bool, Optional[str], Optional[str], Optional[str], Optional[
 class Lexer:
     def __init__(self, text: str) -> None:
         self.text: str = text
-        self.text_by_line: List[str] = text.split("\n")
         self.text_len: int = len(self.text)
         self.line: int = 0
         self.column: int = 0
         self.pos: int = 0
         self.newline_warn: int = 0
-        self.current_char: Optional[str] = self.text[self.pos]
+        self.current_char: Optional[str] = self.text[self.pos] if text else None
         self.last_hint: Optional[Tuple[str, int, int]] = None
 
-    def error(
+    @property
+    def text_by_line(self) -> List[str]:
+        """Lines of the text, only split for error messages"""
+        return self.text.split("\n")
+
+    def report(
         self, message: str, line: Optional[int] = None, column: Optional[int] = None
     ) -> None:
+        """Print an error message with the line it occurred in"""
         current_line: int = line if line is not None else self.line
         current_column = column if column is not None else self.column
         print(f"Error on line {current_line + 1}:", file=sys.stderr)
         print(self.text_by_line[current_line], file=sys.stderr)
         print(" " * current_column + "^", file=sys.stderr)
         print(message, file=sys.stderr)
+
+    def error(
+        self, message: str, line: Optional[int] = None, column: Optional[int] = None
+    ) -> None:
+        self.report(message, line, column)
         raise ValueError(message)
 
     def advance(self) -> None:
@@ -90,6 +106,14 @@ class Lexer:
         else:
             self.current_char = None
 
+    def seek(self, pos: int, line: int, column: int) -> None:
+        """Continue lexing at pos, which has to be outside of any token"""
+        self.pos = pos
+        self.line = line
+        self.column = column
+        self.newline_warn = 0
+        self.current_char = self.text[pos] if pos < self.text_len else None
+
     def peek(self) -> Optional[str]:
         peek_pos = self.pos + 1
         if peek_pos < self.text_len:
@@ -149,7 +173,7 @@ class Lexer:
 
     def get_number(self) -> NumberTuple:
         """Parses a number into the Number ast node"""
-        current_numbers: List[str] = NUMBER
+        current_numbers: Tuple[str, ...] = NUMBER
         is_hex: bool = False
         integer_part: Optional[str] = None
         # starts with a digit
@@ -322,34 +346,74 @@ class Lexer:
 
             line: int = self.line
             column: int = self.column
+            start: int = self.pos
 
             if self.current_char in LETTER:
                 name: str = self.get_name()
                 if token_type := RESERVED_KEYWORDS.get(name):
-                    return Token(token_type, name, line, column)
-                return Token(TokenType.NAME, name, line, column)
+                    return Token(token_type, name, line, column, start, self.pos)
+                return Token(TokenType.NAME, name, line, column, start, self.pos)
 
-            if self.current_char in NUMBER:
+            # numbers may start with a dot, as in .5
+            if self.current_char in NUMBER or (
+                self.current_char == "." and self.peek() in NUMBER
+            ):
                 number: NumberTuple = self.get_number()
-                return Token(TokenType.NUMBER, number, line, column)
+                return Token(TokenType.NUMBER, number, line, column, start, self.pos)
 
             if self.current_char in ["'", '"']:
                 string: str = self.get_string()
-                return Token(TokenType.STRING, string, line, column)
+                return Token(TokenType.STRING, string, line, column, start, self.pos)
 
             if self.current_char == "[" and self.peek() in ["[", "="]:
                 string = self.get_long_brackets()
-                return Token(TokenType.STRING, string, line, column)
+                return Token(TokenType.STRING, string, line, column, start, self.pos)
+
+            # the only three character symbol
+            if self.text.startswith("...", self.pos):
+                self.advance()
+                self.advance()
+                self.advance()
+                return Token(TokenType.ELLIPSIS, "...", line, column, start, self.pos)
 
             if peek := self.peek():
                 double_character: str = self.current_char + peek
                 if token_type := SYMBOLS.get(double_character):
                     self.advance()
-                    return Token(token_type, double_character, line, column)
+                    self.advance()
+                    return Token(
+                        token_type, double_character, line, column, start, self.pos
+                    )
             char: str = self.current_char
             if token_type := SYMBOLS.get(char):
                 self.advance()
-                return Token(token_type, char, line, column)
+                return Token(token_type, char, line, column, start, self.pos)
 
             self.error(f"unrecognised character {self.current_char}")
-        return Token(TokenType.EOF, "eof", self.line, self.column)
+        return Token(TokenType.EOF, "eof", self.line, self.column, self.pos, self.pos)
+
+
+class TriviaLexer(Lexer):
+    """
+    A Lexer that attaches the whitespace and comments in front of each token to
+    it, as source offsets (see Token.trivia_start and Token.comments).
+    The plain Lexer is not affected by this.
+    """
+
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.comments: List[Tuple[int, int]] = []
+
+    def skip_comment(self) -> None:
+        start: int = self.pos
+        super().skip_comment()
+        self.comments.append((start, self.pos))
+
+    def get_next_token(self) -> Token:
+        trivia_start: int = self.pos
+        token: Token = super().get_next_token()
+        token.trivia_start = trivia_start
+        if self.comments:
+            token.comments = tuple(self.comments)
+            self.comments.clear()
+        return token
@@ -0,0 +1,584 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from io import StringIO
+from itertools import product
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .lexer import (
+    Lexer,
+    TriviaLexer,
+    ALPHANUMERIC,
+    LETTER,
+    RESERVED_KEYWORDS,
+    SYMBOLS,
+)
+from .AST.Boolean import Boolean
+from .AST.Number import Number
+from .AST.String import String
+from .AST.Vararg import Vararg
+from .AST.Variable import Variable
+from .compression import compressed_size
+from .emitter import expression_tokens
+from .folding import fold
+from .parser import ParseError, Parser, TokenBuffer
+from .Source import Source
+from .sourcemap import SourceMapWriter
+from .Token import Token, TokenType
+
+if TYPE_CHECKING:
+    from .AST.Compound import Expression
+
+WORD_CHARACTERS: Set[str] = set(ALPHANUMERIC)
+TWO_CHARACTER_SYMBOLS: Set[str] = {i for i in SYMBOLS if len(i) == 2}
+# keywords that open a block that is closed by "end" (or "until" for repeat)
+BLOCK_OPENERS: Set[TokenType] = {
+    TokenType.FUNCTION,
+    TokenType.IF,
+    TokenType.DO,
+    TokenType.REPEAT,
+}
+BLOCK_CLOSERS: Set[TokenType] = {TokenType.END, TokenType.UNTIL}
+BRACKETS: Dict[TokenType, TokenType] = {
+    TokenType.L_CURL: TokenType.R_CURL,
+    TokenType.L_PAREN: TokenType.R_PAREN,
+    TokenType.L_BRACKET: TokenType.R_BRACKET,
+}
+CLOSING_BRACKETS: Set[TokenType] = set(BRACKETS.values())
+# tokens that may precede a key in a table constructor
+KEY_PREFIXES: Set[TokenType] = {TokenType.L_CURL, TokenType.COMMA, TokenType.SEMICOLON}
+# tokens after which a string literal is the argument of a call, as in f"x"
+CALL_PREFIXES: Set[TokenType] = {
+    TokenType.NAME,
+    TokenType.R_PAREN,
+    TokenType.R_BRACKET,
+    TokenType.R_CURL,
+    TokenType.STRING,
+}
+# tokens after which an expression starts, where constants are folded
+FOLD_PREFIXES: Set[TokenType] = {
+    TokenType.ASSIGN,
+    TokenType.RETURN,
+    TokenType.L_PAREN,
+    TokenType.L_BRACKET,
+    TokenType.L_CURL,
+    TokenType.COMMA,
+    TokenType.SEMICOLON,
+    TokenType.IF,
+    TokenType.ELSEIF,
+    TokenType.WHILE,
+    TokenType.UNTIL,
+    TokenType.IN,
+}
+# tokens that continue a prefix expression (indexing, method and function calls)
+# which the expression parser doesn't handle
+PREFIX_CONTINUATIONS: Set[TokenType] = {
+    TokenType.DOT,
+    TokenType.COLON,
+    TokenType.L_BRACKET,
+    TokenType.L_PAREN,
+    TokenType.L_CURL,
+    TokenType.STRING,
+}
+# comments that usually have to be kept: license headers and annotations
+LICENSE_AND_ANNOTATIONS: str = r"^---@|(?i:license|copyright)"
+LONG_COMMENT: Pattern[str] = re.compile(r"--\[=*\[")
+# upper bound for hoisted strings, to stay far below the local and upvalue limits
+MAX_HOISTED_STRINGS: int = 50
+# quotes and number styles tried by compression_aware, besides the original ones
+QUOTES: Tuple[str, ...] = ('"', "'")
+# (None keeps the original spelling)
+NUMBER_STYLES: Tuple[Optional[str], ...] = (None, "decimal", "shortest")
+
+
+def generate_names(
+    excluded: Set[str],
+    letters: Sequence[str] = LETTER,
+    alphanumerics: Sequence[str] = ALPHANUMERIC,
+) -> Iterator[str]:
+    """Generate valid, short identifiers in order of length, then alphabet"""
+    length: int = 1
+    while True:
+        for parts in product(letters, *([alphanumerics] * (length - 1))):
+            name: str = "".join(parts)
+            if name not in excluded and name not in RESERVED_KEYWORDS:
+                yield name
+        length += 1
+
+
+def number_spelling(token: Token, text: str, style: str) -> Optional[str]:
+    """
+    Spelling of a number token with the original text in decimal or in the
+    shortest form (hexadecimal if that is shorter), or None if the value can't
+    be written that way.
+    """
+    number: Number = Number.from_token(token)
+    if number.fractional_part is None and "." in text:
+        # "1." is a float, but the lexer doesn't keep the empty fraction
+        number.fractional_part = ""
+    value: Union[int, float] = number.to_value()
+    # wrapped hexadecimal integers and overflowing floats
+    if value < 0 or not math.isfinite(value):
+        return None
+    if style == "decimal" and type(value) is int:
+        return str(value)
+    return Number.from_value(value).spelling()
+
+
+def needs_space(previous: str, following: str) -> bool:
+    """Whether two token texts would be lexed differently without a space between"""
+    if not previous or not following:
+        return False
+    last: str = previous[-1]
+    first: str = following[0]
+    if last in WORD_CHARACTERS and first in WORD_CHARACTERS:
+        return True
+    # lua reads numbers up to the next character that is neither alphanumeric
+    # nor a dot, so 0xa..b and 1.x are malformed numbers
+    is_number: bool = previous[0].isdigit() or (
+        previous[0] == "." and previous[1:2].isdigit()
+    )
+    if is_number and (first == "." or first in WORD_CHARACTERS):
+        return True
+    # dots followed by dots or numbers
+    if last == "." and first == ".":
+        return True
+    if last == "." and first.isdigit() and previous != "..":
+        return True
+    # comments and long brackets
+    if last == "-" and first == "-" or last == "[" and first in "[=":
+        return True
+    return last + first in TWO_CHARACTER_SYMBOLS
+
+
+def doomed_starts(tokens: Sequence[Token]) -> List[int]:
+    """
+    Starts of the expressions inside a failed expression parse, which would fail
+    at the same token: those after an open parenthesis that is still open at the
+    failing (last) token, with no enclosing parenthesis closed in between. Only
+    parentheses start expressions inside the ones parsed by Parser.
+    """
+    # number of open parentheses in front of each token
+    depths: List[int] = []
+    depth: int = 0
+    for token in tokens:
+        depths.append(depth)
+        if token.type == TokenType.L_PAREN:
+            depth += 1
+        elif token.type == TokenType.R_PAREN:
+            depth -= 1
+    starts: List[int] = []
+    lowest: int = depths[-1]
+    for i in range(len(tokens) - 1, 0, -1):
+        lowest = min(lowest, depths[i])
+        if (
+            tokens[i - 1].type == TokenType.L_PAREN
+            and lowest == depths[i]
+            and depths[-1] > depths[i]
+        ):
+            starts.append(tokens[i].start)
+    return starts
+
+
+class Minifier:
+    """
+    Minifies lua source on the token level: comments and whitespace are dropped,
+    and names can be replaced by a mapping (field names and table keys are kept).
+    Optionally writes a source map for the generated output.
+
+    With hoist_strings, string literals that are repeated often enough are
+    declared once as locals at the start of the chunk, if that saves bytes.
+    Comments matching keep_comments (a regular expression) are kept.
+    With fold_constants, constant subexpressions are evaluated and written in
+    their shortest form (see tumfl.folding).
+
+    With compression_aware, the output is made to compress well with deflate (as
+    in zip archives) instead of being as short as possible: strings use a
+    single quote character, numbers a consistent spelling, and generated names
+    the characters that are most common in the source. The quote and number
+    spellings, and whether hoisting strings pays off, are chosen by minifying
+    with each of them and comparing the compressed sizes (see
+    tumfl.compression), so this takes a few times longer.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        names: Optional[Dict[str, str]] = None,
+        source_map: Optional[SourceMapWriter] = None,
+        source_index: int = 0,
+        hoist_strings: bool = False,
+        keep_comments: Optional[str] = None,
+        fold_constants: bool = False,
+        compression_aware: bool = False,
+    ) -> None:
+        self.text: str = text
+        self.fold_constants: bool = fold_constants
+        self.compression_aware: bool = compression_aware
+        # quote of respelled strings and style of respelled numbers, see token_text
+        self.quote: Optional[str] = None
+        self.number_style: Optional[str] = None
+        # alphabet of generated names
+        self.letters: Sequence[str] = LETTER
+        self.alphanumerics: Sequence[str] = ALPHANUMERIC
+        self.keep_comments: Optional[Pattern[str]] = (
+            re.compile(keep_comments) if keep_comments is not None else None
+        )
+        self.names: Dict[str, str] = names or {}
+        self.hoist_strings: bool = hoist_strings
+        # string values that are replaced by locals, and their local names
+        self.hoisted: Dict[str, str] = {}
+        # starts of expressions that are known to fail to parse, see fold_expression
+        self.unfoldable: Set[int] = set()
+        self.source_map: Optional[SourceMapWriter] = source_map
+        self.source_index: int = source_index
+        self.source: Source = Source(text)
+        self.output: TextIO = StringIO()
+        self.previous: str = ""
+        self.line: int = 0
+        self.column: int = 0
+
+    def write(
+        self, text: str, token: Optional[Token] = None, name: bool = False
+    ) -> None:
+        """Write a token text to the output, mapping it to the token if given"""
+        if needs_space(self.previous, text):
+            self.output.write(" ")
+            self.column += 1
+        if self.source_map and token and token.start >= 0:
+            source_column: int = token.start - self.source.line_start(token.line)
+            self.source_map.add(
+                self.line,
+                self.column,
+                self.source_index,
+                token.line,
+                source_column,
+                str(token.value) if name else None,
+            )
+        self.output.write(text)
+        if "\n" in text:
+            self.line += text.count("\n")
+            self.column = len(text) - text.rindex("\n") - 1
+        else:
+            self.column += len(text)
+        self.previous = text
+
+    def token_text(self, token: Token) -> str:
+        if token.type == TokenType.STRING:
+            text: str = self.text[token.start : token.end]
+            # only strings without escapes have their exact value in the token
+            if self.quote and text[0] in QUOTES and "\\" not in text:
+                assert isinstance(token.value, str)
+                return String(None, token.value).spelling(self.quote)
+            # keep the original spelling
+            return text
+        if token.type == TokenType.NUMBER:
+            text = self.text[token.start : token.end]
+            if self.number_style and (
+                spelling := number_spelling(token, text, self.number_style)
+            ):
+                return spelling
+            return text
+        assert isinstance(token.value, str)
+        return token.value
+
+    def trial_size(
+        self, quote: Optional[str], number_style: Optional[str], hoist_strings: bool
+    ) -> int:
+        """Compressed size of the output with a quote, number style and hoisting"""
+        trial: Minifier = Minifier(
+            self.text,
+            self.names,
+            hoist_strings=hoist_strings,
+            keep_comments=self.keep_comments.pattern if self.keep_comments else None,
+            fold_constants=self.fold_constants,
+        )
+        trial.quote = quote
+        trial.number_style = number_style
+        trial.letters = self.letters
+        trial.alphanumerics = self.alphanumerics
+        output: StringIO = StringIO()
+        trial.minify(output)
+        return compressed_size(output.getvalue())
+
+    def choose_spellings(self) -> None:
+        """
+        Choose the alphabet of generated names by character frequency, then the
+        quote, the number style and whether to hoist strings by the compressed
+        size of the output. Original spellings are candidates, so the output
+        never compresses worse than without compression_aware.
+        """
+        counts: Counter[str] = Counter(self.text)
+        self.letters = sorted(LETTER, key=lambda i: -counts[i])
+        self.alphanumerics = sorted(ALPHANUMERIC, key=lambda i: -counts[i])
+        # quotes and number styles mostly affect different tokens, so they are
+        # chosen one after the other instead of trying every combination
+        sizes: Dict[Tuple[Optional[str], Optional[str]], int] = {
+            (quote, None): self.trial_size(quote, None, self.hoist_strings)
+            for quote in (None, *QUOTES)
+        }
+        quote: Optional[str] = min((None, *QUOTES), key=lambda i: sizes[(i, None)])
+        for number_style in NUMBER_STYLES[1:]:
+            sizes[(quote, number_style)] = self.trial_size(
+                quote, number_style, self.hoist_strings
+            )
+        self.quote, self.number_style = min(
+            ((quote, i) for i in NUMBER_STYLES), key=lambda i: sizes[i]
+        )
+        # deflate already shortens repeated strings, so the locals may not pay off
+        if (
+            self.hoist_strings
+            and self.trial_size(self.quote, self.number_style, False)
+            < sizes[(self.quote, self.number_style)]
+        ):
+            self.hoist_strings = False
+
+    def find_hoisted_strings(self) -> List[Tuple[str, str]]:
+        """Choose the strings to hoist, returns their names and spellings"""
+        lexer: Lexer = Lexer(self.text)
+        used_names: Set[str] = set(self.names.values())
+        # value: spelling of the first occurrence, count, count as call argument
+        strings: Dict[str, Tuple[str, int, int]] = {}
+        # upper bound for the locals declared in the main chunk
+        chunk_locals: int = 0
+        depth: int = 0
+        in_local: bool = False
+        previous: Optional[Token] = None
+        while (token := lexer.get_next_token()).type != TokenType.EOF:
+            if token.type in BLOCK_OPENERS:
+                depth += 1
+            elif token.type in BLOCK_CLOSERS:
+                depth -= 1
+            if token.type == TokenType.LOCAL:
+                in_local = depth == 0
+            elif in_local:
+                if token.type in (TokenType.NAME, TokenType.FUNCTION):
+                    chunk_locals += 1
+                in_local = token.type in (
+                    TokenType.NAME,
+                    TokenType.COMMA,
+                    TokenType.LESS_THAN,
+                    TokenType.GREATER_THAN,
+                )
+            if token.type == TokenType.NAME:
+                assert isinstance(token.value, str)
+                used_names.add(token.value)
+            elif token.type == TokenType.STRING:
+                assert isinstance(token.value, str)
+                is_call: bool = bool(previous and previous.type in CALL_PREFIXES)
+                spelling, count, calls = strings.get(
+                    token.value, (self.token_text(token), 0, 0)
+                )
+                strings[token.value] = (spelling, count + 1, calls + is_call)
+            previous = token
+        names: Iterator[str] = generate_names(
+            used_names, self.letters, self.alphanumerics
+        )
+        name: str = next(names)
+        hoisted: List[Tuple[str, str]] = []
+        # the declaration has a fixed cost of "local=" and a separating space
+        total_saved: int = -7
+        for value, (spelling, count, calls) in sorted(
+            strings.items(), key=lambda i: -i[1][1] * len(i[1][0])
+        ):
+            # lua allows at most 200 locals per function
+            if len(hoisted) >= min(MAX_HOISTED_STRINGS, 199 - chunk_locals):
+                break
+            # replacing f"x" with f(a) needs parentheses, and the declaration
+            # costs the name, the spelling and two commas
+            saved: int = (
+                count * (len(spelling) - len(name))
+                - 2 * calls
+                - (len(name) + len(spelling) + 2)
+            )
+            if saved > 0:
+                hoisted.append((name, spelling))
+                self.hoisted[value] = name
+                total_saved += saved
+                name = next(names)
+        if total_saved <= 0:
+            self.hoisted = {}
+            return []
+        return hoisted
+
+    def write_comments(self, token: Token) -> None:
+        """Write the comments in front of a token that should be kept"""
+        assert self.keep_comments
+        for start, end in token.comments:
+            comment: str = self.text[start:end]
+            if self.keep_comments.search(comment):
+                self.write(comment)
+                # short comments end at the end of the line
+                if not LONG_COMMENT.match(comment):
+                    self.write("\n")
+
+    def fold_expression(
+        self, token: Token, tokens: TokenBuffer
+    ) -> Optional[Tuple[Expression, Token, Token]]:
+        """
+        Parse and fold the expression that starts at a token. Returns the folded
+        expression, its last token and the token after it, or None if nothing
+        could be folded. In that case, the token stream is rewound.
+        """
+        if token.start in self.unfoldable:
+            self.unfoldable.remove(token.start)
+            return None
+        tokens.mark(token)
+        parser: Parser = Parser(tokens)
+        try:
+            expression: Expression = parser.parse_expression()
+        except ParseError:
+            # errors of the lexer are raised, as they would be without folding
+            self.unfoldable.update(doomed_starts(tokens.tokens[: tokens.index]))
+            tokens.rewind()
+            return None
+        following: Token = parser.current
+        if following.type not in PREFIX_CONTINUATIONS and not (
+            # comments in between would be lost
+            self.keep_comments
+            and "--" in self.text[token.start : following.start]
+        ):
+            expression, replaced = fold(expression)
+            if replaced:
+                tokens.release()
+                assert parser.previous
+                return expression, parser.previous, following
+        tokens.rewind()
+        return None
+
+    def write_expression(self, expression: Expression) -> None:
+        for text, node in expression_tokens(expression):
+            if text is not None:
+                self.write(text)
+                continue
+            token: Optional[Token] = node.token
+            if isinstance(node, Variable):
+                renamed: bool = node.id in self.names
+                self.write(self.names.get(node.id, node.id), token, renamed)
+            elif isinstance(node, String) and node.value in self.hoisted:
+                self.write(self.hoisted[node.value], token)
+            elif isinstance(node, (Number, String)):
+                if token and token.start >= 0:
+                    self.write(self.token_text(token), token)
+                else:
+                    self.write(node.spelling())
+            elif isinstance(node, Vararg):
+                if node.truncated:
+                    self.write("(")
+                self.write("...", token)
+                if node.truncated:
+                    self.write(")")
+            elif isinstance(node, Boolean):
+                self.write("true" if node.value else "false", token)
+            else:
+                self.write("nil", token)
+
+    def minify(self, output: TextIO) -> None:
+        self.output = output
+        self.unfoldable.clear()
+        if self.compression_aware:
+            self.choose_spellings()
+        # only pay for trivia if comments are kept
+        lexer: Lexer = (
+            TriviaLexer(self.text) if self.keep_comments else Lexer(self.text)
+        )
+        # folding needs to look ahead, and go back if nothing could be folded
+        tokens: Union[Lexer, TokenBuffer] = (
+            TokenBuffer(lexer) if self.fold_constants else lexer
+        )
+        token: Token = tokens.get_next_token()
+        if self.keep_comments:
+            # keep license headers in front of the hoisted strings
+            self.write_comments(token)
+        if self.hoist_strings and (hoisted := self.find_hoisted_strings()):
+            self.write("local")
+            self.write(",".join(i[0] for i in hoisted))
+            self.write("=")
+            self.write(",".join(i[1] for i in hoisted))
+        # open brackets and blocks, to distinguish table keys from variables
+        stack: List[TokenType] = []
+        previous: Optional[Token] = None
+        while token.type != TokenType.EOF:
+            if (
+                self.fold_constants
+                and previous
+                and previous.type in FOLD_PREFIXES
+                and isinstance(tokens, TokenBuffer)
+                and (folded := self.fold_expression(token, tokens))
+            ):
+                expression, previous, token = folded
+                self.write_expression(expression)
+                if self.keep_comments and token.comments:
+                    self.write_comments(token)
+                continue
+            following: Token = tokens.get_next_token()
+            text: str = self.token_text(token)
+            renamed: bool = False
+            if (
+                token.type == TokenType.NAME
+                and text in self.names
+                and not (
+                    previous
+                    and previous.type in (TokenType.DOT, TokenType.COLON)
+                    or stack
+                    and stack[-1] == TokenType.L_CURL
+                    and previous
+                    and previous.type in KEY_PREFIXES
+                    and following.type == TokenType.ASSIGN
+                )
+            ):
+                text = self.names[text]
+                renamed = True
+            if token.type in BRACKETS or token.type in BLOCK_OPENERS:
+                stack.append(token.type)
+            elif token.type in CLOSING_BRACKETS or token.type in BLOCK_CLOSERS:
+                if stack:
+                    stack.pop()
+            if token.type == TokenType.STRING and token.value in self.hoisted:
+                assert isinstance(token.value, str)
+                if previous and previous.type in CALL_PREFIXES:
+                    self.write("(")
+                    self.write(self.hoisted[token.value], token)
+                    self.write(")")
+                else:
+                    self.write(self.hoisted[token.value], token)
+            else:
+                self.write(text, token, renamed)
+            if self.keep_comments and following.comments:
+                self.write_comments(following)
+            previous = token
+            token = following
+
+
+def minify(
+    text: str,
+    names: Optional[Dict[str, str]] = None,
+    hoist_strings: bool = False,
+    keep_comments: Optional[str] = None,
+    fold_constants: bool = False,
+    compression_aware: bool = False,
+) -> str:
+    output: StringIO = StringIO()
+    Minifier(
+        text,
+        names,
+        hoist_strings=hoist_strings,
+        keep_comments=keep_comments,
+        fold_constants=fold_constants,
+        compression_aware=compression_aware,
+    ).minify(output)
+    return output.getvalue()
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .lexer import Lexer
+from .Source import Source
+from .Token import Token, TokenType
+
+# texts below this size are always lexed serially
+MIN_PARALLEL_SIZE: int = 1 << 16
+TOKEN_TYPES: Tuple[TokenType, ...] = tuple(TokenType)
+TOKEN_TYPE_INDICES: Mapping[TokenType, int] = MappingProxyType(
+    {j: i for i, j in enumerate(TOKEN_TYPES)}
+)
+# whether this is a free-threaded build running without the GIL (3.13+)
+FREE_THREADED: bool = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# lexer and source of the text of a worker process, set by _init_worker
+_worker: Optional[Tuple[Lexer, Source]] = None
+
+
+class ChunkResult:
+    """
+    Tokens of one chunk, lexed speculatively from its first line on.
+
+    The tokens are stored as parallel arrays, as they are cheaper to send
+    between processes than Token objects.
+    """
+
+    def __init__(self, start: int, stop: int) -> None:
+        self.start: int = start
+        self.stop: int = stop
+        self.types: array[int] = array("B")
+        self.values: List[Any] = []
+        self.lines: array[int] = array("q")
+        self.columns: array[int] = array("q")
+        self.starts: array[int] = array("q")
+        self.ends: array[int] = array("q")
+        # start of the first token at or after stop
+        self.resume: int = -1
+        # whether lexing failed, which means the chunk began inside of a token
+        self.failed: bool = False
+        # whether the chunk began outside of any long bracket, string or comment,
+        # known after stitching
+        self.valid_start: Optional[bool] = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def append(self, token: Token) -> None:
+        self.types.append(TOKEN_TYPE_INDICES[token.type])
+        self.values.append(token.value)
+        self.lines.append(token.line)
+        self.columns.append(token.column)
+        self.starts.append(token.start)
+        self.ends.append(token.end)
+
+    def token(self, index: int) -> Token:
+        return Token(
+            TOKEN_TYPES[self.types[index]],
+            self.values[index],
+            self.lines[index],
+            self.columns[index],
+            self.starts[index],
+            self.ends[index],
+        )
+
+
+class TokenStream(Sequence[Token]):
+    """
+    Token stream of stitched chunks, which stays in the arrays of the chunks.
+
+    Token objects are only built when they are accessed, so stitching takes
+    time in the number of chunks and of tokens lexed again, instead of in the
+    number of all tokens.
+    """
+
+    def __init__(self) -> None:
+        # chunks or lists of tokens lexed again, their first index and the
+        # number of tokens taken from them
+        self.parts: List[Tuple[Union[ChunkResult, List[Token]], int, int]] = []
+        # index in the stream of the first token of each part
+        self.offsets: List[int] = []
+        self.length: int = 0
+
+    def append(
+        self, part: Union[ChunkResult, List[Token]], first: int, count: int
+    ) -> None:
+        """Append count tokens of a part, starting at its token first"""
+        if count > 0:
+            self.parts.append((part, first, count))
+            self.offsets.append(self.length)
+            self.length += count
+
+    def __len__(self) -> int:
+        return self.length
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Token]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Token, List[Token]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("token index out of range")
+        position: int = bisect_right(self.offsets, index) - 1
+        part, first, _ = self.parts[position]
+        index += first - self.offsets[position]
+        return part[index] if isinstance(part, list) else part.token(index)
+
+    def __iter__(self) -> Iterator[Token]:
+        for part, first, count in self.parts:
+            if isinstance(part, list):
+                yield from part[first : first + count]
+            else:
+                yield from map(part.token, range(first, first + count))
+
+
+def seek(lexer: Lexer, source: Source, pos: int) -> None:
+    """Move a lexer to a position, reproducing the line and column it would have"""
+    if pos >= lexer.text_len and pos > 0:
+        # at the end, the lexer keeps the position of the last character
+        lexer.seek(pos, *source.position(lexer.text_len - 1))
+    else:
+        lexer.seek(pos, *source.position(pos))
+
+
+def _init_worker(text: str) -> None:
+    global _worker
+    _worker = (Lexer(text), Source(text))
+
+
+def _lex_chunk(start: int, stop: int) -> ChunkResult:
+    assert _worker
+    lexer, source = _worker
+    result: ChunkResult = ChunkResult(start, stop)
+    seek(lexer, source, start)
+    try:
+        # errors are expected for chunks that begin inside of a token
+        with redirect_stderr(StringIO()):
+            while True:
+                token: Token = lexer.get_next_token()
+                if token.start >= stop or token.type == TokenType.EOF:
+                    result.resume = token.start
+                    break
+                result.append(token)
+    except (ValueError, AssertionError, TypeError):
+        result.failed = True
+    return result
+
+
+def split_text(text: str, chunks: int) -> List[int]:
+    """Boundaries of up to `chunks` chunks, each at the start of a line"""
+    boundaries: List[int] = [0]
+    size: int = len(text) // chunks
+    for i in range(1, chunks):
+        newline: int = text.find("\n", max(i * size, boundaries[-1]))
+        if newline < 0:
+            break
+        if newline + 1 < len(text):
+            boundaries.append(newline + 1)
+    boundaries.append(len(text))
+    return boundaries
+
+
+def _find_start(chunk: ChunkResult, start: int) -> int:
+    """Index of the token of a chunk that starts at an offset, or -1"""
+    if chunk.failed:
+        return -1
+    index: int = bisect_left(chunk.starts, start)
+    if index < len(chunk) and chunk.starts[index] == start:
+        return index
+    return -1
+
+
+def stitch(text: str, chunks: List[ChunkResult]) -> TokenStream:
+    """
+    Combine speculatively lexed chunks into the token stream of a serial Lexer.
+
+    Lexing is stateless at token boundaries, so tokens of a chunk are correct
+    from the first one that starts where the previous chunk actually ended.
+    Everything before that is lexed again.
+    """
+    lexer: Lexer = Lexer(text)
+    source: Source = Source(text)
+    tokens: TokenStream = TokenStream()
+    # start of the next token in the real token stream
+    resume: int = 0
+    for chunk in chunks:
+        if resume >= chunk.stop:
+            # the chunk is completely inside of a token of the previous one
+            chunk.valid_start = False
+            continue
+        index: int = _find_start(chunk, resume)
+        chunk.valid_start = index == 0
+        if index < 0:
+            # lex again until the tokens are in sync with the chunk
+            relexed: List[Token] = []
+            seek(lexer, source, resume)
+            while True:
+                token: Token = lexer.get_next_token()
+                if token.start >= chunk.stop or token.type == TokenType.EOF:
+                    break
+                if (index := _find_start(chunk, token.start)) >= 0:
+                    break
+                relexed.append(token)
+            tokens.append(relexed, 0, len(relexed))
+            if index < 0:
+                resume = token.start
+                continue
+        tokens.append(chunk, index, len(chunk) - index)
+        resume = chunk.resume
+    seek(lexer, source, tokens[-1].end if tokens else 0)
+    tokens.append([lexer.get_next_token()], 0, 1)
+    return tokens
+
+
+def lex_parallel(
+    text: str, processes: Optional[int] = None, chunks: Optional[int] = None
+) -> Sequence[Token]:
+    """
+    Lex a single (large) text in parallel processes, returning the same tokens
+    (including the final EOF token) as a serial Lexer. Tokens of parallel lexed
+    texts are built on access, see TokenStream.
+
+    The text is split into chunks at line starts, which are lexed assuming that
+    they don't begin inside of a long bracket, string or comment. Chunks where
+    this was wrong are lexed again while stitching. Small texts are lexed
+    serially, unless the number of chunks is given. With processes=0, all
+    chunks are lexed in this process, which is mainly useful for testing.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunks is None:
+        chunks = processes if len(text) >= MIN_PARALLEL_SIZE else 1
+    if chunks <= 1 or processes == 1:
+        lexer: Lexer = Lexer(text)
+        tokens: List[Token] = [lexer.get_next_token()]
+        while tokens[-1].type != TokenType.EOF:
+            tokens.append(lexer.get_next_token())
+        return tokens
+    boundaries: List[int] = split_text(text, chunks)
+    starts: List[int] = boundaries[:-1]
+    stops: List[int] = boundaries[1:]
+    results: List[ChunkResult]
+    if processes == 0:
+        _init_worker(text)
+        results = list(map(_lex_chunk, starts, stops))
+    else:
+        with ProcessPoolExecutor(
+            processes, initializer=_init_worker, initargs=(text,)
+        ) as pool:
+            results = list(pool.map(_lex_chunk, starts, stops))
+    return stitch(text, results)
+
+
+def lex_file(path: Union[str, Path], encoding: str = "utf-8") -> List[Token]:
+    """All tokens of a file, including the final EOF token"""
+    lexer: Lexer = Lexer(Path(path).read_text(encoding=encoding))
+    tokens: List[Token] = [lexer.get_next_token()]
+    while tokens[-1].type != TokenType.EOF:
+        tokens.append(lexer.get_next_token())
+    return tokens
+
+
+def lex_many(
+    paths: Iterable[Union[str, Path]],
+    threads: Optional[int] = None,
+    encoding: str = "utf-8",
+) -> List[List[Token]]:
+    """
+    Lex many files in a thread pool, returning their tokens in order of paths.
+
+    Lexers share no mutable state, and all tables of the lexer are immutable,
+    so they can run in parallel threads. That only pays off on free-threaded
+    builds, with the GIL threads just overlap reading files. By default, one
+    thread per core is used on free-threaded builds, and a single one otherwise.
+    The first error of any file is raised.
+    """
+    if threads is None:
+        threads = (os.cpu_count() or 1) if FREE_THREADED else 1
+    paths = list(paths)
+    if threads <= 1 or len(paths) <= 1:
+        return [lex_file(i, encoding) for i in paths]
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda i: lex_file(i, encoding), paths))
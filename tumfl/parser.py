@@ -0,0 +1,806 @@
+from __future__ import annotations
+
+import re
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .AST.Assign import Assign
+from .AST.ASTNode import ASTNode, TokenMode
+from .AST.BinOp import BinOp, BinaryOperator
+from .AST.Block import Block
+from .AST.Boolean import Boolean
+from .AST.Break import Break
+from .AST.Call import Call
+from .AST.Function import Function
+from .AST.FunctionDeclaration import FunctionDeclaration
+from .AST.GenericFor import GenericFor
+from .AST.Goto import Goto
+from .AST.If import If
+from .AST.Index import Index
+from .AST.Interner import Interner, LITERALS
+from .AST.Label import Label
+from .AST.Local import Local
+from .AST.LocalFunction import LocalFunction
+from .AST.MethodCall import MethodCall
+from .AST.Nil import Nil
+from .AST.Number import Number
+from .AST.NumericFor import NumericFor
+from .AST.Repeat import Repeat
+from .AST.Return import Return
+from .AST.String import String
+from .AST.Table import Table
+from .AST.TableField import TableField
+from .AST.UnOp import UnOp, UnaryOperator
+from .AST.Vararg import Vararg
+from .AST.Variable import Variable
+from .AST.While import While
+from .lexer import Lexer
+from .Token import Token, TokenType
+
+if TYPE_CHECKING:
+    from .AST.Compound import Expression, Statement
+
+T = TypeVar("T", bound=ASTNode)
+
+
+class ParseError(ValueError):
+    """A syntax error found by the parser, the lexer raises plain ValueErrors"""
+
+
+BINARY_OPERATORS: Dict[TokenType, BinaryOperator] = {
+    TokenType.OR: BinaryOperator.OR,
+    TokenType.AND: BinaryOperator.AND,
+    TokenType.LESS_THAN: BinaryOperator.LESS_THAN,
+    TokenType.GREATER_THAN: BinaryOperator.GREATER_THAN,
+    TokenType.LESS_EQUALS: BinaryOperator.LESS_EQUALS,
+    TokenType.GREATER_EQUALS: BinaryOperator.GREATER_EQUALS,
+    TokenType.NOT_EQUALS: BinaryOperator.NOT_EQUALS,
+    TokenType.EQUALS: BinaryOperator.EQUALS,
+    TokenType.BIT_OR: BinaryOperator.BIT_OR,
+    TokenType.BIT_XOR: BinaryOperator.BIT_XOR,
+    TokenType.BIT_AND: BinaryOperator.BIT_AND,
+    TokenType.BIT_SHIFT_LEFT: BinaryOperator.BIT_SHIFT_LEFT,
+    TokenType.BIT_SHIFT_RIGHT: BinaryOperator.BIT_SHIFT_RIGHT,
+    TokenType.CONCAT: BinaryOperator.CONCAT,
+    TokenType.PLUS: BinaryOperator.ADD,
+    TokenType.MINUS: BinaryOperator.SUBTRACT,
+    TokenType.MULT: BinaryOperator.MULT,
+    TokenType.DIVIDE: BinaryOperator.DIVIDE,
+    TokenType.INTEGER_DIVISION: BinaryOperator.INTEGER_DIVISION,
+    TokenType.MODULO: BinaryOperator.MODULO,
+    TokenType.EXPONENT: BinaryOperator.EXPONENT,
+}
+# line breaks in long strings, which lua reads as a single "\n"
+NEWLINES: Pattern[str] = re.compile("\r\n|\n\r|\r")
+UNARY_OPERATORS: Dict[TokenType, UnaryOperator] = {
+    TokenType.MINUS: UnaryOperator.NEGATE,
+    TokenType.NOT: UnaryOperator.NOT,
+    TokenType.HASH: UnaryOperator.LENGTH,
+    TokenType.BIT_NOT: UnaryOperator.BIT_NOT,
+}
+# left and right priority of binary operators, as in lparser.c. An operator
+# takes the operand on its left if its left priority is higher than the right
+# priority of the pending operator, so right associative operators have a lower
+# right priority.
+PRIORITIES: Dict[BinaryOperator, Tuple[int, int]] = {
+    BinaryOperator.OR: (1, 1),
+    BinaryOperator.AND: (2, 2),
+    BinaryOperator.LESS_THAN: (3, 3),
+    BinaryOperator.GREATER_THAN: (3, 3),
+    BinaryOperator.LESS_EQUALS: (3, 3),
+    BinaryOperator.GREATER_EQUALS: (3, 3),
+    BinaryOperator.NOT_EQUALS: (3, 3),
+    BinaryOperator.EQUALS: (3, 3),
+    BinaryOperator.BIT_OR: (4, 4),
+    BinaryOperator.BIT_XOR: (5, 5),
+    BinaryOperator.BIT_AND: (6, 6),
+    BinaryOperator.BIT_SHIFT_LEFT: (7, 7),
+    BinaryOperator.BIT_SHIFT_RIGHT: (7, 7),
+    BinaryOperator.CONCAT: (9, 8),
+    BinaryOperator.ADD: (10, 10),
+    BinaryOperator.SUBTRACT: (10, 10),
+    BinaryOperator.MULT: (11, 11),
+    BinaryOperator.DIVIDE: (11, 11),
+    BinaryOperator.INTEGER_DIVISION: (11, 11),
+    BinaryOperator.MODULO: (11, 11),
+    BinaryOperator.EXPONENT: (14, 13),
+}
+UNARY_PRIORITY: int = 12
+# finds the keywords that open and close blocks in skipped function bodies,
+# passing over comments, strings and long brackets. "if" is counted instead of
+# "then", as elseif has a "then" as well.
+BLOCK_KEYWORDS: Pattern[str] = re.compile(
+    r"--\[(=*)\[.*?\]\1\]|--[^\n]*|\[(=*)\[.*?\]\2\]"
+    r"|\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'"
+    r"|\b(function|if|do|repeat|end|until)\b",
+    re.DOTALL | re.ASCII,
+)
+# tokens that end a block without being part of it
+BLOCK_ENDS: Set[TokenType] = {
+    TokenType.END,
+    TokenType.ELSE,
+    TokenType.ELSEIF,
+    TokenType.UNTIL,
+    TokenType.EOF,
+}
+
+Operator = Union[BinaryOperator, UnaryOperator, None]
+
+
+class TokenBuffer:
+    """
+    Token stream over a lexer that can be rewound, for speculative parsing.
+
+    Tokens read after `mark` are kept until `release`, and `rewind` goes back
+    to the mark. Parse errors are not printed, as they are expected, but
+    errors of the lexer are.
+    """
+
+    def __init__(self, lexer: Lexer) -> None:
+        self.lexer: Lexer = lexer
+        self.text: str = lexer.text
+        self.tokens: List[Token] = []
+        self.index: int = 0
+        # number of tokens that were given to mark again
+        self.pending: int = 0
+        self.marked: bool = False
+
+    def report(
+        self, message: str, line: Optional[int] = None, column: Optional[int] = None
+    ) -> None:
+        pass
+
+    def get_next_token(self) -> Token:
+        if self.index < len(self.tokens):
+            token: Token = self.tokens[self.index]
+            self.index += 1
+            if not self.marked and self.index == len(self.tokens):
+                self.tokens.clear()
+                self.index = 0
+            return token
+        token = self.lexer.get_next_token()
+        if self.marked:
+            self.tokens.append(token)
+            self.index += 1
+        return token
+
+    def mark(self, *pending: Token) -> None:
+        """Start keeping tokens, the pending (already read) ones are read again"""
+        del self.tokens[: self.index]
+        self.tokens[0:0] = pending
+        self.index = 0
+        self.pending = len(pending)
+        self.marked = True
+
+    def rewind(self) -> None:
+        """Go back to the mark, behind the pending tokens"""
+        self.index = self.pending
+        self.marked = False
+        if self.index == len(self.tokens):
+            self.tokens.clear()
+            self.index = 0
+
+    def release(self) -> None:
+        """Drop the tokens that were read since the mark"""
+        del self.tokens[: self.index]
+        self.index = 0
+        self.marked = False
+
+
+class Parser:
+    """
+    Operator precedence parser for lua expressions.
+
+    Instead of recursing for every operator and parenthesis, pending operators
+    and operands are kept on explicit stacks, so long chains like a .. b .. c
+    and deeply nested expressions are parsed in linear time and without
+    hitting the recursion limit. Supported primary expressions are literals,
+    nil, varargs, names and parenthesized expressions (ChunkParser adds the
+    rest of lua); parsing stops in front of the first token that can't
+    continue the expression.
+
+    With an interner, equal literals are shared (see Interner), which keeps
+    no tokens for them regardless of the mode.
+    """
+
+    def __init__(
+        self,
+        lexer: Union[Lexer, TokenBuffer],
+        mode: TokenMode = TokenMode.TOKEN,
+        interner: Optional[Interner] = None,
+    ) -> None:
+        self.lexer: Union[Lexer, TokenBuffer] = lexer
+        self.mode: TokenMode = mode
+        self.interner: Optional[Interner] = interner
+        self.current: Token = lexer.get_next_token()
+        # the last token of the parsed expression
+        self.previous: Optional[Token] = None
+
+    def error(self, message: str, token: Token) -> None:
+        self.lexer.report(message, token.line, token.column)
+        raise ParseError(message)
+
+    def advance(self) -> Token:
+        """Move to the next token, returns the previous one"""
+        token: Token = self.current
+        self.previous = token
+        self.current = self.lexer.get_next_token()
+        return token
+
+    def parse_primary(self) -> Expression:
+        token: Token = self.advance()
+        if token.type in LITERALS:
+            literal: Expression = self.parse_literal(token)
+            return (
+                self.interner.intern(literal) if self.interner is not None else literal
+            )
+        if token.type == TokenType.NIL:
+            return Nil.from_token(token, self.mode)
+        if token.type == TokenType.ELLIPSIS:
+            return Vararg.from_token(token, self.mode)
+        if token.type == TokenType.NAME:
+            return Variable.from_token(token, self.mode)
+        self.error(f"unexpected {token.type.value}, expected an expression", token)
+        raise AssertionError("unreachable")
+
+    def parse_literal(self, token: Token) -> Expression:
+        """A number, string or boolean"""
+        if token.type == TokenType.NUMBER:
+            number: Number = Number.from_token(token, self.mode)
+            if number.fractional_part is None and token.start >= 0:
+                # "1." is a float, but the lexer doesn't keep the empty fraction
+                if "." in self.lexer.text[token.start : token.end]:
+                    number.fractional_part = ""
+            return number
+        if token.type == TokenType.STRING:
+            string: String = String.from_token(token, self.mode)
+            if token.start >= 0 and self.lexer.text[token.start] == "[":
+                # the lexer keeps long strings verbatim, lua normalizes newlines
+                # and skips the first one
+                value: str = NEWLINES.sub("\n", string.value)
+                string.value = value[1:] if value.startswith("\n") else value
+            return string
+        return Boolean.from_token(token, self.mode)
+
+    def parse_suffixes(self, expression: Expression) -> Expression:
+        """Indexing and calls after a prefix expression, which are not supported"""
+        return expression
+
+    def _reduce(
+        self,
+        operands: List[Expression],
+        operators: List[Tuple[Operator, int, Token]],
+    ) -> None:
+        """Apply the operator on top of the stack to its operands"""
+        op, _, token = operators.pop()
+        node: Union[UnOp, BinOp]
+        if isinstance(op, UnaryOperator):
+            operand: Expression = operands.pop()
+            node = UnOp(token, op, operand)
+            operand.parent_class = node
+        else:
+            assert op is not None
+            right: Expression = operands.pop()
+            left: Expression = operands.pop()
+            node = BinOp(token, left, op, right)
+            left.parent_class = node
+            right.parent_class = node
+        operands.append(node._with_mode(token, self.mode))
+
+    def parse_expression(self) -> Expression:
+        """Parse an expression starting at the current token"""
+        operands: List[Expression] = []
+        # operator (None for an open parenthesis), its right priority and token
+        operators: List[Tuple[Operator, int, Token]] = []
+        # number of open parentheses
+        depth: int = 0
+        while True:
+            # prefix position: unary operators and open parentheses
+            token: Token = self.current
+            if unary := UNARY_OPERATORS.get(token.type):
+                operators.append((unary, UNARY_PRIORITY, self.advance()))
+                continue
+            if token.type == TokenType.L_PAREN:
+                operators.append((None, 0, self.advance()))
+                depth += 1
+                continue
+            operands.append(self.parse_primary())
+            # closing parentheses directly after an operand
+            while depth and self.current.type == TokenType.R_PAREN:
+                while operators[-1][0] is not None:
+                    self._reduce(operands, operators)
+                operators.pop()
+                depth -= 1
+                self.advance()
+                if isinstance(operands[-1], (Vararg, Call, MethodCall)):
+                    operands[-1].truncated = True
+                operands[-1] = self.parse_suffixes(operands[-1])
+            binary: Optional[BinaryOperator] = BINARY_OPERATORS.get(self.current.type)
+            if binary is None:
+                break
+            left, right = PRIORITIES[binary]
+            # reduce pending operators that bind at least as tightly
+            while (
+                operators and operators[-1][0] is not None and operators[-1][1] >= left
+            ):
+                self._reduce(operands, operators)
+            operators.append((binary, right, self.advance()))
+        if depth:
+            self.error("unclosed parenthesis", self.current)
+        while operators:
+            self._reduce(operands, operators)
+        assert len(operands) == 1
+        return operands[0]
+
+
+def parse_expression(
+    text: str, mode: TokenMode = TokenMode.TOKEN, interner: Optional[Interner] = None
+) -> Expression:
+    """Parse a text that consists of a single expression"""
+    parser: Parser = Parser(Lexer(text), mode, interner)
+    expression: Expression = parser.parse_expression()
+    if parser.current.type != TokenType.EOF:
+        parser.error(f"unexpected {parser.current.type.value}", parser.current)
+    return expression
+
+
+class ChunkParser(Parser):
+    """
+    Recursive descent parser for whole chunks, using the operator precedence
+    parser for expressions.
+
+    With lazy, function bodies are skipped by balancing block keywords on the
+    token level, and only parsed when they are accessed (see Function.deferred).
+    Passes that don't descend into functions never pay for their bodies, but
+    syntax errors inside of them are only raised when they are loaded.
+    """
+
+    def __init__(
+        self,
+        lexer: Lexer,
+        mode: TokenMode = TokenMode.TOKEN,
+        lazy: bool = False,
+        interner: Optional[Interner] = None,
+    ) -> None:
+        super().__init__(lexer, mode, interner)
+        # skipping function bodies seeks, so there is no TokenBuffer here
+        self.lexer: Lexer = lexer
+        self.lazy: bool = lazy
+
+    def expect(self, kind: TokenType) -> Token:
+        """Consume a token of the given type"""
+        if self.current.type != kind:
+            self.error(
+                f"expected {kind.value}, got {self.current.type.value}", self.current
+            )
+        return self.advance()
+
+    def accept(self, kind: TokenType) -> Optional[Token]:
+        """Consume a token if it has the given type"""
+        if self.current.type != kind:
+            return None
+        return self.advance()
+
+    def _adopt(self, node: T, token: Token) -> T:
+        """Set the parent of all direct children, and drop the token by the mode"""
+        # vars instead of children, which would load deferred function bodies
+        attributes: Dict[str, Any] = vars(node)
+        for name in node.fields():
+            value: Any = attributes.get(name)
+            if isinstance(value, ASTNode):
+                value.parent_class = node
+            elif isinstance(value, list):
+                for i in value:
+                    if isinstance(i, ASTNode):
+                        i.parent_class = node
+        return node._with_mode(token, self.mode)
+
+    def parse_name(self) -> Variable:
+        return Variable.from_token(self.expect(TokenType.NAME), self.mode)
+
+    def parse_primary(self) -> Expression:
+        token: Token = self.current
+        if token.type == TokenType.NAME:
+            self.advance()
+            return self.parse_suffixes(Variable.from_token(token, self.mode))
+        if token.type == TokenType.L_CURL:
+            return self.parse_table()
+        if token.type == TokenType.FUNCTION:
+            self.advance()
+            return self.parse_function(token)
+        return super().parse_primary()
+
+    def parse_prefix_expression(self) -> Expression:
+        """A name or parenthesized expression, with indexing and calls"""
+        token: Token = self.current
+        if token.type == TokenType.NAME:
+            self.advance()
+            return self.parse_suffixes(Variable.from_token(token, self.mode))
+        if token.type != TokenType.L_PAREN:
+            self.error(f"unexpected {token.type.value}", token)
+        self.advance()
+        expression: Expression = self.parse_expression()
+        self.expect(TokenType.R_PAREN)
+        if isinstance(expression, (Vararg, Call, MethodCall)):
+            expression.truncated = True
+        return self.parse_suffixes(expression)
+
+    def parse_suffixes(self, expression: Expression) -> Expression:
+        while True:
+            token: Token = self.current
+            if token.type == TokenType.DOT:
+                self.advance()
+                key: Expression = self.parse_key(self.expect(TokenType.NAME))
+                expression = self._adopt(Index(token, expression, key), token)
+            elif token.type == TokenType.L_BRACKET:
+                self.advance()
+                index: Expression = self.parse_expression()
+                self.expect(TokenType.R_BRACKET)
+                expression = self._adopt(Index(token, expression, index), token)
+            elif (
+                token.type == TokenType.COLON
+                # "::" starts a label, the lexer has no token for it
+                and not self.lexer.text.startswith("::", token.start)
+            ):
+                self.advance()
+                method: Token = self.expect(TokenType.NAME)
+                assert isinstance(method.value, str)
+                expression = self._adopt(
+                    MethodCall(token, expression, method.value, self.parse_arguments()),
+                    token,
+                )
+            elif token.type in (
+                TokenType.L_PAREN,
+                TokenType.L_CURL,
+                TokenType.STRING,
+            ):
+                expression = self._adopt(
+                    Call(token, expression, self.parse_arguments()), token
+                )
+            else:
+                return expression
+
+    def parse_key(self, name: Token) -> Expression:
+        """The string key of a name in a.name or {name = value}"""
+        assert isinstance(name.value, str)
+        key: String = String(name, name.value)._with_mode(name, self.mode)
+        return self.interner.intern(key) if self.interner is not None else key
+
+    def parse_arguments(self) -> List[Expression]:
+        """Arguments of a call: (a, b), a string or a table"""
+        if self.current.type == TokenType.STRING:
+            return [super().parse_primary()]
+        if self.current.type == TokenType.L_CURL:
+            return [self.parse_table()]
+        self.expect(TokenType.L_PAREN)
+        if self.current.type == TokenType.R_PAREN:
+            self.advance()
+            return []
+        arguments: List[Expression] = self.parse_expression_list()
+        self.expect(TokenType.R_PAREN)
+        return arguments
+
+    def parse_expression_list(self) -> List[Expression]:
+        expressions: List[Expression] = [self.parse_expression()]
+        while self.current.type == TokenType.COMMA:
+            self.advance()
+            expressions.append(self.parse_expression())
+        return expressions
+
+    def parse_table(self) -> Table:
+        token: Token = self.expect(TokenType.L_CURL)
+        entries: List[TableField] = []
+        while self.current.type != TokenType.R_CURL:
+            start: Token = self.current
+            key: Optional[Expression] = None
+            if start.type == TokenType.L_BRACKET:
+                self.advance()
+                key = self.parse_expression()
+                self.expect(TokenType.R_BRACKET)
+                self.expect(TokenType.ASSIGN)
+            value: Expression = self.parse_expression()
+            if (
+                key is None
+                and start.type == TokenType.NAME
+                and isinstance(value, Variable)
+                and self.current.type == TokenType.ASSIGN
+            ):
+                # name = value
+                self.advance()
+                key = self.parse_key(start)
+                value = self.parse_expression()
+            entries.append(self._adopt(TableField(start, key, value), start))
+            if self.current.type not in (TokenType.COMMA, TokenType.SEMICOLON):
+                break
+            self.advance()
+        self.expect(TokenType.R_CURL)
+        return self._adopt(Table(token, entries), token)
+
+    def parse_function(self, token: Token) -> Function:
+        """Parameters and body of a function, from the opening parenthesis on"""
+        self.expect(TokenType.L_PAREN)
+        parameters: List[Variable] = []
+        variadic: bool = False
+        if self.current.type != TokenType.R_PAREN:
+            while True:
+                if self.current.type == TokenType.ELLIPSIS:
+                    self.advance()
+                    variadic = True
+                    break
+                parameters.append(self.parse_name())
+                if self.current.type != TokenType.COMMA:
+                    break
+                self.advance()
+        self.expect(TokenType.R_PAREN)
+        if self.lazy:
+            load: Callable[[], Block] = self.skip_body()
+            return self._adopt(
+                Function.deferred(token, parameters, variadic, load), token
+            )
+        body: Block = self.parse_block()
+        self.expect(TokenType.END)
+        return self._adopt(Function(token, parameters, variadic, body), token)
+
+    def skip_body(self) -> Callable[[], Block]:
+        """
+        Skip a function body including its end, by counting block keywords in
+        the text instead of lexing it. Returns a loader that parses the body
+        from its first token.
+        """
+        start: Token = self.current
+        text: str = self.lexer.text
+        depth: int = 1
+        for match in BLOCK_KEYWORDS.finditer(text, start.start):
+            keyword: Optional[str] = match.group(3)
+            if keyword is None:
+                continue
+            if keyword != "end" and keyword != "until":
+                depth += 1
+                continue
+            depth -= 1
+            if depth:
+                continue
+            if keyword != "end":
+                self.error("expected end, got until", start)
+            # continue behind the end, at the position the lexer would have
+            end: int = match.start(3)
+            line: int = start.line + text.count("\n", start.start, end)
+            newline: int = text.rfind("\n", start.start, end)
+            column: int = (
+                end - newline if newline >= 0 else start.column + end - start.start
+            )
+            self.previous = Token(TokenType.END, "end", line, column, end, end + 3)
+            if text.startswith("\n", end + 3):
+                # a newline belongs to the line it starts
+                self.lexer.seek(end + 3, line + 1, 0)
+            else:
+                self.lexer.seek(end + 3, line, column + 3)
+            self.current = self.lexer.get_next_token()
+            return partial(_load_body, text, start, self.mode, self.interner)
+        self.error("function body never closed", start)
+        raise AssertionError("unreachable")
+
+    def parse_block(self) -> Block:
+        """Statements up to the end of the block, which is not consumed"""
+        token: Token = self.current
+        statements: List[Statement] = []
+        while self.current.type not in BLOCK_ENDS:
+            if self.current.type == TokenType.RETURN:
+                # return is always the last statement
+                statements.append(self.parse_return())
+                break
+            statement: Optional[Statement] = self.parse_statement()
+            if statement is not None:
+                statements.append(statement)
+        return self._adopt(Block(token, statements), token)
+
+    def parse_return(self) -> Return:
+        token: Token = self.expect(TokenType.RETURN)
+        values: List[Expression] = []
+        if self.current.type not in BLOCK_ENDS | {TokenType.SEMICOLON}:
+            values = self.parse_expression_list()
+        if self.current.type == TokenType.SEMICOLON:
+            self.advance()
+        return self._adopt(Return(token, values), token)
+
+    def parse_statement(self) -> Optional[Statement]:
+        """A single statement, or None for an empty one"""
+        token: Token = self.current
+        kind: TokenType = token.type
+        if kind == TokenType.SEMICOLON:
+            self.advance()
+            return None
+        if kind == TokenType.COLON:
+            # a label as in ::name::
+            self.advance()
+            self.expect(TokenType.COLON)
+            name: Token = self.expect(TokenType.NAME)
+            self.expect(TokenType.COLON)
+            self.expect(TokenType.COLON)
+            assert isinstance(name.value, str)
+            return Label(token, name.value)._with_mode(token, self.mode)
+        if kind == TokenType.BREAK:
+            return Break.from_token(self.advance(), self.mode)
+        if kind == TokenType.GOTO:
+            self.advance()
+            label: Token = self.expect(TokenType.NAME)
+            assert isinstance(label.value, str)
+            return Goto(token, label.value)._with_mode(token, self.mode)
+        if kind == TokenType.DO:
+            self.advance()
+            block: Block = self.parse_block()
+            self.expect(TokenType.END)
+            return block
+        if kind == TokenType.WHILE:
+            self.advance()
+            test: Expression = self.parse_expression()
+            self.expect(TokenType.DO)
+            body: Block = self.parse_block()
+            self.expect(TokenType.END)
+            return self._adopt(While(token, test, body), token)
+        if kind == TokenType.REPEAT:
+            self.advance()
+            body = self.parse_block()
+            self.expect(TokenType.UNTIL)
+            return self._adopt(Repeat(token, body, self.parse_expression()), token)
+        if kind == TokenType.IF:
+            return self.parse_if()
+        if kind == TokenType.FOR:
+            return self.parse_for()
+        if kind == TokenType.FUNCTION:
+            self.advance()
+            target: Expression = self.parse_name()
+            while self.current.type == TokenType.DOT:
+                dot: Token = self.advance()
+                field: Token = self.expect(TokenType.NAME)
+                assert isinstance(field.value, str)
+                key: String = String(field, field.value)._with_mode(field, self.mode)
+                target = self._adopt(Index(dot, target, key), dot)
+            method: Optional[str] = None
+            if self.current.type == TokenType.COLON:
+                self.advance()
+                method_name: Token = self.expect(TokenType.NAME)
+                assert isinstance(method_name.value, str)
+                method = method_name.value
+            function: Function = self.parse_function(token)
+            return self._adopt(
+                FunctionDeclaration(token, target, method, function), token
+            )
+        if kind == TokenType.LOCAL:
+            return self.parse_local()
+        return self.parse_expression_statement()
+
+    def parse_if(self) -> If:
+        """An if statement, with elseif chains built without recursion"""
+        branches: List[Tuple[Token, Expression, Block]] = []
+        orelse: Optional[Union[If, Block]] = None
+        while True:
+            token: Token = self.advance()
+            test: Expression = self.parse_expression()
+            self.expect(TokenType.THEN)
+            branches.append((token, test, self.parse_block()))
+            if self.current.type == TokenType.ELSEIF:
+                continue
+            if self.current.type == TokenType.ELSE:
+                self.advance()
+                orelse = self.parse_block()
+            self.expect(TokenType.END)
+            break
+        for token, test, body in reversed(branches):
+            orelse = self._adopt(If(token, test, body, orelse), token)
+        assert isinstance(orelse, If)
+        return orelse
+
+    def parse_for(self) -> Union[NumericFor, GenericFor]:
+        token: Token = self.expect(TokenType.FOR)
+        first: Variable = self.parse_name()
+        node: Union[NumericFor, GenericFor]
+        if self.accept(TokenType.ASSIGN):
+            start: Expression = self.parse_expression()
+            self.expect(TokenType.COMMA)
+            stop: Expression = self.parse_expression()
+            step: Optional[Expression] = None
+            if self.accept(TokenType.COMMA):
+                step = self.parse_expression()
+            self.expect(TokenType.DO)
+            node = NumericFor(token, first, start, stop, step, self.parse_block())
+        else:
+            names: List[Variable] = [first]
+            while self.current.type == TokenType.COMMA:
+                self.advance()
+                names.append(self.parse_name())
+            self.expect(TokenType.IN)
+            iterators: List[Expression] = self.parse_expression_list()
+            self.expect(TokenType.DO)
+            node = GenericFor(token, names, iterators, self.parse_block())
+        self.expect(TokenType.END)
+        return self._adopt(node, token)
+
+    def parse_local(self) -> Union[Local, LocalFunction]:
+        token: Token = self.expect(TokenType.LOCAL)
+        if self.current.type == TokenType.FUNCTION:
+            self.advance()
+            variable: Variable = self.parse_name()
+            function: Function = self.parse_function(token)
+            return self._adopt(LocalFunction(token, variable, function), token)
+        names: List[Variable] = []
+        attributes: List[Optional[str]] = []
+        while True:
+            names.append(self.parse_name())
+            attribute: Optional[str] = None
+            if self.current.type == TokenType.LESS_THAN:
+                self.advance()
+                attribute_token: Token = self.expect(TokenType.NAME)
+                assert isinstance(attribute_token.value, str)
+                attribute = attribute_token.value
+                self.expect(TokenType.GREATER_THAN)
+            attributes.append(attribute)
+            if self.current.type != TokenType.COMMA:
+                break
+            self.advance()
+        values: List[Expression] = []
+        if self.current.type == TokenType.ASSIGN:
+            self.advance()
+            values = self.parse_expression_list()
+        return self._adopt(Local(token, names, attributes, values), token)
+
+    def parse_expression_statement(self) -> Statement:
+        """An assignment or a call"""
+        token: Token = self.current
+        targets: List[Expression] = [self.parse_prefix_expression()]
+        if self.current.type in (TokenType.ASSIGN, TokenType.COMMA):
+            while self.current.type == TokenType.COMMA:
+                self.advance()
+                targets.append(self.parse_prefix_expression())
+            for target in targets:
+                if not isinstance(target, (Variable, Index)):
+                    self.error("cannot assign to this expression", token)
+            self.expect(TokenType.ASSIGN)
+            values: List[Expression] = self.parse_expression_list()
+            return self._adopt(Assign(token, targets, values), token)
+        statement: Expression = targets[0]
+        if not isinstance(statement, (Call, MethodCall)) or statement.truncated:
+            self.error("syntax error, expected a statement", token)
+        assert isinstance(statement, (Call, MethodCall))
+        return statement
+
+    def parse_chunk(self) -> Block:
+        """All statements up to the end of the text"""
+        chunk: Block = self.parse_block()
+        self.expect(TokenType.EOF)
+        return chunk
+
+
+def _load_body(
+    text: str, start: Token, mode: TokenMode, interner: Optional[Interner]
+) -> Block:
+    """Parse a skipped function body, starting at its first token"""
+    lexer: Lexer = Lexer(text)
+    lexer.seek(start.start, start.line, start.column)
+    # functions inside of the body are deferred as well
+    parser: ChunkParser = ChunkParser(lexer, mode, lazy=True, interner=interner)
+    body: Block = parser.parse_block()
+    parser.expect(TokenType.END)
+    return body
+
+
+def parse_chunk(
+    text: str,
+    mode: TokenMode = TokenMode.TOKEN,
+    lazy: bool = False,
+    interner: Optional[Interner] = None,
+) -> Block:
+    """Parse a whole lua file, see ChunkParser"""
+    return ChunkParser(Lexer(text), mode, lazy, interner).parse_chunk()
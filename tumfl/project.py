@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+
+from .compression import FileSizes
+from .lexer import Lexer
+from .minifier import Minifier
+from .Token import Token, TokenType
+
+MANIFEST_NAME: str = ".tumfl-manifest.json"
+MANIFEST_VERSION: int = 1
+
+
+def find_requires(text: str) -> List[str]:
+    """All module names of require("...") and require "..." calls, in order"""
+    lexer: Lexer = Lexer(text)
+    result: List[str] = []
+    # the two tokens in front of the current one
+    first: Optional[Token] = None
+    second: Optional[Token] = None
+    while (token := lexer.get_next_token()).type != TokenType.EOF:
+        if token.type == TokenType.STRING and (
+            (
+                second is not None
+                and second.type == TokenType.NAME
+                and second.value == "require"
+            )
+            or (
+                first is not None
+                and second is not None
+                and second.type == TokenType.L_PAREN
+                and first.type == TokenType.NAME
+                and first.value == "require"
+            )
+        ):
+            assert isinstance(token.value, str)
+            result.append(token.value)
+        first, second = second, token
+    return result
+
+
+def file_hash(content: Union[Path, bytes]) -> str:
+    """Hash of the content of a file, or of a file at a path"""
+    if isinstance(content, Path):
+        content = content.read_bytes()
+    return hashlib.sha256(content).hexdigest()
+
+
+def decode_source(content: bytes) -> str:
+    """Decode a lua file, translating newlines like Path.read_text"""
+    return content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+class BuildResult:
+    def __init__(self) -> None:
+        # relative paths (with forward slashes) of all files that were written
+        self.built: List[str] = []
+        # relative paths of all files that were removed from the output
+        self.removed: List[str] = []
+        # number of files that were up to date
+        self.unchanged: int = 0
+        # error messages of the files that could not be built, by relative path
+        self.errors: Dict[str, str] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"BuildResult(built={self.built!r}, removed={self.removed!r}, "
+            f"unchanged={self.unchanged!r}, errors={self.errors!r})"
+        )
+
+
+class Project:
+    """
+    Incremental minification of a whole mod directory into an output directory.
+
+    A manifest in the output directory stores size, modification time and
+    content hash of every source file, together with the files it requires.
+    Only new or changed files are read, lexed and minified again, outputs of
+    deleted files are removed. With cross_file (for passes that look at more than
+    one file), files that transitively require a changed or deleted file are
+    rebuilt as well. Non-lua files are copied. With compression_aware, the files
+    are minified to compress well in the zip archive of the mod.
+
+    If the manifest is missing its outputs are unknown, so when one was discarded
+    (by a change of options or format), all files in the output directory
+    without a source are removed. Files that fail to lex are reported in the
+    BuildResult, have no output and are tried again by the next build.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        output: Path,
+        cross_file: bool = False,
+        hoist_strings: bool = False,
+        manifest: Optional[Path] = None,
+        compression_aware: bool = False,
+    ) -> None:
+        self.root: Path = root
+        self.output: Path = output
+        self.cross_file: bool = cross_file
+        self.hoist_strings: bool = hoist_strings
+        self.compression_aware: bool = compression_aware
+        self.manifest_path: Path = manifest or output / MANIFEST_NAME
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        # whether an existing manifest was discarded by load_manifest
+        self.invalidated: bool = False
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Build options, a change invalidates all outputs"""
+        return {
+            "hoist_strings": self.hoist_strings,
+            "compression_aware": self.compression_aware,
+        }
+
+    def load_manifest(self) -> None:
+        self.manifest = {}
+        self.invalidated = False
+        if not self.manifest_path.is_file():
+            return
+        self.invalidated = True
+        try:
+            content: Dict[str, Any] = json.loads(self.manifest_path.read_text())
+        except ValueError:
+            return
+        if (
+            content.get("version") == MANIFEST_VERSION
+            and content.get("options") == self.options
+        ):
+            self.manifest = content["files"]
+            self.invalidated = False
+
+    def save_manifest(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        content: Dict[str, Any] = {
+            "version": MANIFEST_VERSION,
+            "options": self.options,
+            "files": self.manifest,
+        }
+        self.manifest_path.write_text(json.dumps(content, indent=1, sort_keys=True))
+
+    def source_files(self) -> Iterator[str]:
+        """Relative paths of all files in the mod, skipping the output directory"""
+        output: Path = self.output.resolve()
+        for directory, directories, files in os.walk(self.root):
+            current: Path = Path(directory)
+            directories[:] = sorted(
+                i
+                for i in directories
+                if not i.startswith(".") and (current / i).resolve() != output
+            )
+            for file in sorted(files):
+                path: Path = current / file
+                if path.resolve() != self.manifest_path.resolve():
+                    yield path.relative_to(self.root).as_posix()
+
+    def output_files(self) -> Iterator[str]:
+        """Relative paths of all files in the output directory, but the manifest"""
+        for directory, _, files in os.walk(self.output):
+            for file in sorted(files):
+                path: Path = Path(directory) / file
+                if path.resolve() != self.manifest_path.resolve():
+                    yield path.relative_to(self.output).as_posix()
+
+    def remove_output(self, name: str) -> None:
+        target: Path = self.output / name
+        if target.is_file():
+            target.unlink()
+
+    def fail(self, name: str, error: ValueError, result: BuildResult) -> None:
+        """Record a file that can't be built, so that the next build tries again"""
+        result.errors[name] = str(error)
+        self.manifest.pop(name, None)
+        # an old output would not match the source anymore
+        self.remove_output(name)
+
+    def resolve(self, module: str, requiring: str, files: Set[str]) -> Optional[str]:
+        """Find the file for a module name, relative to the requiring file or root"""
+        # factorio style "__mod-name__/path/to/file"
+        if module.startswith("__") and "__/" in module:
+            module = module[module.index("__/") + 3 :]
+        if module.endswith(".lua"):
+            module = module[:-4]
+        if "/" not in module:
+            module = module.replace(".", "/")
+        candidates: List[str] = [module + ".lua"]
+        if directory := requiring.rpartition("/")[0]:
+            candidates.insert(0, f"{directory}/{module}.lua")
+        for candidate in candidates:
+            if candidate in files:
+                return candidate
+        return None
+
+    def build_file(self, name: str, text: Optional[str] = None) -> None:
+        """Build a single file, with the text of a lua source if already read"""
+        source: Path = self.root / name
+        target: Path = self.output / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not name.endswith(".lua"):
+            shutil.copyfile(source, target)
+            return
+        if text is None:
+            text = decode_source(source.read_bytes())
+        with open(target, "w", encoding="utf-8") as output:
+            Minifier(
+                text,
+                hoist_strings=self.hoist_strings,
+                compression_aware=self.compression_aware,
+            ).minify(output)
+
+    def build(self) -> BuildResult:
+        result: BuildResult = BuildResult()
+        self.load_manifest()
+        files: List[str] = list(self.source_files())
+        file_set: Set[str] = set(files)
+        changed: Set[str] = set()
+        # text of changed lua files, which are read only once
+        texts: Dict[str, str] = {}
+        for name in files:
+            stat: os.stat_result = (self.root / name).stat()
+            entry: Optional[Dict[str, Any]] = self.manifest.get(name)
+            if (
+                entry
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime_ns
+                and (self.output / name).is_file()
+            ):
+                continue
+            content: bytes = (self.root / name).read_bytes()
+            digest: str = file_hash(content)
+            if entry and entry["hash"] == digest and (self.output / name).is_file():
+                # only touched
+                entry["size"] = stat.st_size
+                entry["mtime"] = stat.st_mtime_ns
+                continue
+            requires: List[str] = []
+            if name.endswith(".lua"):
+                try:
+                    texts[name] = decode_source(content)
+                    requires = find_requires(texts[name])
+                except ValueError as error:
+                    self.fail(name, error, result)
+                    continue
+            changed.add(name)
+            self.manifest[name] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "hash": digest,
+                "requires": requires,
+            }
+        # remove outputs of deleted files
+        deleted: Set[str] = set(self.manifest) - file_set
+        if self.invalidated and self.output.is_dir():
+            deleted.update(i for i in self.output_files() if i not in file_set)
+        for name in sorted(deleted):
+            self.manifest.pop(name, None)
+            self.remove_output(name)
+            result.removed.append(name)
+        rebuild: Set[str] = set(changed)
+        if self.cross_file and (changed or result.removed):
+            # deleted files count as changed for the files requiring them
+            known: Set[str] = file_set | set(result.removed)
+            dependents: Dict[str, Set[str]] = {}
+            for name in files:
+                if name not in self.manifest:
+                    continue
+                for module in self.manifest[name]["requires"]:
+                    if dependency := self.resolve(module, name, known):
+                        dependents.setdefault(dependency, set()).add(name)
+            stack: List[str] = [*changed, *result.removed]
+            while stack:
+                for dependent in dependents.get(stack.pop(), ()):
+                    if dependent not in rebuild:
+                        rebuild.add(dependent)
+                        stack.append(dependent)
+        for name in files:
+            if name in rebuild:
+                try:
+                    self.build_file(name, texts.get(name))
+                except ValueError as error:
+                    self.fail(name, error, result)
+                    continue
+                result.built.append(name)
+            elif name not in result.errors:
+                result.unchanged += 1
+        self.save_manifest()
+        return result
+
+    def report(self) -> List[FileSizes]:
+        """Raw and compressed sizes of all built lua files and their sources"""
+        return [
+            FileSizes(
+                name,
+                (self.root / name).read_bytes(),
+                (self.output / name).read_bytes(),
+            )
+            for name in sorted(self.manifest)
+            if name.endswith(".lua") and (self.output / name).is_file()
+        ]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional, TextIO
+
+BASE64: str = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def encode_vlq(value: int) -> str:
+    """Encode a single signed integer as base64 VLQ"""
+    vlq: int = (-value << 1) | 1 if value < 0 else value << 1
+    result: str = ""
+    while True:
+        digit: int = vlq & 31
+        vlq >>= 5
+        if vlq:
+            # continuation bit
+            digit |= 32
+        result += BASE64[digit]
+        if not vlq:
+            return result
+
+
+# deltas between segments are almost always small, so encode those only once
+_VLQ_CACHE: Dict[int, str] = {i: encode_vlq(i) for i in range(-4096, 4096)}
+
+
+def decode_vlq(text: str) -> List[int]:
+    """Decode a sequence of base64 VLQ integers (one segment)"""
+    result: List[int] = []
+    value: int = 0
+    shift: int = 0
+    for char in text:
+        digit: int = BASE64.index(char)
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        result.append(-(value >> 1) if value & 1 else value >> 1)
+        value = 0
+        shift = 0
+    return result
+
+
+class SourceMapWriter:
+    """
+    Writes a version 3 source map while the mapped output is generated.
+
+    Mappings are VLQ encoded as they are added and written to the output in
+    small batches, only the list of names is kept until `close`. All lines and
+    columns are zero based.
+    """
+
+    def __init__(
+        self, output: TextIO, sources: List[str], file: Optional[str] = None
+    ) -> None:
+        self.output: TextIO = output
+        self.names: List[str] = []
+        self._name_indices: Dict[str, int] = {}
+        # state of the previous segment, as all fields are relative
+        self._line: int = 0
+        self._column: int = 0
+        self._source: int = 0
+        self._source_line: int = 0
+        self._source_column: int = 0
+        self._name: int = 0
+        # whether a segment was already flushed
+        self._has_segment: bool = False
+        # encoded parts of segments that are not written yet, flushed in batches
+        self._pending: List[str] = []
+        self.output.write('{"version":3,')
+        if file is not None:
+            self.output.write(f'"file":{json.dumps(file)},')
+        self.output.write(f'"sources":{json.dumps(sources)},"mappings":"')
+
+    def add(
+        self,
+        line: int,
+        column: int,
+        source: int,
+        source_line: int,
+        source_column: int,
+        name: Optional[str] = None,
+    ) -> None:
+        """Map a position of the generated output to a position in a source"""
+        assert line >= self._line, "mappings have to be added in order"
+        pending: List[str] = self._pending
+        if line > self._line:
+            pending.append(";" * (line - self._line))
+            self._line = line
+            self._column = 0
+        elif pending or self._has_segment:
+            pending.append(",")
+        cache: Dict[int, str] = _VLQ_CACHE
+        delta: int = column - self._column
+        pending.append(cache.get(delta) or encode_vlq(delta))
+        delta = source - self._source
+        pending.append(cache.get(delta) or encode_vlq(delta))
+        delta = source_line - self._source_line
+        pending.append(cache.get(delta) or encode_vlq(delta))
+        delta = source_column - self._source_column
+        pending.append(cache.get(delta) or encode_vlq(delta))
+        if name is not None:
+            index: Optional[int] = self._name_indices.get(name)
+            if index is None:
+                index = len(self.names)
+                self.names.append(name)
+                self._name_indices[name] = index
+            pending.append(encode_vlq(index - self._name))
+            self._name = index
+        self._column = column
+        self._source = source
+        self._source_line = source_line
+        self._source_column = source_column
+        if len(pending) > 4096:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending segments to the output"""
+        if self._pending:
+            self.output.write("".join(self._pending))
+            self._pending.clear()
+            self._has_segment = True
+
+    def close(self) -> None:
+        """Finish the json document"""
+        self.flush()
+        self.output.write(f'","names":{json.dumps(self.names)}}}')